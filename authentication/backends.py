@@ -0,0 +1,78 @@
+from asgiref.sync import sync_to_async
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from core.cache import shared_cache
+from .caching import astamp_revision, evict_users, revision_key, stamp_revision, user_cache
+from .models import User
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the request user from a bounded
+    in-process LRU/TTL cache instead of loading the User row on every
+    request.
+
+    Saving, deleting or QuerySet-updating a user evicts it from this
+    process's cache and bumps a revision stamp in the shared cache, which
+    every request checks. A role change or deactivation therefore takes
+    effect on the next request in every process. With the default database
+    backed shared cache that check is one primary key lookup, which a Redis
+    or Memcached SHARED_CACHE_BACKEND takes off the database.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+
+        revision = shared_cache().get(revision_key(user_id))
+        cached = user_cache.get(str(user_id))
+        if cached is not None and revision is not None and cached[1] == revision:
+            return cached[0]
+
+        # Loads the row and rejects unknown or inactive users.
+        user = super().get_user(validated_token)
+        if revision is None:
+            revision = stamp_revision(user_id)
+        user_cache.set(str(user_id), (user, revision))
+        return user
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views, only leaving the event loop on a cache miss."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return await sync_to_async(super().get_user)(validated_token)
+
+        revision = await shared_cache().aget(revision_key(user_id))
+        cached = user_cache.get(str(user_id))
+        if cached is not None and revision is not None and cached[1] == revision:
+            return cached[0]
+
+        user = await sync_to_async(super().get_user)(validated_token)
+        if revision is None:
+            revision = await astamp_revision(user_id)
+        user_cache.set(str(user_id), (user, revision))
+        return user
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def evict_cached_user(sender, instance, **kwargs):
+    evict_users([instance.pk])
@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from core.cache import LRUCache, shared_cache
+
+
+user_cache = LRUCache(
+    maxsize=settings.AUTH_USER_CACHE['MAXSIZE'],
+    ttl=settings.AUTH_USER_CACHE['TTL'],
+)
+
+
+def revision_key(user_id):
+    return f'authentication:user-revision:{user_id}'
+
+
+def stamp_revision(user_id):
+    """
+    Revision stamp to cache a freshly loaded user under. A user without a
+    stamp, never changed or culled from the shared cache, gets one, so a
+    cached entry is only trusted while its stamp is still there.
+    """
+    key = revision_key(user_id)
+    shared_cache().add(key, time.time_ns(), None)
+    return shared_cache().get(key)
+
+
+async def astamp_revision(user_id):
+    key = revision_key(user_id)
+    await shared_cache().aadd(key, time.time_ns(), None)
+    return await shared_cache().aget(key)
+
+
+def evict_users(user_ids):
+    """
+    Drop the users from this process's cache and bump their revision stamps
+    in the shared cache, so every process reloads them on their next
+    request.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+
+    def evict():
+        for user_id in user_ids:
+            user_cache.delete(str(user_id))
+        revision = time.time_ns()
+        shared_cache().set_many({revision_key(user_id): revision for user_id in user_ids}, None)
+
+    # Once more after commit, so a request that reloaded the old row in the
+    # meantime does not keep it cached.
+    evict()
+    transaction.on_commit(evict)
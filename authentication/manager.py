@@ -1,9 +1,27 @@
 from django.contrib.auth.models import BaseUserManager
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
+from django.db import models
 
+from .caching import evict_users
 
-class UserManager(BaseUserManager):
+
+class UserQuerySet(models.QuerySet):
+    """Evicts cached users changed in bulk, which sends no signals."""
+    
+    def update(self, **kwargs):
+        user_ids = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        evict_users(user_ids)
+        return updated
+    
+    def bulk_update(self, objs, fields, batch_size=None):
+        updated = super().bulk_update(objs, fields, batch_size=batch_size)
+        evict_users(obj.pk for obj in objs)
+        return updated
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     
     def validate_email(self, email):
         try:
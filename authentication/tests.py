@@ -1,3 +1,91 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import models
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.cache import LRUCache, shared_cache
+from .backends import user_cache
+from .caching import revision_key
+from .models import User
+from .serializers import CustomObtainPairSerializer
+
+
+# Replica routing is off, so query counts do not depend on DB_REPLICAS.
+@override_settings(DATABASE_REPLICAS=[])
+class CachedJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        shared_cache().clear()
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            email='manager@example.com', name='Manager', role='manager', password='test@1234'
+        )
+        token = CustomObtainPairSerializer.get_token(self.user).access_token
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.url = reverse('dashboard')
+
+    def test_user_is_loaded_once(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        # The dashboard is cached too, so a warm request only reads the
+        # user's revision stamp from the shared cache table and the table
+        # version stamps for its ETag.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_role_change_is_honoured(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = 'employee'
+            self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_deactivation_is_honoured(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_queryset_updates_are_honoured(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(role='employee')
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_changes_made_by_other_processes_are_honoured(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        # Another worker deactivates the user: this process's cache is left
+        # alone, only the shared revision stamp moves.
+        models.QuerySet.update(User.objects.filter(pk=self.user.pk), is_active=False)
+        shared_cache().set(revision_key(self.user.pk), time.time_ns(), None)
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_culled_revisions_fail_closed(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        models.QuerySet.update(User.objects.filter(pk=self.user.pk), is_active=False)
+        shared_cache().delete(revision_key(self.user.pk))
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_cache_is_bounded(self):
+        small = LRUCache(maxsize=2)
+        for key in range(5):
+            small.set(key, key)
+        self.assertEqual(len(small), 2)
+        self.assertIsNone(small.get(0))
+        self.assertEqual(small.get(4), 4)
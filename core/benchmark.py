@@ -0,0 +1,61 @@
+"""
+Small timing helpers shared by the benchmark management commands.
+"""
+import math
+import statistics
+import time
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of `samples` (pct between 0 and 100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure(func, repeat=20, warmup=2):
+    """Call `func` `warmup + repeat` times and return the timed durations in seconds."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summarize(samples):
+    """Latency summary in milliseconds."""
+    return {
+        'runs': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def compare(results, baseline, max_latency_regression=0.2, min_latency_delta_ms=1.0, max_query_increase=0,
+            metric='p95_ms'):
+    """
+    Regressions of the endpoint `results` against `baseline` (both lists of
+    dicts with `name`, `latency` and `queries`) as readable strings. An
+    endpoint regresses when its `metric` latency grew by more than the
+    `max_latency_regression` fraction and by more than `min_latency_delta_ms`,
+    or when it ran more than `max_query_increase` extra queries.
+    """
+    previous = {row['name']: row for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get(row['name'])
+        if before is None:
+            continue
+        old, new = before['latency'][metric], row['latency'][metric]
+        if new - old > min_latency_delta_ms and new > old * (1 + max_latency_regression):
+            regressions.append(f"{row['name']}: {metric} {old:.3f} ms -> {new:.3f} ms")
+        if row['queries'] - before['queries'] > max_query_increase:
+            regressions.append(f"{row['name']}: {before['queries']} -> {row['queries']} queries")
+    return regressions
@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+
+def shared_cache():
+    """The cache every process shares, CACHES['shared'] in the settings."""
+    return caches['shared']
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache bounded both in size (least recently used
+    entries are dropped first) and in age (entries expire after `ttl`
+    seconds; None keeps them until evicted).
+    """
+    missing = object()
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key, self.missing)
+            if entry is self.missing:
+                return default
+            value, expires = entry
+            if expires is not None and expires < time.monotonic():
+                del self.entries[key]
+                return default
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self.lock:
+            self.entries[key] = (value, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,151 @@
+import hashlib
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import shared_cache
+
+
+# Replica alias the current request may read from, None to read from the primary.
+read_replica = ContextVar('read_replica', default=None)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the replica chosen for the current request by
+    ReplicaRoutingMiddleware and everything else to the primary. Reads made
+    inside transaction.atomic() stay on the primary, so they see the
+    transaction's own writes and the rows it locked.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = read_replica.get()
+        # The database cache holds state other processes just wrote.
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block or model._meta.app_label == 'django_cache':
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the primary's rows.
+        return True
+
+
+def sticky_key(request):
+    """
+    Shared cache key identifying the client behind `request`: the user id
+    of its JWT, else its session, else its address.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header is not None else None
+    if raw_token is not None:
+        try:
+            return f'db:sticky:user:{authentication.get_validated_token(raw_token)[api_settings.USER_ID_CLAIM]}'
+        except (InvalidToken, KeyError):
+            pass
+    client = request.COOKIES.get(settings.SESSION_COOKIE_NAME) or request.META.get('REMOTE_ADDR', '')
+    return f'db:sticky:{hashlib.sha1(client.encode()).hexdigest()}'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets GET, HEAD and OPTIONS requests read from one of the
+    DATABASE_REPLICAS, picked at random per request. Any other request
+    pins its client, the user of its token, to the primary for
+    DATABASE_REPLICA_STICKY_SECONDS, so the client reads its own writes
+    while the replicas catch up. Pins are kept in the shared cache, so
+    they hold whichever worker serves the next request, and need nothing
+    from the client beyond the token it already sends.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            shared_cache().set(sticky_key(request), True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+            return self.get_response(request)
+
+        alias = self.choose_replica(shared_cache().get(sticky_key(request)))
+        token = read_replica.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_replica.reset(token)
+        return self.stream_from(alias, response)
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        if request.method not in SAFE_METHODS:
+            await shared_cache().aset(sticky_key(request), True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+            return await self.get_response(request)
+
+        alias = self.choose_replica(await shared_cache().aget(sticky_key(request)))
+        token = read_replica.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_replica.reset(token)
+        return self.stream_from(alias, response)
+
+    def stream_from(self, alias, response):
+        """Keep the reads of a streamed response's content on `alias`."""
+        if alias is not None and response.streaming:
+            read = aread_from if response.is_async else read_from
+            response.streaming_content = read(alias, response.streaming_content)
+        return response
+
+    def choose_replica(self, sticky):
+        return None if sticky else random.choice(settings.DATABASE_REPLICAS)
+
+
+def read_from(alias, content):
+    """Iterate `content` with reads routed to `alias` while each item is produced."""
+    iterator = iter(content)
+    while True:
+        token = read_replica.set(alias)
+        try:
+            chunk = next(iterator, None)
+        finally:
+            read_replica.reset(token)
+        if chunk is None:
+            return
+        yield chunk
+
+
+async def aread_from(alias, content):
+    iterator = aiter(content)
+    while True:
+        token = read_replica.set(alias)
+        try:
+            chunk = await anext(iterator, None)
+        finally:
+            read_replica.reset(token)
+        if chunk is None:
+            return
+        yield chunk
@@ -0,0 +1,86 @@
+"""
+In-process request metrics, aggregated per route and exposed in the
+Prometheus text format.
+"""
+import bisect
+import threading
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() is a bisect and three additions."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            total += count
+            yield bound, total
+
+
+class RequestMetrics:
+    """
+    Per (route, method) histograms of total latency, database time and
+    database query count. Routes are URL patterns, not raw paths, so the
+    number of series stays bounded.
+    """
+    families = {
+        'http_request_duration_seconds': ('Total request latency.', LATENCY_BUCKETS),
+        'http_request_db_duration_seconds': ('Time spent in database queries per request.', LATENCY_BUCKETS),
+        'http_request_db_queries': ('Database queries per request.', QUERY_COUNT_BUCKETS),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def observe(self, route, method, duration, db_duration, db_queries):
+        key = (route, method)
+        with self.lock:
+            histograms = self.series.get(key)
+            if histograms is None:
+                histograms = self.series[key] = {
+                    name: Histogram(buckets) for name, (_, buckets) in self.families.items()
+                }
+            histograms['http_request_duration_seconds'].observe(duration)
+            histograms['http_request_db_duration_seconds'].observe(db_duration)
+            histograms['http_request_db_queries'].observe(db_queries)
+
+    def reset(self):
+        with self.lock:
+            self.series = {}
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (description, _) in self.families.items():
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for (route, method), histograms in sorted(self.series.items()):
+                    histogram = histograms[name]
+                    labels = f'route="{escape_label(route)}",method="{escape_label(method)}"'
+                    for bound, total in histogram.cumulative_counts():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,101 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+
+from .metrics import request_metrics
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class PerformanceMiddleware:
+    """
+    Times every request and reports it in a Server-Timing header:
+
+        db      time in database queries (desc holds the query count)
+        view    time in the view, serialization included, minus db time
+        render  time rendering the response body
+        total   wall time spent below this middleware
+
+    The same numbers feed the per-route histograms in core.metrics.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Avoid a thread hop per request for the hook below.
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            self.wrap_connections(stack, timer)
+            response = self.get_response(request)
+        return self.finish(request, response, timer, started)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            # The async ORM queries from the request's sync thread, which has
+            # its own connection objects.
+            await sync_to_async(self.wrap_connections)(stack, timer)
+            response = await self.get_response(request)
+        return self.finish(request, response, timer, started)
+
+    def wrap_connections(self, stack, timer):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+
+    def finish(self, request, response, timer, started):
+        finished = time.perf_counter()
+
+        total = finished - started
+        view_finished = getattr(request, '_view_finished', finished)
+        render = finished - view_finished
+        view = max(view_finished - started - timer.duration, 0.0)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timer.duration * 1000:.2f};desc="{timer.count} queries"',
+            f'view;dur={view * 1000:.2f}',
+            f'render;dur={render * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None and match.route else '<unmatched>'
+        request_metrics.observe(route, request.method, total, timer.duration, timer.count)
+        return response
+
+    def process_template_response(self, request, response):
+        # Called once the view has returned and before the body is rendered.
+        request._view_finished = time.perf_counter()
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        request._view_finished = time.perf_counter()
+        return response
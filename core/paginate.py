@@ -1,7 +1,81 @@
-from rest_framework.pagination import PageNumberPagination
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 class GlobalPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 10
-    page_query_param = 'page'
\ No newline at end of file
+    page_query_param = 'page'
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() for async views: acount() and an async read of the page."""
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+        self.page.object_list = [row async for row in self.page.object_list]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        self.request = request
+        return list(self.page)
+
+
+class GlobalCursorPagination(CursorPagination):
+    """
+    Keyset pagination: each page is an indexed range scan from the last seen
+    key, so deep pages cost the same as the first one. No COUNT(*) is run
+    unless the client asks for it with ?include_count=true.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = 'id'
+    count_query_param = 'include_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true'):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # Keyset pages are a single indexed range read; DRF builds them
+        # synchronously, so run it off the event loop as a whole.
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {'count': self.count, **response.data}
+        return response
+
+
+class PaginationModeMixin:
+    """
+    Lets a list view serve keyset pages when the client sends
+    ?pagination=cursor, keeping page numbers as the default.
+    """
+    cursor_pagination_class = GlobalCursorPagination
+    pagination_mode_query_param = 'pagination'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            mode = self.request.query_params.get(self.pagination_mode_query_param)
+            if mode == 'cursor' and self.cursor_pagination_class is not None:
+                self._paginator = self.cursor_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
@@ -0,0 +1,66 @@
+import math
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed and falls
+    back to the stock renderer otherwise. The output is byte for byte what
+    JSONRenderer produces with the default settings: compact separators,
+    unescaped unicode, escaped U+2028/U+2029, and datetimes, decimals and
+    other non-JSON types converted by DRF's encoder.
+
+    Payloads orjson would write differently are rendered by JSONRenderer:
+    indented output, non-string keys, integers beyond 64 bits, and floats
+    orjson formats its own way (below 1e-4, 0.000025 for 2.5e-05) or does
+    not reject (NaN and infinity, written as null). The floats are looked
+    for in the data before encoding, since the rendered text cannot tell
+    them apart from strings.
+    """
+    orjson_options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson is not None else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+            or has_unportable_floats(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.orjson_options)
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, so the output can be embedded in JavaScript.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def has_unportable_floats(data):
+    """
+    Whether `data` holds a float, or a Decimal DRF may render as one, that
+    orjson and json write differently: non-zero below 1e-4, NaN or infinite.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, (float, Decimal)):
+            value = float(value)
+            if not math.isfinite(value) or (value and abs(value) < 1e-4):
+                return True
+    return False
@@ -3,7 +3,9 @@ Swagger/OpenAPI documentation schemas for Management API endpoints.
 """
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from management.serializers import EmployeeUpdateCreateSerializer
+from management.serializers import (
+    EmployeeUpdateCreateSerializer, EmployeeBulkStatusSerializer, EmployeeBulkDeleteSerializer,
+)
 
 
 # Swagger decorators for Employee endpoints
@@ -31,3 +33,52 @@ employee_update_schema = swagger_auto_schema(
     security=[{'Bearer': []}]
 )
 
+
+employee_import_schema = swagger_auto_schema(
+    operation_summary="Bulk import employees",
+    operation_description=(
+        "Import employees from a CSV or NDJSON file. Rows are validated and inserted in batches; "
+        "invalid rows are reported by line number without aborting the rest of the file."
+    ),
+    manual_parameters=[
+        openapi.Parameter('file', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+                          description="CSV (with header) or NDJSON file"),
+        openapi.Parameter('file_format', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=['csv', 'ndjson'],
+                          description="Overrides the format guessed from the file name"),
+    ],
+    responses={
+        200: openapi.Response(description="Import finished, with per-row errors if any"),
+        400: openapi.Response(description="Missing file or unsupported format"),
+    },
+    security=[{'Bearer': []}]
+)
+
+employee_bulk_status_schema = swagger_auto_schema(
+    operation_summary="Change the status of many employees",
+    operation_description=(
+        "Move the employees given by `ids`, or matched by `filter`, to `status` in one transaction. "
+        "The filter needs at least one criterion. Returns the outcome for every employee: updated, unchanged or not_found."
+    ),
+    request_body=EmployeeBulkStatusSerializer,
+    responses={
+        200: openapi.Response(description="Statuses updated"),
+        400: openapi.Response(description="Validation error"),
+    },
+    security=[{'Bearer': []}]
+)
+
+employee_bulk_delete_schema = swagger_auto_schema(
+    operation_summary="Delete or archive many employees",
+    operation_description=(
+        "Delete the employees given by `ids`, or matched by `filter`, in one transaction. With "
+        "`archive` they are moved to the archive instead. The filter needs at least one criterion and "
+        "skips hired employees unless `include_hired` is set. Returns the outcome for every employee: "
+        "deleted, archived or not_found."
+    ),
+    request_body=EmployeeBulkDeleteSerializer,
+    responses={
+        200: openapi.Response(description="Employees deleted"),
+        400: openapi.Response(description="Validation error"),
+    },
+    security=[{'Bearer': []}]
+)
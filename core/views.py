@@ -0,0 +1,44 @@
+from django.db import DatabaseError, connections
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.views import APIView
+
+from project.permission import IsAdmin
+from .metrics import request_metrics
+from .utils import CustomResponse
+
+
+class MetricsView(APIView):
+    """Per-route request metrics in Prometheus text format - accessible by Admin"""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return HttpResponse(
+            request_metrics.render(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class HealthView(APIView):
+    """Database health for load balancers, one entry per alias - accessible by anyone"""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        databases = {}
+        for alias in connections:
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                databases[alias] = 'ok'
+            except DatabaseError as e:
+                databases[alias] = str(e)
+
+        if any(state != 'ok' for state in databases.values()):
+            return CustomResponse.error(
+                errors=databases,
+                message="Database unavailable",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return CustomResponse.success(data=databases, message="Healthy")
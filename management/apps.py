@@ -5,4 +5,10 @@ class ManagementConfig(AppConfig):
     name = 'management'
     
     def ready(self):
-        import management.models
\ No newline at end of file
+        import management.models
+        import management.search
+        import management.versions
+        import management.sync
+        import management.history
+        import management.funnel
+        import management.outbox
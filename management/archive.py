@@ -0,0 +1,93 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .funnel import FunnelDeltas
+from .models import ArchivedEmployee, Company, Department, Employee, Tombstone, adjust_employee_counters
+from .outbox import publish
+from .versions import bump_versions
+
+
+ARCHIVED_FIELDS = [field.attname for field in ArchivedEmployee._meta.concrete_fields if field.name != 'archived_at']
+
+
+def bulk_delete(ids=None, queryset=None, archive=False, max_rows=10000, chunk_size=1000):
+    """
+    Delete the employees with the given `ids`, or those in `queryset`, in
+    one transaction with one DELETE per `chunk_size` rows, copying them to
+    ArchivedEmployee first when `archive` is set. The counters, funnel,
+    sync tombstones, outbox events and table versions that
+    per-row deletes keep up to date through signals are updated in bulk.
+
+    Returns one {'id', 'outcome'} per employee, where outcome is 'deleted',
+    'archived' or 'not_found'.
+    """
+    with transaction.atomic():
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+            queryset = Employee.objects.filter(pk__in=ids)
+
+        rows = list(queryset.select_for_update().order_by('pk').values(*ARCHIVED_FIELDS)[:max_rows + 1])
+        if len(rows) > max_rows:
+            raise serializers.ValidationError(
+                {'filter': f'The filter matches more than {max_rows} employees, narrow it down.'}
+            )
+        found = [row['id'] for row in rows]
+
+        if archive:
+            now = timezone.now()
+            ArchivedEmployee.objects.bulk_create(
+                [ArchivedEmployee(**row, archived_at=now) for row in rows], batch_size=chunk_size,
+            )
+        for start in range(0, len(found), chunk_size):
+            delete_rows(found[start:start + chunk_size])
+
+        if rows:
+            record_removal(rows, archive)
+
+    outcome = 'archived' if archive else 'deleted'
+    found = set(found)
+    return [
+        {'id': pk, 'outcome': outcome if pk in found else 'not_found'}
+        for pk in (ids if ids is not None else sorted(found))
+    ]
+
+
+def delete_rows(ids):
+    """
+    DELETE the employee rows with the given ids in one statement. Unlike
+    QuerySet.delete() it skips the per-row collector and signals, so the
+    caller does their work; nothing else references Employee rows.
+    """
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {qn(Employee._meta.db_table)} WHERE {qn(Employee._meta.pk.column)} '
+            f'IN ({", ".join(["%s"] * len(ids))})',
+            ids,
+        )
+
+
+def record_removal(rows, archive):
+    """Do what the Employee post_delete receivers do, for all of `rows` at once."""
+    company_deltas, department_deltas = Counter(), Counter()
+    funnel = FunnelDeltas()
+    for row in rows:
+        company_deltas[row['company_id']] -= 1
+        department_deltas[row['department_id']] -= 1
+        funnel.remove(row['company_id'], row['department_id'], row['status'], row['hired_date'])
+    adjust_employee_counters(company_deltas, department_deltas)
+    funnel.apply()
+
+    now = timezone.now()
+    Tombstone.objects.bulk_create([
+        Tombstone(model=Employee._meta.label_lower, object_id=row['id'], deleted_at=now) for row in rows
+    ])
+    topic = 'employee.archived' if archive else 'employee.deleted'
+    publish(
+        (topic, {'id': row['id'], 'company': row['company_id'], 'department': row['department_id']})
+        for row in rows
+    )
+    bump_versions(Company, Department, Employee, *([ArchivedEmployee] if archive else []))
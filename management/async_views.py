@@ -0,0 +1,146 @@
+from rest_framework.permissions import IsAuthenticated
+
+from core.async_views import AsyncAPIView, AsyncListAPIView, AsyncRetrieveAPIView
+from core.paginate import GlobalPagination, PaginationModeMixin
+from core.utils import CustomResponse
+from project.permission import IsManagerOrAdmin
+from .dashboard import aget_dashboard
+from .fieldsets import EmployeeFieldsetMixin
+from .filters import EmployeeFilterBackend
+from .models import Company, Department, Employee
+from .serializers import (
+    CompanyListSerializer, CompanySerializer, DepartmentListSerializer, DepartmentSerializer,
+    EmployeeListSerializer, EmployeeSerializer,
+)
+from .versions import AsyncConditionalGetMixin, VersionStampMixin
+
+
+# Async counterparts of the read views in management.views, served under
+# /api/v1/management/async/. Same permissions, payloads and headers.
+
+
+class AsyncCompanyListView(AsyncConditionalGetMixin, PaginationModeMixin, AsyncListAPIView):
+    """View for listing companies - accessible by Manager or Admin"""
+    queryset = CompanyListSerializer.rows(Company.objects.order_by('id'))
+    serializer_class = CompanyListSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    pagination_class = GlobalPagination
+
+    async def list(self, request, *args, **kwargs):
+        response = await super().list(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Companies retrieved successfully"
+        )
+
+
+class AsyncCompanyDetailView(AsyncConditionalGetMixin, AsyncRetrieveAPIView):
+    queryset = Company.objects.all()
+    serializer_class = CompanySerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+
+    async def retrieve(self, request, *args, **kwargs):
+        response = await super().retrieve(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Company retrieved successfully"
+        )
+
+
+class AsyncDepartmentListView(AsyncConditionalGetMixin, PaginationModeMixin, AsyncListAPIView):
+    """View for listing departments - accessible by Manager or Admin"""
+    queryset = DepartmentListSerializer.rows(Department.objects.order_by('id'))
+    serializer_class = DepartmentListSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    pagination_class = GlobalPagination
+
+    async def list(self, request, *args, **kwargs):
+        response = await super().list(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Departments retrieved successfully"
+        )
+
+
+class AsyncDepartmentDetailView(AsyncConditionalGetMixin, AsyncRetrieveAPIView):
+    queryset = Department.objects.all()
+    serializer_class = DepartmentSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+
+    async def retrieve(self, request, *args, **kwargs):
+        response = await super().retrieve(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Department retrieved successfully"
+        )
+
+
+class AsyncEmployeeListView(AsyncConditionalGetMixin, EmployeeFieldsetMixin, PaginationModeMixin, AsyncListAPIView):
+    """View for listing employees - accessible by Manager or Admin"""
+    queryset = Employee.objects.order_by('id')
+    serializer_class = EmployeeListSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    pagination_class = GlobalPagination
+    filter_backends = [EmployeeFilterBackend]
+
+    async def list(self, request, *args, **kwargs):
+        response = await super().list(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Employees retrieved successfully"
+        )
+
+
+class AsyncEmployeeHiredListView(AsyncConditionalGetMixin, EmployeeFieldsetMixin, PaginationModeMixin, AsyncListAPIView):
+    queryset = Employee.objects.filter(status='hired').order_by('id')
+    serializer_class = EmployeeListSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    pagination_class = GlobalPagination
+    filter_backends = [EmployeeFilterBackend]
+
+    async def list(self, request, *args, **kwargs):
+        response = await super().list(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Hired employees retrieved successfully"
+        )
+
+
+class AsyncEmployeeDetailView(AsyncConditionalGetMixin, EmployeeFieldsetMixin, AsyncRetrieveAPIView):
+    queryset = Employee.objects.all()
+    serializer_class = EmployeeSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+
+    async def retrieve(self, request, *args, **kwargs):
+        response = await super().retrieve(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Employee retrieved successfully"
+        )
+
+
+class AsyncDashboardView(VersionStampMixin, AsyncAPIView):
+    """View for dashboard - accessible by Manager or Admin"""
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+
+    async def get(self, request):
+        not_modified = await self.acheck_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        try:
+            return self.stamp_response(CustomResponse.success(
+                data=await aget_dashboard(self.versions_key()),
+                message="Dashboard retrieved successfully"
+            ))
+        except Exception as e:
+            return CustomResponse.error(
+                errors={'error': str(e)},
+                message="Failed to retrieve dashboard"
+            )
@@ -0,0 +1,59 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import Company, Department, Employee, EmployeeStatus
+
+
+def compute_dashboard():
+    """
+    Count companies, departments, employees and employees per status in a
+    single round-trip.
+    """
+    qn = connection.ops.quote_name
+    status_sums = ', '.join(
+        f'COALESCE(SUM(CASE WHEN {qn("status")} = %s THEN 1 ELSE 0 END), 0)'
+        for _ in EmployeeStatus
+    )
+    sql = (
+        f'SELECT (SELECT COUNT(*) FROM {qn(Company._meta.db_table)}), '
+        f'(SELECT COUNT(*) FROM {qn(Department._meta.db_table)}), '
+        f'COUNT(*), {status_sums} '
+        f'FROM {qn(Employee._meta.db_table)}'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [value for value, _ in EmployeeStatus])
+        companies, departments, employees, *by_status = cursor.fetchone()
+
+    return {
+        "total_companies": companies,
+        "total_departments": departments,
+        "total_employees": employees,
+        "employees_by_status": {
+            value: int(count) for (value, _), count in zip(EmployeeStatus, by_status)
+        },
+    }
+
+
+def dashboard_cache_key(version):
+    return f'management:dashboard:{version}'
+
+
+def get_dashboard(version):
+    """
+    compute_dashboard() cached under `version`, the table version stamps
+    the request read, so a write made by any process is seen as soon as
+    its stamps are bumped.
+    """
+    return cache.get_or_set(dashboard_cache_key(version), compute_dashboard, settings.DASHBOARD_CACHE_TIMEOUT)
+
+
+async def aget_dashboard(version):
+    key = dashboard_cache_key(version)
+    dashboard = await cache.aget(key)
+    if dashboard is None:
+        # One raw SQL query, which Django can only run synchronously.
+        dashboard = await sync_to_async(compute_dashboard)()
+        await cache.aset(key, dashboard, settings.DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
@@ -0,0 +1,44 @@
+from django.utils.functional import cached_property
+
+from .filters import EMPLOYEE_FIELDS, FieldsetFilterSerializer
+from .serializers import EmployeeFieldsetSerializer
+
+
+class EmployeeFieldsetMixin:
+    """
+    Lets an employee read view return only the columns named in ?fields=,
+    with company and department as plain ids unless named in ?expand=.
+    The queryset is narrowed to the columns those need, so relations that
+    are not expanded are never joined. `id` is always returned, and
+    without either parameter the full nested representation is kept.
+
+    Views set `queryset` to plain employees; the serializer's `rows()`
+    prepares it for the full representation.
+    """
+
+    @cached_property
+    def fieldset(self):
+        """The requested (fields, expand), or None when neither parameter is sent."""
+        serializer = FieldsetFilterSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        if not params:
+            return None
+
+        expand = params.get('expand', [])
+        requested = set(params.get('fields', EMPLOYEE_FIELDS)) | set(expand)
+        return [name for name in EMPLOYEE_FIELDS if name == 'id' or name in requested], expand
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.fieldset is None:
+            return self.get_serializer_class().rows(queryset)
+        return queryset.values(*EmployeeFieldsetSerializer.fieldset_value_fields(*self.fieldset))
+
+    def get_serializer_class(self):
+        if self.fieldset is None:
+            return super().get_serializer_class()
+        return EmployeeFieldsetSerializer
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), 'fieldset': self.fieldset}
@@ -0,0 +1,113 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Employee, EmployeeStatus
+from .search import search_employees
+
+
+class EmployeeFilterSerializer(serializers.Serializer):
+    """Validates the query parameters accepted by employee list endpoints."""
+    status = serializers.ChoiceField(choices=EmployeeStatus, required=False)
+    company = serializers.IntegerField(required=False)
+    department = serializers.IntegerField(required=False)
+    designation = serializers.CharField(required=False)
+    hired_after = serializers.DateField(required=False)
+    hired_before = serializers.DateField(required=False)
+    search = serializers.CharField(required=False, allow_blank=True)
+
+
+EMPLOYEE_FILTER_LOOKUPS = {
+    'status': 'status',
+    'company': 'company_id',
+    'department': 'department_id',
+    'designation': 'designation',
+    'hired_after': 'hired_date__gte',
+    'hired_before': 'hired_date__lte',
+}
+
+
+def filter_employees(queryset, params):
+    """Apply validated EmployeeFilterSerializer data to an employee queryset."""
+    queryset = queryset.filter(**{
+        lookup: params[name] for name, lookup in EMPLOYEE_FILTER_LOOKUPS.items() if name in params
+    })
+    if params.get('search'):
+        queryset = search_employees(queryset, params['search'])
+    return queryset
+
+
+class ArchivedEmployeeFilterSerializer(EmployeeFilterSerializer):
+    """Employee list filters that apply to the archive; it has no search index."""
+    search = None
+
+
+class ArchivedEmployeeFilterBackend(BaseFilterBackend):
+    """Filter archived employees like live ones, without ?search=."""
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = ArchivedEmployeeFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return filter_employees(queryset, serializer.validated_data)
+
+
+# Names accepted by ?fields= on the employee read endpoints, in output order.
+EMPLOYEE_FIELDS = tuple(field.name for field in Employee._meta.concrete_fields)
+EXPANDABLE_FIELDS = ('company', 'department')
+
+
+class FieldsetFilterSerializer(serializers.Serializer):
+    """Validates the comma separated ?fields= and ?expand= of the employee read endpoints."""
+    fields = serializers.CharField(required=False)
+    expand = serializers.CharField(required=False, allow_blank=True)
+    
+    def split(self, value, choices):
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in choices]
+        if unknown:
+            raise serializers.ValidationError(
+                f'Unknown field(s): {", ".join(unknown)}. Choose from {", ".join(choices)}.'
+            )
+        return names
+    
+    def validate_fields(self, value):
+        return self.split(value, EMPLOYEE_FIELDS)
+    
+    def validate_expand(self, value):
+        return self.split(value, EXPANDABLE_FIELDS)
+
+
+class EmployeeFilterBackend(BaseFilterBackend):
+    """
+    Filter employees by status, company, department, designation and hired
+    date range, and full-text search them with ?search=. Every filter maps
+    onto an index on the employee table.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = EmployeeFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return filter_employees(queryset, serializer.validated_data)
+
+
+class LookupFilterSerializer(serializers.Serializer):
+    """Validates the query parameters of the ?mode=lookup dropdown lists."""
+    company = serializers.IntegerField(required=False)
+    search = serializers.CharField(required=False, allow_blank=True)
+    limit = serializers.IntegerField(
+        required=False, min_value=1, max_value=settings.LOOKUP_MAX_ROWS, default=settings.LOOKUP_MAX_ROWS
+    )
+
+
+class StageDurationFilterSerializer(serializers.Serializer):
+    """Validates the query parameters of the stage duration analytics."""
+    group_by = serializers.ChoiceField(choices=['company', 'department'], required=False, default='company')
+    company = serializers.IntegerField(required=False)
+    department = serializers.IntegerField(required=False)
+
+
+class FunnelFilterSerializer(serializers.Serializer):
+    """Validates the query parameters of the hiring funnel."""
+    company = serializers.IntegerField(required=False)
+    department = serializers.IntegerField(required=False)
+    weeks = serializers.IntegerField(required=False, min_value=1, max_value=104, default=12)
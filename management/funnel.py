@@ -0,0 +1,163 @@
+import operator
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from functools import reduce
+
+from django.db.models import F, Q, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Company, Department, Employee, EmployeeStatus, StatusCount, WeeklyHireCount
+
+
+def week_of(day):
+    """The Monday starting the week of `day`."""
+    return day - timedelta(days=day.weekday())
+
+
+def apply_count_deltas(model, key_fields, deltas, batch_size=500):
+    """
+    Add each delta in `deltas` (a mapping of key tuple -> delta) to the
+    `count` of the `model` row with that key, with one UPDATE per distinct
+    delta value and `batch_size` keys. Rows are created for keys that gain
+    employees.
+    """
+    keys_by_delta = defaultdict(list)
+    for key, delta in deltas.items():
+        if delta:
+            keys_by_delta[delta].append(key)
+    if not keys_by_delta:
+        return
+
+    model.objects.bulk_create(
+        [
+            model(**dict(zip(key_fields, key)))
+            for delta, keys in keys_by_delta.items() if delta > 0
+            for key in keys
+        ],
+        ignore_conflicts=True,
+    )
+    for delta, keys in keys_by_delta.items():
+        for start in range(0, len(keys), batch_size):
+            matching = reduce(operator.or_, (Q(**dict(zip(key_fields, key))) for key in keys[start:start + batch_size]))
+            model.objects.filter(matching).update(count=F('count') + delta)
+
+
+class FunnelDeltas:
+    """
+    Collects employee additions and removals and applies them to the
+    StatusCount and WeeklyHireCount summary tables at once. A moved
+    employee is removed with its old values and added with its new ones,
+    and the parts that did not change cancel out.
+    """
+
+    def __init__(self):
+        self.statuses = Counter()
+        self.hires = Counter()
+
+    def add(self, company_id, department_id, status, hired_date, sign=1):
+        self.statuses[(company_id, department_id, status)] += sign
+        if hired_date is not None:
+            self.hires[(company_id, department_id, week_of(hired_date))] += sign
+
+    def remove(self, company_id, department_id, status, hired_date):
+        self.add(company_id, department_id, status, hired_date, sign=-1)
+
+    def apply(self):
+        apply_count_deltas(StatusCount, ('company_id', 'department_id', 'status'), self.statuses)
+        apply_count_deltas(WeeklyHireCount, ('company_id', 'department_id', 'week'), self.hires)
+
+
+# Employee fields the summary tables are keyed on.
+FUNNEL_FIELDS = ('company', 'department', 'status', 'hired_date')
+
+
+def funnel_values(employee, values=None):
+    values = values if values is not None else employee.__dict__
+    return [values.get(employee._meta.get_field(name).attname) for name in FUNNEL_FIELDS]
+
+
+@receiver(post_save, sender=Employee)
+def update_funnel_on_employee_save(sender, instance, created, update_fields, raw, **kwargs):
+    if raw:
+        return
+
+    deltas = FunnelDeltas()
+    if created:
+        deltas.add(*funnel_values(instance))
+    elif any(instance.changed_value(name, update_fields) for name in FUNNEL_FIELDS):
+        loaded_values = {**instance.__dict__, **getattr(instance, '_loaded_values', {})}
+        deltas.remove(*funnel_values(instance, loaded_values))
+        deltas.add(*funnel_values(instance))
+    deltas.apply()
+
+
+@receiver(post_delete, sender=Employee)
+def update_funnel_on_employee_delete(sender, instance, **kwargs):
+    deltas = FunnelDeltas()
+    deltas.remove(*funnel_values(instance))
+    deltas.apply()
+
+
+def get_funnel(company=None, department=None, weeks=12):
+    """
+    Employees per status for each company and department, and hires per
+    week over the last `weeks` weeks, read from the summary tables only.
+    """
+    filters = {}
+    if company is not None:
+        filters['company_id'] = company
+    if department is not None:
+        filters['department_id'] = department
+
+    statuses = [value for value, _ in EmployeeStatus]
+    counts = (
+        StatusCount.objects.filter(**filters).filter(count__gt=0)
+        .order_by('company_id', 'department_id')
+        .values_list('company_id', 'department_id', 'status', 'count')
+    )
+    totals = dict.fromkeys(statuses, 0)
+    companies = {}
+    for company_id, department_id, status, count in counts:
+        company_row = companies.setdefault(company_id, {
+            'id': company_id, 'by_status': dict.fromkeys(statuses, 0), 'departments': {},
+        })
+        department_row = company_row['departments'].setdefault(department_id, {
+            'id': department_id, 'by_status': dict.fromkeys(statuses, 0),
+        })
+        for row in (totals, company_row['by_status'], department_row['by_status']):
+            row[status] = row.get(status, 0) + count
+
+    company_names = dict(Company.objects.filter(pk__in=companies).values_list('pk', 'name'))
+    department_names = dict(
+        Department.objects.filter(
+            pk__in={department_id for row in companies.values() for department_id in row['departments']}
+        ).values_list('pk', 'name')
+    )
+
+    first_week = week_of(date.today()) - timedelta(weeks=weeks - 1)
+    hires = dict(
+        WeeklyHireCount.objects.filter(**filters, week__gte=first_week)
+        .order_by('week').values('week').annotate(total=Sum('count'))
+        .values_list('week', 'total')
+    )
+
+    return {
+        'by_status': totals,
+        'companies': [
+            {
+                'id': row['id'],
+                'name': company_names.get(row['id']),
+                'by_status': row['by_status'],
+                'departments': [
+                    {'id': department['id'], 'name': department_names.get(department['id']), 'by_status': department['by_status']}
+                    for department in row['departments'].values()
+                ],
+            }
+            for row in companies.values()
+        ],
+        'hires_per_week': [
+            {'week': week, 'count': hires.get(week, 0)}
+            for week in (first_week + timedelta(weeks=index) for index in range(weeks))
+        ],
+    }
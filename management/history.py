@@ -0,0 +1,246 @@
+import atexit
+import logging
+import math
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Company, Department, Employee, EmployeeStatus, StatusTransition
+from .versions import bump_versions
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatusHistoryWriter:
+    """
+    Appends StatusTransition rows off the request path. Transitions are
+    queued in process when the transaction that made them commits, and a
+    daemon thread writes them with one bulk INSERT per batch. Whatever is
+    still queued is written at interpreter exit; a crashed process loses
+    up to FLUSH_INTERVAL seconds of history.
+    """
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def record(self, employee, from_status, to_status, changed_at=None):
+        row = (employee.pk, employee.company_id, employee.department_id, from_status, to_status)
+        self.record_many([row], changed_at)
+
+    def record_many(self, rows, changed_at=None):
+        """
+        Queue one transition per (employee_id, company_id, department_id,
+        from_status, to_status) row, written once the current transaction
+        commits.
+        """
+        changed_at = changed_at or timezone.now()
+        transitions = [
+            StatusTransition(
+                employee_id=employee_id,
+                company_id=company_id,
+                department_id=department_id,
+                from_status=from_status,
+                to_status=to_status,
+                changed_at=changed_at,
+            )
+            for employee_id, company_id, department_id, from_status, to_status in rows
+        ]
+        transaction.on_commit(lambda: self.put(transitions))
+
+    def put(self, transitions):
+        for transition in transitions:
+            self.queue.put(transition)
+        if settings.STATUS_HISTORY['BACKGROUND']:
+            self.start()
+
+    def start(self):
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='status-history-writer', daemon=True)
+                self.thread.start()
+                atexit.register(self.flush)
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + settings.STATUS_HISTORY['FLUSH_INTERVAL']
+            while len(batch) < settings.STATUS_HISTORY['BATCH_SIZE']:
+                try:
+                    batch.append(self.queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            self.write(batch)
+            close_old_connections()
+
+    def flush(self):
+        """Write everything queued so far from the calling thread."""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        batch_size = settings.STATUS_HISTORY['BATCH_SIZE']
+        for start in range(0, len(batch), batch_size):
+            self.write(batch[start:start + batch_size])
+
+    def write(self, batch):
+        try:
+            with transaction.atomic():
+                StatusTransition.objects.bulk_create(batch)
+                bump_versions(StatusTransition)
+        except DatabaseError:
+            logger.exception('Could not write %s status transitions', len(batch))
+
+
+status_history = StatusHistoryWriter()
+
+
+@receiver(post_save, sender=Employee)
+def record_status_transition(sender, instance, created, update_fields, raw, **kwargs):
+    if raw:
+        return
+    if created:
+        status_history.record(instance, None, instance.status)
+    elif changed := instance.changed_value('status', update_fields):
+        status_history.record(instance, changed[0], instance.status)
+
+
+# Percentiles reported for each stage and for time to hire.
+STAGE_PERCENTILES = (50, 90, 95)
+
+
+def seconds_between(connection, start, end):
+    """SQL for the seconds from the `start` to the `end` datetime column."""
+    if connection.vendor == 'sqlite':
+        return f'(julianday({end}) - julianday({start})) * 86400.0'
+    if connection.vendor == 'mysql':
+        return f'TIMESTAMPDIFF(MICROSECOND, {start}, {end}) / 1000000.0'
+    return f'EXTRACT(EPOCH FROM ({end} - {start}))'
+
+
+def compute_stage_durations(group_by='company', company=None, department=None):
+    """
+    Time spent in each status and time from creation to hire, per company
+    or department, from the status history. A stage counts once the
+    employee has left it; each duration is grouped under the company or
+    department the employee was in when the stage ended.
+
+    Durations and their nearest-rank percentiles are computed by the
+    database with window functions, so only the percentile rows are read.
+    Each employee's whole history is walked before ?company= and
+    ?department= are applied, so a stage that began in another group is
+    still measured from when it began.
+    """
+    qn = connection.ops.quote_name
+    table = qn(StatusTransition._meta.db_table)
+    group_column = qn(f'{group_by}_id')
+
+    conditions, params = [], []
+    for column, value in (('company_id', company), ('department_id', department)):
+        if value is not None:
+            conditions.append(f'{qn(column)} = %s')
+            params.append(value)
+    scope = ' AND '.join(conditions)
+    # Only the histories of employees who were ever in the filtered groups.
+    employees = f'WHERE {qn("employee_id")} IN (SELECT {qn("employee_id")} FROM {table} WHERE {scope})' if scope else ''
+    in_scope = f'AND {scope}' if scope else ''
+
+    ranks = ' OR '.join(
+        f'(position * 100 >= {pct} * total AND (position - 1) * 100 < {pct} * total)' for pct in STAGE_PERCENTILES
+    )
+    sql = f"""
+        WITH ordered AS (
+            SELECT {group_column} AS group_id, {qn("company_id")} AS company_id,
+                {qn("department_id")} AS department_id, {qn("from_status")} AS from_status,
+                {qn("to_status")} AS to_status, {qn("changed_at")} AS changed_at,
+                LAG({qn("changed_at")}) OVER employee_history AS entered_at,
+                MIN(CASE WHEN {qn("from_status")} IS NULL THEN {qn("changed_at")} END)
+                    OVER employee_history AS created_at,
+                SUM(CASE WHEN {qn("to_status")} = 'hired' THEN 1 ELSE 0 END) OVER employee_history AS hires
+            FROM {table}
+            {employees}
+            WINDOW employee_history AS (
+                PARTITION BY {qn("employee_id")} ORDER BY {qn("changed_at")}, {qn("id")} ROWS UNBOUNDED PRECEDING
+            )
+        ),
+        durations AS (
+            SELECT group_id, from_status AS stage, {seconds_between(connection, 'entered_at', 'changed_at')} AS seconds
+            FROM ordered
+            WHERE from_status IS NOT NULL AND entered_at IS NOT NULL {in_scope}
+            UNION ALL
+            SELECT group_id, NULL AS stage, {seconds_between(connection, 'created_at', 'changed_at')} AS seconds
+            FROM ordered
+            WHERE to_status = 'hired' AND hires = 1 AND created_at IS NOT NULL {in_scope}
+        ),
+        ranked AS (
+            SELECT group_id, stage, seconds,
+                ROW_NUMBER() OVER (PARTITION BY group_id, stage ORDER BY seconds) AS position,
+                COUNT(*) OVER (PARTITION BY group_id, stage) AS total
+            FROM durations
+        )
+        SELECT group_id, stage, total, position, seconds FROM ranked WHERE {ranks}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params * 3)
+        rows = cursor.fetchall()
+
+    samples = defaultdict(dict)
+    totals = {}
+    for group_id, stage, total, position, seconds in rows:
+        samples[group_id, stage][position] = seconds
+        totals[group_id, stage] = total
+
+    def summarize(group_id, stage):
+        total = totals.get((group_id, stage), 0)
+        return {
+            'count': total,
+            **{
+                f'p{pct}_hours': (
+                    round(samples[group_id, stage][max(math.ceil(pct * total / 100), 1)] / 3600, 2) if total else 0.0
+                )
+                for pct in STAGE_PERCENTILES
+            },
+        }
+
+    group_ids = sorted({group_id for group_id, _ in totals})
+    model = Company if group_by == 'company' else Department
+    names = dict(model.objects.filter(pk__in=group_ids).values_list('pk', 'name'))
+    return {
+        'group_by': group_by,
+        'groups': [
+            {
+                'id': group_id,
+                'name': names.get(group_id),
+                'stages': {
+                    status: summarize(group_id, status)
+                    for status, _ in EmployeeStatus if (group_id, status) in totals
+                },
+                'time_to_hire': summarize(group_id, None),
+            }
+            for group_id in group_ids
+        ],
+    }
+
+
+def get_stage_durations(version, group_by='company', company=None, department=None):
+    """compute_stage_durations() cached until the history's table version changes."""
+    key = f'management:stage-durations:{version}:{group_by}:{company}:{department}'
+    return cache.get_or_set(
+        key,
+        lambda: compute_stage_durations(group_by, company, department),
+        settings.STATUS_HISTORY['CACHE_TIMEOUT'],
+    )
@@ -0,0 +1,142 @@
+import codecs
+import csv
+import json
+from collections import Counter
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Max
+from rest_framework import serializers
+
+from .funnel import FunnelDeltas
+from .history import status_history
+from .models import Company, Department, Employee, adjust_employee_counters
+from .outbox import employee_events, employee_payload, publish
+from .serializers import EmployeeImportSerializer
+from .versions import bump_versions
+
+
+class EmployeeImporter:
+    """
+    Streams employee rows out of a CSV or NDJSON upload and inserts them
+    with bulk_create, one transaction per batch. Invalid rows are reported
+    by line number and skipped, the rest of the file is still imported.
+    Only one batch and a bounded number of errors are held in memory.
+    """
+    formats = ('csv', 'ndjson')
+
+    def __init__(self, batch_size=1000, max_reported_errors=100):
+        self.batch_size = batch_size
+        self.max_reported_errors = max_reported_errors
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    @classmethod
+    def guess_format(cls, upload):
+        name = (upload.name or '').lower()
+        content_type = (upload.content_type or '').lower()
+        if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'ndjson'
+        return 'csv'
+
+    def run(self, upload, file_format):
+        serializer = EmployeeImportSerializer(context={
+            'department_companies': dict(Department.objects.values_list('id', 'company_id')),
+        })
+
+        batch = []
+        for line, row, error in self.read_rows(upload, file_format):
+            if error is None:
+                try:
+                    attrs = serializer.run_validation(row)
+                except serializers.ValidationError as exc:
+                    error = exc.detail
+            if error is not None:
+                self.add_error(line, error)
+                continue
+
+            employee = Employee(**attrs)
+            employee.stamp_tenure()
+            batch.append((line, employee))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        self.flush(batch)
+
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+    def read_rows(self, upload, file_format):
+        """Yield (line number, row, parse error) for every record in the file."""
+        lines = codecs.iterdecode(upload, 'utf-8-sig')
+
+        if file_format == 'csv':
+            reader = csv.DictReader(lines)
+            for row in reader:
+                # CSV has no nulls: treat empty cells as missing so defaults apply.
+                yield reader.line_num, {key: value for key, value in row.items() if value not in ('', None)}, None
+            return
+
+        for line, text in enumerate(lines, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text), None
+            except ValueError as exc:
+                yield line, None, {'non_field_errors': [f'Invalid JSON: {exc}']}
+
+    def flush(self, batch):
+        if not batch:
+            return
+        employees = [employee for _, employee in batch]
+        try:
+            with transaction.atomic():
+                self.insert(employees)
+                adjust_employee_counters(
+                    Counter(employee.company_id for employee in employees),
+                    Counter(employee.department_id for employee in employees),
+                )
+                funnel = FunnelDeltas()
+                for employee in employees:
+                    funnel.add(employee.company_id, employee.department_id, employee.status, employee.hired_date)
+                funnel.apply()
+                status_history.record_many(
+                    (employee.pk, employee.company_id, employee.department_id, None, employee.status)
+                    for employee in employees
+                )
+                publish(employee_events((employee_payload(employee) for employee in employees), created=True))
+                bump_versions(Company, Department, Employee)
+        except DatabaseError as exc:
+            for line, _ in batch:
+                self.add_error(line, {'non_field_errors': [str(exc)]})
+            return
+        self.created += len(employees)
+
+    def insert(self, employees):
+        """
+        bulk_create() the employees and set their primary keys. MySQL does
+        not return them, so they are read back: in this transaction the rows
+        past the previous highest key are the batch, in insertion order. If
+        rows committed by another writer show up among them the batch is
+        refused rather than matched to the wrong keys.
+        """
+        if connection.features.can_return_rows_from_bulk_insert:
+            Employee.objects.bulk_create(employees)
+            return
+
+        last_pk = Employee.objects.aggregate(last=Max('pk'))['last'] or 0
+        Employee.objects.bulk_create(employees)
+        pks = list(Employee.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True))
+        if len(pks) != len(employees):
+            raise DatabaseError('Employees were added concurrently, import these rows again.')
+        for employee, pk in zip(employees, pks):
+            employee.pk = pk
+
+    def add_error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({'line': line, 'errors': errors})
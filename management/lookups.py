@@ -0,0 +1,130 @@
+import threading
+
+from django.conf import settings
+from rest_framework.response import Response
+
+from core.cache import LRUCache
+from .filters import LookupFilterSerializer
+from .models import Company, Department
+from .versions import table_versions
+
+
+lookup_cache = LRUCache(maxsize=settings.LOOKUP_CACHE['MAXSIZE'])
+
+
+def lookup_rows(model, fields, version, **filters):
+    """
+    The `fields` of every `model` row matching `filters` as tuples ordered by
+    name, read with one query and kept in `lookup_cache` until the model's
+    table version changes.
+    """
+    key = (model._meta.label_lower, fields, tuple(sorted(filters.items())))
+    cached = lookup_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    rows = tuple(model.objects.filter(**filters).order_by('name', 'id').values_list(*fields))
+    lookup_cache.set(key, (version, rows))
+    return rows
+
+
+class LookupModeMixin:
+    """
+    Lets an unpaginated list view answer ?mode=lookup with just the `id` and
+    `name` (plus `lookup_extra_fields`) of its rows for form dropdowns,
+    served from an in-process cache invalidated by the table version.
+    Rows can be narrowed with ?company= (when `lookup_company_field` is
+    set) and ?search=, and at most ?limit= of them are returned along with
+    the total count.
+    """
+    lookup_mode_query_param = 'mode'
+    lookup_extra_fields = ()
+    lookup_company_field = None
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.lookup_mode_query_param) != 'lookup':
+            return super().list(request, *args, **kwargs)
+
+        serializer = LookupFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        model = self.get_queryset().model
+        filters = {}
+        if self.lookup_company_field and 'company' in params:
+            filters[self.lookup_company_field] = params['company']
+
+        versions = getattr(self, 'table_versions', None) or table_versions(model)
+        version = versions.get(model._meta.label_lower, (0,))[0]
+        fields = ('id', 'name', *self.lookup_extra_fields)
+        rows = lookup_rows(model, fields, version, **filters)
+
+        if params.get('search'):
+            term = params['search'].casefold()
+            rows = [row for row in rows if term in row[1].casefold()]
+
+        return Response({
+            'count': len(rows),
+            'results': [dict(zip(fields, row)) for row in rows[:params['limit']]],
+        })
+
+
+
+class DepartmentCompanies:
+    """
+    In-process copy of every department's company id and of the set of
+    company ids, so employee writes are validated without querying those
+    tables.
+
+    The copy is keyed on the Company and Department table versions, which
+    load() reads from the database, so a change made by any process is seen
+    by the next validation. A validation loads once and passes the copy to
+    company_exists() and company_of(). Ids missing from the copy, or a
+    department under another company, are checked again against a fresh
+    copy before a write is rejected.
+
+    Versions are bumped after the changing transaction commits, so a write
+    validated between a department move's commit and its version bump is
+    still checked against the department's old company.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.revision = None
+        self.companies = frozenset()
+        self.departments = {}
+
+    def load(self, refresh=False):
+        """
+        The (company ids, department -> company id) copy. `refresh` reloads
+        it without reading the versions first.
+        """
+        revision = None
+        if not refresh:
+            versions = table_versions(Company, Department)
+            revision = tuple(versions.get(model._meta.label_lower, (0,))[0] for model in (Company, Department))
+        with self.lock:
+            if refresh or revision != self.revision:
+                self.companies = frozenset(Company.objects.values_list('id', flat=True))
+                self.departments = dict(Department.objects.values_list('id', 'company_id'))
+                # A refreshed copy is at least as new as the versions last read.
+                self.revision = revision or self.revision
+            return self.companies, self.departments
+
+    def company_exists(self, company_id, loaded):
+        """Whether the company is in `loaded`, the copy from load(), or else in a fresh one."""
+        return company_id in loaded[0] or company_id in self.load(refresh=True)[0]
+
+    def company_of(self, department_id, company_id, loaded):
+        """
+        The company id of the department in `loaded`, None when it does not
+        exist. When it is not `company_id`, the answer comes from a fresh
+        copy.
+        """
+        owner_id = loaded[1].get(department_id)
+        if owner_id is None or owner_id != company_id:
+            owner_id = self.load(refresh=True)[1].get(department_id)
+        return owner_id
+
+
+department_companies = DepartmentCompanies()
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from management.archive import bulk_delete
+from management.models import Employee, EmployeeStatus
+
+
+class Command(BaseCommand):
+    help = (
+        'Move stale applicants (by default not accepted or never interviewed, untouched for '
+        'EMPLOYEE_ARCHIVE AFTER_DAYS) from the employee table to the archive, one bounded batch '
+        'per transaction. Meant to run nightly.'
+    )
+
+    def add_arguments(self, parser):
+        archive = settings.EMPLOYEE_ARCHIVE
+        parser.add_argument('--days', type=int, default=archive['AFTER_DAYS'], help='Archive rows untouched this long.')
+        parser.add_argument(
+            '--statuses', default=','.join(archive['STATUSES']), help='Comma separated statuses to archive.',
+        )
+        parser.add_argument('--batch-size', type=int, default=archive['BATCH_SIZE'], help='Rows moved per transaction.')
+        parser.add_argument('--max-rows', type=int, default=0, help='Stop after this many rows, 0 for no limit.')
+        parser.add_argument('--dry-run', action='store_true', help='Count the rows that would be archived.')
+
+    def handle(self, *args, **options):
+        statuses = [status.strip() for status in options['statuses'].split(',') if status.strip()]
+        valid = {value for value, _ in EmployeeStatus}
+        if not statuses or set(statuses) - valid:
+            raise CommandError(f'Statuses must be some of {", ".join(sorted(valid))}.')
+        if 'hired' in statuses:
+            raise CommandError('Hired employees are never archived.')
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        stale = Employee.objects.filter(status__in=statuses, updated_at__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f'{stale.count()} employee(s) would be archived.')
+            return
+
+        archived = 0
+        while not options['max_rows'] or archived < options['max_rows']:
+            limit = options['batch_size']
+            if options['max_rows']:
+                limit = min(limit, options['max_rows'] - archived)
+            ids = list(stale.order_by('pk').values_list('pk', flat=True)[:limit])
+            if not ids:
+                break
+            # The filter is applied again under the row locks, skipping rows changed since.
+            results = bulk_delete(queryset=stale.filter(pk__in=ids), archive=True, max_rows=limit)
+            archived += len(results)
+            self.stdout.write(f'{archived} archived')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} employee(s).'))
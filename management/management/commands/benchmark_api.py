@@ -0,0 +1,325 @@
+import json
+import time
+import uuid
+from fnmatch import fnmatch
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from authentication.backends import user_cache
+from authentication.models import User
+from authentication.serializers import CustomObtainPairSerializer
+from core.benchmark import compare, summarize
+from management.dashboard import dashboard_cache_key
+from management.lookups import lookup_cache
+from management.archive import bulk_delete
+from management.models import ArchivedEmployee, Company, Department, Employee
+from management.urls import urlpatterns
+from management.versions import table_versions, versions_key
+
+
+# Routes exercised besides everything in management.urls.
+AUTH_ROUTES = ['token_obtain_pair', 'token_refresh']
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every management endpoint and the auth token endpoints in process against '
+        'the current database (seed one with seed_data). Reports p50/p95/p99 latency, '
+        'throughput and queries per request, and compares them with a stored baseline. '
+        'Writes are rolled back at the end, so the dataset is the same for every run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per scenario.')
+        parser.add_argument(
+            '--only', default='*',
+            help='Comma separated glob patterns of the scenarios to run, e.g. "employee-*,dashboard".',
+        )
+        parser.add_argument('--json', dest='json_path', help='Write the results to this file.')
+        parser.add_argument('--baseline', help='Results file of an earlier run to compare with.')
+        parser.add_argument(
+            '--max-latency-regression', type=float, default=0.2,
+            help='Allowed p95 growth over the baseline, as a fraction.',
+        )
+        parser.add_argument(
+            '--min-latency-delta-ms', type=float, default=1.0,
+            help='p95 growth below this many milliseconds is never a regression.',
+        )
+        parser.add_argument(
+            '--max-query-increase', type=int, default=0,
+            help='Allowed extra queries per request over the baseline.',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as fp:
+                baseline = json.load(fp)
+
+        if not Employee.objects.exists():
+            raise CommandError('No employees to benchmark against, run seed_data first.')
+
+        patterns = options['only'].split(',')
+        try:
+            with transaction.atomic():
+                results = self.run(options, patterns)
+                transaction.set_rollback(True)
+        finally:
+            # Caches filled while the rolled back writes were visible, under
+            # table versions their rollback left unchanged.
+            models = (Company, Department, Employee)
+            cache.delete(dashboard_cache_key(versions_key(table_versions(*models), *models)))
+            lookup_cache.clear()
+            user_cache.clear()
+
+        for row in results:
+            self.stdout.write(
+                f"{row['name']:<40} {row['method']:<6} {row['status']} "
+                f"p50 {row['latency']['p50_ms']:>9.3f} ms, p95 {row['latency']['p95_ms']:>9.3f} ms, "
+                f"p99 {row['latency']['p99_ms']:>9.3f} ms, {row['requests_per_second']:>8.1f} req/s, "
+                f"{row['queries']} queries"
+            )
+
+        report = {
+            'dataset': {
+                'companies': Company.objects.count(),
+                'departments': Department.objects.count(),
+                'employees': Employee.objects.count(),
+                'users': User.objects.count(),
+            },
+            'database': connection.vendor,
+            'repeat': options['repeat'],
+            'endpoints': results,
+        }
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fp:
+                json.dump(report, fp, indent=2)
+
+        if baseline is not None:
+            regressions = compare(
+                results, baseline['endpoints'],
+                max_latency_regression=options['max_latency_regression'],
+                min_latency_delta_ms=options['min_latency_delta_ms'],
+                max_query_increase=options['max_query_increase'],
+            )
+            if baseline.get('dataset') != report['dataset']:
+                self.stderr.write(self.style.WARNING('The baseline was recorded against a different dataset.'))
+            if regressions:
+                for line in regressions:
+                    self.stderr.write(line)
+                raise CommandError(f'{len(regressions)} regression(s) against {options["baseline"]}.')
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {options["baseline"]}.'))
+
+    def run(self, options, patterns):
+        password = uuid.uuid4().hex
+        self.user = User.objects.create_user(
+            email=f'benchmark-{uuid.uuid4().hex}@example.com', name='Benchmark', role='admin',
+            password=password,
+        )
+        self.password = password
+        token = CustomObtainPairSerializer.get_token(self.user)
+        self.refresh_token = str(token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+
+        self.company_pks = list(Company.objects.order_by('pk').values_list('pk', flat=True)[:100])
+        self.departments = list(
+            Department.objects.order_by('pk').values_list('pk', 'company_id')[:100]
+        )
+        runs = options['warmup'] + options['repeat']
+        self.employee_pks = list(Employee.objects.order_by('pk').values_list('pk', flat=True)[:100])
+        # Deleted one per request, so each scenario run needs its own rows.
+        self.doomed_pks = list(
+            Employee.objects.order_by('-pk').values_list('pk', flat=True)[:runs]
+        )
+        self.bulk_doomed_pks = list(
+            Employee.objects.order_by('-pk').values_list('pk', flat=True)[runs:runs + runs * 100]
+        )
+        self.archived_pk = ArchivedEmployee.objects.order_by('pk').values_list('pk', flat=True).first()
+        if self.archived_pk is None and self.bulk_doomed_pks:
+            # The archive starts empty, give the archive reads one row.
+            self.archived_pk = self.bulk_doomed_pks.pop(0)
+            bulk_delete(ids=[self.archived_pk], archive=True)
+
+        scenarios = self.scenarios()
+        covered = {route for _, route, _ in scenarios}
+        routes = {pattern.name for pattern in urlpatterns} | set(AUTH_ROUTES)
+        if missing := routes - covered:
+            raise CommandError(f'No benchmark scenario for: {", ".join(sorted(missing))}.')
+
+        return [
+            self.measure(scenario, options) for scenario in scenarios
+            if any(fnmatch(scenario[0], pattern) for pattern in patterns)
+        ]
+
+    def measure(self, scenario, options):
+        name, route, build = scenario
+        samples, queries, status = [], 0, None
+        for iteration in range(options['warmup'] + options['repeat']):
+            method, path, data, extra = build(iteration)
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(self.client, method)(path, data, **extra)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = time.perf_counter() - started
+            if iteration >= options['warmup']:
+                samples.append(elapsed)
+                queries = max(queries, len(captured))
+            status = response.status_code
+
+        total = sum(samples)
+        return {
+            'name': name,
+            'route': route,
+            'method': method.upper(),
+            'path': path,
+            'status': status,
+            'latency': summarize(samples),
+            'requests_per_second': round(len(samples) / total, 1) if total else 0.0,
+            'queries': queries,
+        }
+
+    def scenarios(self):
+        """
+        (name, route name, build) triples, where build(iteration) returns
+        (method, path, data, client kwargs). Writes come last so every read
+        runs against the seeded data only.
+        """
+        company = self.company_pks[0]
+        department, department_company = self.departments[0]
+        employee = self.employee_pks[0]
+        statuses = ['interview_scheduled', 'application_received']
+
+        def get(route, params=None, **kwargs):
+            return lambda iteration: ('get', reverse(route, kwargs=kwargs or None), params, {})
+
+        def employee_row(iteration):
+            return {
+                'company': department_company,
+                'department': department,
+                'employee_name': f'Benchmark {iteration}',
+                'employee_email': f'benchmark{iteration}@example.com',
+                'phone_number': '+123456789',
+                'address': 'Address',
+                'designation': 'Engineer',
+            }
+
+        def import_file(iteration):
+            rows = [employee_row(iteration * 100 + index) for index in range(100)]
+            lines = [','.join(rows[0])] + [','.join(str(value) for value in row.values()) for row in rows]
+            return {'file': SimpleUploadedFile('employees.csv', ('\n'.join(lines) + '\n').encode())}
+
+        return [
+            ('company-list', 'company-list', get('company-list')),
+            ('company-list-all', 'company-list-all', get('company-list-all')),
+            ('company-list-all?mode=lookup', 'company-list-all', get('company-list-all', {'mode': 'lookup'})),
+            ('company-detail', 'company-detail', get('company-detail', pk=company)),
+            ('company-export', 'company-export', get('company-export')),
+            ('department-list', 'department-list', get('department-list')),
+            ('department-list-all', 'department-list-all', get('department-list-all')),
+            (
+                'department-list-all?mode=lookup', 'department-list-all',
+                get('department-list-all', {'mode': 'lookup', 'company': company}),
+            ),
+            ('department-detail', 'department-detail', get('department-detail', pk=department)),
+            ('department-export', 'department-export', get('department-export')),
+            ('employee-list', 'employee-list', get('employee-list')),
+            ('employee-list?status', 'employee-list', get('employee-list', {'status': 'hired'})),
+            ('employee-list?search', 'employee-list', get('employee-list', {'search': 'patel'})),
+            ('employee-list?pagination=cursor', 'employee-list', get('employee-list', {'pagination': 'cursor'})),
+            (
+                'employee-list?fields', 'employee-list',
+                get('employee-list', {'fields': 'employee_name,status,department', 'page_size': 100}),
+            ),
+            ('employee-list?page_size=100', 'employee-list', get('employee-list', {'page_size': 100})),
+            ('employee-hired-list', 'employee-hired-list', get('employee-hired-list')),
+            ('employee-detail', 'employee-detail', get('employee-detail', pk=employee)),
+            ('employee-export', 'employee-export', get('employee-export', {'company': company})),
+            ('employee-hired-export', 'employee-hired-export', get('employee-hired-export', {'company': company})),
+            ('employee-sync', 'employee-sync', get('employee-sync')),
+            ('employee-archived-list', 'employee-archived-list', get('employee-archived-list')),
+            (
+                'employee-archived-detail', 'employee-archived-detail',
+                get('employee-archived-detail', pk=self.archived_pk or 0),
+            ),
+            ('dashboard', 'dashboard', get('dashboard')),
+            ('dashboard-funnel', 'dashboard-funnel', get('dashboard-funnel')),
+            ('dashboard-funnel?company', 'dashboard-funnel', get('dashboard-funnel', {'company': company})),
+            ('employee-status-durations', 'employee-status-durations', get('employee-status-durations')),
+            (
+                'employee-status-durations?department', 'employee-status-durations',
+                get('employee-status-durations', {'group_by': 'department', 'company': company}),
+            ),
+            ('user-account-list', 'user-account-list', get('user-account-list')),
+            ('async-company-list', 'async-company-list', get('async-company-list')),
+            ('async-company-detail', 'async-company-detail', get('async-company-detail', pk=company)),
+            ('async-department-list', 'async-department-list', get('async-department-list')),
+            ('async-department-detail', 'async-department-detail', get('async-department-detail', pk=department)),
+            ('async-employee-list', 'async-employee-list', get('async-employee-list')),
+            ('async-employee-hired-list', 'async-employee-hired-list', get('async-employee-hired-list')),
+            ('async-employee-detail', 'async-employee-detail', get('async-employee-detail', pk=employee)),
+            ('async-dashboard', 'async-dashboard', get('async-dashboard')),
+            (
+                'token_refresh', 'token_refresh',
+                lambda iteration: ('post', reverse('token_refresh'), {'refresh': self.refresh_token}, {'format': 'json'}),
+            ),
+            (
+                'token_obtain_pair', 'token_obtain_pair',
+                lambda iteration: (
+                    'post', reverse('token_obtain_pair'),
+                    {'email': self.user.email, 'password': self.password}, {'format': 'json'},
+                ),
+            ),
+            (
+                'employee-create', 'employee-create',
+                lambda iteration: ('post', reverse('employee-create'), employee_row(iteration), {'format': 'json'}),
+            ),
+            (
+                'employee-import', 'employee-import',
+                lambda iteration: ('post', reverse('employee-import'), import_file(iteration), {'format': 'multipart'}),
+            ),
+            (
+                'employee-update', 'employee-update',
+                lambda iteration: (
+                    'patch', reverse('employee-update', kwargs={'pk': employee}),
+                    {'designation': f'Engineer {iteration}'}, {'format': 'json'},
+                ),
+            ),
+            (
+                'employee-status-update', 'employee-status-update',
+                lambda iteration: (
+                    'post', reverse('employee-status-update', kwargs={'pk': employee}),
+                    {'status': statuses[iteration % 2]}, {'format': 'json'},
+                ),
+            ),
+            (
+                'employee-status-bulk-update', 'employee-status-bulk-update',
+                lambda iteration: (
+                    'post', reverse('employee-status-bulk-update'),
+                    {'status': statuses[iteration % 2], 'ids': self.employee_pks}, {'format': 'json'},
+                ),
+            ),
+            (
+                'employee-delete', 'employee-delete',
+                lambda iteration: (
+                    'delete', reverse('employee-delete', kwargs={'pk': self.doomed_pks[iteration % len(self.doomed_pks)]}),
+                    None, {},
+                ),
+            ),
+            (
+                'employee-bulk-delete?archive', 'employee-bulk-delete',
+                lambda iteration: (
+                    'post', reverse('employee-bulk-delete'),
+                    {'ids': self.bulk_doomed_pks[iteration * 100:(iteration + 1) * 100] or [0], 'archive': True},
+                    {'format': 'json'},
+                ),
+            ),
+        ]
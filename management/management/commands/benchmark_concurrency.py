@@ -0,0 +1,146 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.models import User
+from authentication.serializers import CustomObtainPairSerializer
+from core.benchmark import summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the throughput of a read endpoint served by the sync views under WSGI (gunicorn, '
+        'gthread workers) and by the async views under ASGI (uvicorn) with many concurrent slow '
+        'clients. Each client trickles its request headers and waits before reading the response, '
+        'like a client on a slow network. Needs gunicorn and uvicorn installed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='employees/', help='Endpoint under /api/v1/management/.')
+        parser.add_argument('--clients', type=int, default=200, help='Concurrent client connections.')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests sent per server.')
+        parser.add_argument(
+            '--client-delay-ms', type=int, default=100,
+            help='Pause in the middle of sending each request and again before reading the response.',
+        )
+        parser.add_argument('--workers', type=int, default=1, help='Server processes.')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker.')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(
+            email=f'benchmark-{uuid.uuid4().hex}@example.com', name='Benchmark', role='manager',
+            password=uuid.uuid4().hex,
+        )
+        token = str(CustomObtainPairSerializer.get_token(user).access_token)
+        servers = [
+            ('wsgi', f"/api/v1/management/{options['path']}", [
+                '-m', 'gunicorn', 'project.wsgi:application', '--bind', f"127.0.0.1:{options['port']}",
+                '--workers', str(options['workers']), '--worker-class', 'gthread',
+                '--threads', str(options['threads']), '--log-level', 'warning',
+            ]),
+            ('asgi', f"/api/v1/management/async/{options['path']}", [
+                '-m', 'uvicorn', 'project.asgi:application', '--host', '127.0.0.1',
+                '--port', str(options['port']), '--workers', str(options['workers']),
+                '--log-level', 'warning', '--no-access-log',
+            ]),
+        ]
+
+        results = []
+        try:
+            for name, path, arguments in servers:
+                with self.serve(arguments, options['port']):
+                    results.append({'server': name, 'path': path, **self.load(path, token, options)})
+        finally:
+            user.delete()
+
+        for row in results:
+            self.stdout.write(
+                f"{row['server']}: {row['requests_per_second']:>8.1f} req/s, "
+                f"p50 {row['latency']['p50_ms']:>9.1f} ms, p99 {row['latency']['p99_ms']:>9.1f} ms, "
+                f"{row['errors']} error(s)"
+            )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fp:
+                json.dump(results, fp, indent=2)
+
+    @contextmanager
+    def serve(self, arguments, port):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE}
+        process = subprocess.Popen([sys.executable, *arguments], cwd=settings.BASE_DIR, env=env)
+        try:
+            deadline = time.monotonic() + 30
+            while True:
+                if process.poll() is not None:
+                    raise CommandError(f'{arguments[1]} exited, is it installed?')
+                try:
+                    socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise CommandError(f'{arguments[1]} did not start listening on port {port}.')
+                    time.sleep(0.2)
+            yield
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def load(self, path, token, options):
+        delay = options['client_delay_ms'] / 1000
+        head = f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'.encode()
+        tail = f'Authorization: Bearer {token}\r\nConnection: close\r\n\r\n'.encode()
+        remaining = options['requests']
+        latencies, errors = [], 0
+
+        async def request():
+            reader, writer = await asyncio.open_connection('127.0.0.1', options['port'])
+            try:
+                writer.write(head)
+                await writer.drain()
+                await asyncio.sleep(delay)
+                writer.write(tail)
+                await writer.drain()
+                await asyncio.sleep(delay)
+                response = await reader.read()
+            finally:
+                writer.close()
+            return response.startswith(b'HTTP/1.1 200')
+
+        async def client():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    ok = await asyncio.wait_for(request(), timeout=60)
+                except (OSError, asyncio.TimeoutError):
+                    ok = False
+                latencies.append(time.perf_counter() - started)
+                errors += not ok
+
+        async def run():
+            await asyncio.gather(*(client() for _ in range(options['clients'])))
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'seconds': round(elapsed, 3),
+            'requests_per_second': round(len(latencies) / elapsed, 1),
+            'latency': summarize(latencies),
+        }
@@ -0,0 +1,97 @@
+import json
+from base64 import b64encode
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.benchmark import measure, summarize
+from core.paginate import GlobalCursorPagination, GlobalPagination
+from management.models import Company, Department, Employee
+
+
+class Command(BaseCommand):
+    help = 'Compare page-number and cursor pagination latency at increasing page depths of /employees/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, default=0,
+            help='Seed this many synthetic employees first. They are rolled back afterwards.',
+        )
+        parser.add_argument('--page-size', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument(
+            '--depths', default='0,0.5,0.9,1',
+            help='Comma separated page depths as fractions of the table.',
+        )
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['rows']:
+                self.seed(options['rows'])
+            results = self.run(options)
+            transaction.set_rollback(True)
+
+        for row in results:
+            self.stdout.write(
+                f"depth {row['depth']:>4} (row {row['offset']:>9}): "
+                f"page-number p50 {row['page_number']['p50_ms']:>9.3f} ms, "
+                f"cursor p50 {row['cursor']['p50_ms']:>9.3f} ms"
+            )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fp:
+                json.dump(results, fp, indent=2)
+
+    def run(self, options):
+        page_size = options['page_size']
+        queryset = Employee.objects.for_serializer().order_by('id')
+        pks = list(Employee.objects.order_by('id').values_list('id', flat=True))
+        if not pks:
+            self.stderr.write('No employees to paginate, use --rows to seed some.')
+            return []
+
+        factory = APIRequestFactory()
+        results = []
+        for depth in (float(value) for value in options['depths'].split(',')):
+            page = min(int(depth * len(pks)) // page_size, (len(pks) - 1) // page_size)
+            offset = page * page_size
+
+            page_number_request = Request(factory.get('/', {'page': page + 1, 'page_size': page_size}))
+            cursor_params = {'page_size': page_size}
+            if offset:
+                cursor_params['cursor'] = b64encode(urlencode({'p': pks[offset - 1]}).encode()).decode()
+            cursor_request = Request(factory.get('/', cursor_params))
+
+            def page_number_page():
+                GlobalPagination().paginate_queryset(queryset, page_number_request)
+
+            def cursor_page():
+                GlobalCursorPagination().paginate_queryset(queryset, cursor_request)
+
+            results.append({
+                'depth': depth,
+                'offset': offset,
+                'page_number': summarize(measure(page_number_page, options['repeat'])),
+                'cursor': summarize(measure(cursor_page, options['repeat'])),
+            })
+        return results
+
+    def seed(self, rows, batch_size=5000):
+        company = Company.objects.create(name='Benchmark Company')
+        department = Department.objects.create(name='Benchmark Department', company=company)
+        for start in range(0, rows, batch_size):
+            Employee.objects.bulk_create(
+                Employee(
+                    company=company,
+                    department=department,
+                    employee_name=f'Employee {index}',
+                    employee_email=f'employee{index}@example.com',
+                    phone_number='+123456789',
+                    address='Address',
+                    designation='Engineer',
+                )
+                for index in range(start, min(start + batch_size, rows))
+            )
@@ -0,0 +1,71 @@
+import json
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.benchmark import measure, summarize
+from core.renderers import FastJSONRenderer
+from management.models import Employee
+from management.serializers import EmployeeListSerializer, EmployeeSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare serializing and rendering employee list pages with EmployeeSerializer and '
+        'JSONRenderer against EmployeeListSerializer and FastJSONRenderer. Rows are fetched '
+        'before timing, so only the CPU work is measured.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes', default='10,100,1000',
+            help='Comma separated numbers of employees per rendered page.',
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--json', dest='json_path', help='Also write the results to this file.')
+
+    def handle(self, *args, **options):
+        results = []
+        for page_size in (int(value) for value in options['page_sizes'].split(',')):
+            employees = list(Employee.objects.for_serializer().order_by('id')[:page_size])
+            rows = list(EmployeeListSerializer.rows(Employee.objects.order_by('id'))[:page_size])
+            if not employees:
+                self.stderr.write('No employees to serialize, seed some first.')
+                return
+
+            def envelope(data):
+                return {'success': True, 'message': 'Employees retrieved successfully', 'data': data, 'errors': None}
+
+            def model_serializer():
+                return JSONRenderer().render(envelope(EmployeeSerializer(employees, many=True).data))
+
+            def values_serializer():
+                return JSONRenderer().render(envelope(EmployeeListSerializer(rows, many=True).data))
+
+            def values_serializer_fast_renderer():
+                return FastJSONRenderer().render(envelope(EmployeeListSerializer(rows, many=True).data))
+
+            if not model_serializer() == values_serializer() == values_serializer_fast_renderer():
+                self.stderr.write(f'Output differs between the paths at page size {page_size}.')
+
+            baseline = summarize(measure(model_serializer, options['repeat']))
+            fast = summarize(measure(values_serializer_fast_renderer, options['repeat']))
+            results.append({
+                'page_size': len(employees),
+                'model_serializer': baseline,
+                'values_serializer': summarize(measure(values_serializer, options['repeat'])),
+                'values_serializer_fast_renderer': fast,
+                'speedup': round(baseline['p50_ms'] / fast['p50_ms'], 2) if fast['p50_ms'] else None,
+            })
+
+        for row in results:
+            self.stdout.write(
+                f"{row['page_size']:>6} rows: "
+                f"model p50 {row['model_serializer']['p50_ms']:>9.3f} ms, "
+                f"values p50 {row['values_serializer']['p50_ms']:>9.3f} ms, "
+                f"values + fast renderer p50 {row['values_serializer_fast_renderer']['p50_ms']:>9.3f} ms "
+                f"({row['speedup']}x)"
+            )
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fp:
+                json.dump(results, fp, indent=2)
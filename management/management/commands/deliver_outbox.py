@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from management.outbox import OutboxDelivery
+
+
+class Command(BaseCommand):
+    help = (
+        'Deliver queued employee and department events to the OUTBOX endpoints in batches, '
+        'retrying failures with exponential backoff. Runs until interrupted unless --once is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Deliver what is due now, then exit.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds to wait when nothing is due.')
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.OUTBOX['BATCH_SIZE'], help='Events claimed per pass.',
+        )
+
+    def handle(self, *args, **options):
+        delivery = OutboxDelivery({'BATCH_SIZE': options['batch_size']})
+        total_delivered = total_failed = 0
+        try:
+            while True:
+                delivered, failed = delivery.deliver_due()
+                total_delivered += delivered
+                total_failed += failed
+                if delivered or failed:
+                    self.stdout.write(f'{delivered} delivered, {failed} failed')
+                    continue
+                pruned = delivery.prune()
+                if pruned:
+                    self.stdout.write(f'Pruned {pruned} delivered event(s).')
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Delivered {total_delivered} event(s), {total_failed} failed and will be retried.'
+        ))
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from management.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. Meant to run nightly.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+            help='Keep tombstones for this many days.',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} tombstone(s).'))
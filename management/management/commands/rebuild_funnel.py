@@ -0,0 +1,68 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+
+from management.funnel import apply_count_deltas
+from management.models import Employee, StatusCount, WeeklyHireCount
+from management.versions import bump_versions
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount the hiring funnel summary tables (employees per status and hires per week) '
+        'from the employee table and report any drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows fixed per UPDATE.')
+
+    def handle(self, *args, **options):
+        employees = Employee.objects.order_by()
+        tables = [
+            (
+                StatusCount,
+                ('company_id', 'department_id', 'status'),
+                employees.values('company_id', 'department_id', 'status').annotate(total=Count('pk')),
+            ),
+            (
+                WeeklyHireCount,
+                ('company_id', 'department_id', 'week'),
+                employees.filter(hired_date__isnull=False).annotate(week=TruncWeek('hired_date'))
+                .values('company_id', 'department_id', 'week').annotate(total=Count('pk')),
+            ),
+        ]
+
+        total_drift = 0
+        # Counting and fixing in one transaction keeps deltas applied meanwhile from being counted twice.
+        with transaction.atomic():
+            for model, key_fields, counted in tables:
+                actual = Counter({tuple(row[field] for field in key_fields): row['total'] for row in counted})
+                stored = Counter({
+                    tuple(row[:-1]): row[-1]
+                    for row in model.objects.values_list(*key_fields, 'count').iterator(chunk_size=5000)
+                })
+
+                deltas = {}
+                for key in sorted(actual.keys() | stored.keys(), key=str):
+                    if actual[key] != stored[key]:
+                        self.stdout.write(
+                            f"{model.__name__} {'/'.join(map(str, key))}: count is {stored[key]}, expected {actual[key]}"
+                        )
+                        deltas[key] = actual[key] - stored[key]
+                total_drift += len(deltas)
+
+                if deltas and not options['dry_run']:
+                    apply_count_deltas(model, key_fields, deltas, options['batch_size'])
+                    model.objects.filter(count=0).delete()
+                    bump_versions(model)
+
+        if not total_drift:
+            self.stdout.write(self.style.SUCCESS('The funnel summary is correct.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{total_drift} funnel count(s) drifted, nothing fixed (dry run).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{total_drift} funnel count(s) drifted and were fixed.'))
@@ -0,0 +1,52 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+from management.models import Employee
+from management.versions import bump_versions
+
+
+class Command(BaseCommand):
+    help = 'Recompute day_employee for every employee from hired_date. Meant to run nightly.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Distinct hire dates handled per UPDATE statement.',
+        )
+
+    def handle(self, *args, **options):
+        today = date.today()
+        batch_size = options['batch_size']
+
+        # Every employee hired on the same day has the same tenure, so the
+        # work is one CASE branch per distinct hire date rather than per row.
+        hired_dates = list(
+            Employee.objects.filter(hired_date__isnull=False)
+            .order_by('hired_date')
+            .values_list('hired_date', flat=True)
+            .distinct()
+        )
+
+        # Only day_employee changes: it follows from hired_date and the date,
+        # so bumping updated_at would make every hired row look edited to
+        # incremental sync and to archive_employees' staleness check.
+        updated = 0
+        for start in range(0, len(hired_dates), batch_size):
+            batch = hired_dates[start:start + batch_size]
+            tenure = Case(
+                *[When(hired_date=hired_date, then=Value((today - hired_date).days)) for hired_date in batch],
+                output_field=IntegerField(),
+            )
+            with transaction.atomic():
+                updated += Employee.objects.filter(hired_date__in=batch).update(day_employee=tenure)
+
+        updated += Employee.objects.filter(hired_date__isnull=True).exclude(day_employee=0).update(day_employee=0)
+        if updated:
+            bump_versions(Employee)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed tenure for {updated} employee(s) across {len(hired_dates)} hire date(s).'
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from management.manager import count_subquery
+from management.models import Company, Department, Employee
+from management.versions import bump_versions
+
+
+# (model, counter field, counted model, foreign key on the counted model)
+COUNTERS = [
+    (Company, 'department_count', Department, 'company'),
+    (Company, 'employee_count', Employee, 'company'),
+    (Department, 'employee_count', Employee, 'department'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored company/department counters and report any drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows fixed per UPDATE.')
+
+    def handle(self, *args, **options):
+        total_drift = 0
+        for model, field, counted_model, foreign_key in COUNTERS:
+            actual = count_subquery(counted_model.objects.all(), foreign_key)
+            drifted = (
+                model.objects.annotate(actual=actual)
+                .filter(~Q(**{field: F('actual')}))
+                .order_by('pk')
+                .values_list('pk', field, 'actual')
+            )
+
+            batch = []
+            for pk, stored, counted in drifted.iterator(chunk_size=options['batch_size']):
+                self.stdout.write(f'{model.__name__} {pk}: {field} is {stored}, expected {counted}')
+                total_drift += 1
+                batch.append(pk)
+                if len(batch) >= options['batch_size']:
+                    self.fix(model, field, actual, batch, options['dry_run'])
+                    batch = []
+            self.fix(model, field, actual, batch, options['dry_run'])
+
+        if not total_drift:
+            self.stdout.write(self.style.SUCCESS('All counters are correct.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{total_drift} counter(s) drifted, nothing fixed (dry run).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{total_drift} counter(s) drifted and were fixed.'))
+
+    def fix(self, model, field, actual, pks, dry_run):
+        if dry_run or not pks:
+            return
+        # Recount inside the UPDATE so writes made since the scan are not lost.
+        with transaction.atomic():
+            model.objects.filter(pk__in=pks).update(**{field: actual, 'updated_at': timezone.now()})
+            bump_versions(model)
@@ -0,0 +1,203 @@
+import random
+import uuid
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from authentication.models import User
+from management.funnel import FunnelDeltas
+from management.models import (
+    Company, Department, Employee, EmployeeStatus, StatusTransition, adjust_employee_counters,
+)
+from management.versions import bump_versions
+
+
+FIRST_NAMES = [
+    'Aisha', 'Ben', 'Carlos', 'Diana', 'Elif', 'Farah', 'George', 'Hana', 'Ivan', 'Julia',
+    'Kenji', 'Laura', 'Mohamed', 'Nina', 'Omar', 'Priya', 'Quentin', 'Rosa', 'Sami', 'Tara',
+]
+LAST_NAMES = [
+    'Ahmed', 'Brown', 'Chen', 'Dubois', 'Evans', 'Fischer', 'Garcia', 'Hassan', 'Ito', 'Jensen',
+    'Kowalski', 'Lopez', 'Martin', 'Nguyen', 'Okafor', 'Patel', 'Rossi', 'Silva', 'Tanaka', 'Weber',
+]
+COMPANY_WORDS = ['Acme', 'Blue', 'Summit', 'Northwind', 'Vertex', 'Orbit', 'Harbor', 'Cedar', 'Pioneer', 'Lumen']
+COMPANY_SUFFIXES = ['Labs', 'Group', 'Systems', 'Partners', 'Holdings', 'Industries']
+DEPARTMENT_NAMES = [
+    'Engineering', 'Sales', 'Marketing', 'Finance', 'Human Resources', 'Support',
+    'Operations', 'Legal', 'Research', 'Design', 'Procurement', 'Security',
+]
+DESIGNATIONS = [
+    'Engineer', 'Senior Engineer', 'Analyst', 'Accountant', 'Designer', 'Recruiter',
+    'Sales Representative', 'Support Specialist', 'Team Lead', 'Manager',
+]
+STREETS = ['Main Street', 'Oak Avenue', 'Station Road', 'Park Lane', 'High Street', 'Lake Drive']
+CITIES = ['Berlin', 'Cairo', 'Dhaka', 'Lagos', 'Lisbon', 'Osaka', 'Toronto', 'Austin']
+
+# Share of seeded employees in each status, roughly what a hiring pipeline looks like.
+STATUS_WEIGHTS = {
+    'application_received': 45,
+    'interview_scheduled': 25,
+    'hired': 20,
+    'not_accepted': 10,
+}
+
+# Statuses each seeded employee went through to reach its current one.
+PIPELINES = {
+    'application_received': ['application_received'],
+    'interview_scheduled': ['application_received', 'interview_scheduled'],
+    'hired': ['application_received', 'interview_scheduled', 'hired'],
+    'not_accepted': ['application_received', 'interview_scheduled', 'not_accepted'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-generate a synthetic dataset of companies, departments, employees across every '
+        'status with their status history, and user accounts, for benchmarking. Rows are added '
+        'to whatever is already there; counters and table versions are kept in step.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=1000)
+        parser.add_argument('--departments', type=int, default=20000)
+        parser.add_argument('--employees', type=int, default=2000000)
+        parser.add_argument('--users', type=int, default=100, help='Manager and employee user accounts.')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows inserted per query.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, the same seed gives the same data.')
+
+    def handle(self, *args, **options):
+        if options['companies'] < 1 or options['departments'] < options['companies']:
+            raise CommandError('Seed at least one company and at least one department per company.')
+
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        # Keeps emails unique when seeding into a database that already has seeded rows.
+        self.run_id = uuid.uuid4().hex[:8]
+
+        companies = self.seed_companies(options['companies'])
+        departments = self.seed_departments(companies, options['departments'])
+        self.seed_employees(departments, options['employees'])
+        self.seed_users(options['users'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {options['companies']} companies, {options['departments']} departments, "
+            f"{options['employees']} employees and {options['users']} users."
+        ))
+
+    def created_pks(self, model, rows):
+        """
+        Insert `rows` and return their primary keys in insertion order. The
+        keys are read back because MySQL does not return them from
+        bulk_create().
+        """
+        last_pk = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        model.objects.bulk_create(rows, batch_size=self.batch_size)
+        return list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True))
+
+    def seed_companies(self, count):
+        with transaction.atomic():
+            pks = self.created_pks(Company, [
+                Company(name=f'{self.random.choice(COMPANY_WORDS)} {self.random.choice(COMPANY_SUFFIXES)} {index}')
+                for index in range(count)
+            ])
+            bump_versions(Company)
+        self.stdout.write(f'{len(pks)} companies')
+        return pks
+
+    def seed_departments(self, company_pks, count):
+        # Every company gets at least one department, the rest are spread at random.
+        owners = company_pks + [self.random.choice(company_pks) for _ in range(count - len(company_pks))]
+        with transaction.atomic():
+            pks = self.created_pks(Department, [
+                Department(name=f'{self.random.choice(DEPARTMENT_NAMES)} {index}', company_id=company_pk)
+                for index, company_pk in enumerate(owners)
+            ])
+            Company.objects.apply_deltas('department_count', Counter(owners))
+            bump_versions(Company, Department)
+        self.stdout.write(f'{len(pks)} departments')
+        return list(zip(pks, owners))
+
+    def seed_employees(self, departments, count):
+        statuses = [value for value, _ in EmployeeStatus]
+        weights = [STATUS_WEIGHTS.get(value, 1) for value in statuses]
+        today = date.today()
+
+        for start in range(0, count, self.batch_size):
+            employees = []
+            for index in range(start, min(start + self.batch_size, count)):
+                department_pk, company_pk = self.random.choice(departments)
+                status = self.random.choices(statuses, weights)[0]
+                hired_date = today - timedelta(days=self.random.randrange(5 * 365)) if status == 'hired' else None
+                first, last = self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES)
+                employees.append(Employee(
+                    company_id=company_pk,
+                    department_id=department_pk,
+                    status=status,
+                    employee_name=f'{first} {last}',
+                    employee_email=f'{first}.{last}.{self.run_id}.{index}@example.com'.lower(),
+                    phone_number=f'+1{self.random.randrange(10 ** 9, 10 ** 10)}',
+                    address=f'{self.random.randrange(1, 999)} {self.random.choice(STREETS)}, {self.random.choice(CITIES)}',
+                    designation=self.random.choice(DESIGNATIONS),
+                    hired_date=hired_date,
+                    day_employee=(today - hired_date).days if hired_date else 0,
+                ))
+
+            with transaction.atomic():
+                pks = self.created_pks(Employee, employees)
+                StatusTransition.objects.bulk_create(
+                    (
+                        transition
+                        for pk, employee in zip(pks, employees)
+                        for transition in self.history(pk, employee)
+                    ),
+                    batch_size=self.batch_size,
+                )
+                adjust_employee_counters(
+                    Counter(employee.company_id for employee in employees),
+                    Counter(employee.department_id for employee in employees),
+                )
+                funnel = FunnelDeltas()
+                for employee in employees:
+                    funnel.add(employee.company_id, employee.department_id, employee.status, employee.hired_date)
+                funnel.apply()
+                bump_versions(Company, Department, Employee, StatusTransition)
+            self.stdout.write(f'{start + len(employees)}/{count} employees')
+
+    def history(self, pk, employee):
+        """Status transitions leading to the employee's status, a few days apart."""
+        if employee.hired_date:
+            changed_at = timezone.make_aware(datetime.combine(employee.hired_date, time(12)))
+        else:
+            changed_at = timezone.now() - timedelta(hours=self.random.randrange(24 * 180))
+        statuses = PIPELINES.get(employee.status, ['application_received', employee.status])
+
+        transitions = []
+        for from_status, to_status in reversed(list(zip([None, *statuses], statuses))):
+            transitions.append(StatusTransition(
+                employee_id=pk,
+                company_id=employee.company_id,
+                department_id=employee.department_id,
+                from_status=from_status,
+                to_status=to_status,
+                changed_at=changed_at,
+            ))
+            changed_at -= timedelta(hours=self.random.randrange(24, 24 * 30))
+        return transitions
+
+    def seed_users(self, count):
+        # The password hash is computed once; hashing per user would dominate the run.
+        template = User(role='manager')
+        template.set_password(uuid.uuid4().hex)
+        User.objects.bulk_create(
+            User(
+                email=f'user.{self.run_id}.{index}@example.com',
+                name=f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}',
+                role='manager' if index % 10 == 0 else 'employee',
+                password=template.password,
+            )
+            for index in range(count)
+        )
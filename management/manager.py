@@ -0,0 +1,57 @@
+from collections import defaultdict
+from django.db import models
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def count_subquery(queryset, field):
+    """
+    Correlated COUNT(*) subquery of `queryset` grouped on `field`.
+    Used instead of Count() joins so several counts on the same row
+    do not multiply each other. Used to reconcile the stored counter
+    columns, which serializers read instead.
+    """
+    counted = (
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+class CounterQuerySet(models.QuerySet):
+
+    def apply_deltas(self, field, deltas):
+        """
+        Add each delta in `deltas` (a mapping of pk -> delta) to the stored
+        counter `field` with one UPDATE per distinct delta value.
+        """
+        pks_by_delta = defaultdict(list)
+        for pk, delta in deltas.items():
+            if pk is not None and delta:
+                pks_by_delta[delta].append(pk)
+
+        now = timezone.now()
+        for delta, pks in pks_by_delta.items():
+            self.filter(pk__in=pks).update(**{field: F(field) + delta, 'updated_at': now})
+
+
+class CompanyQuerySet(CounterQuerySet):
+    pass
+
+
+class DepartmentQuerySet(CounterQuerySet):
+    pass
+
+
+class EmployeeQuerySet(models.QuerySet):
+
+    def for_serializer(self):
+        """
+        Join the company and department of every employee so serializing a
+        page costs the same number of queries whatever its size.
+        """
+        return self.select_related('company', 'department')
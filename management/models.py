@@ -1,15 +1,210 @@
-from django.db import models
+from django.db import models, router, transaction
 from authentication.models import User
+from collections import Counter
 from datetime import date
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import RegexValidator
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from django.utils import timezone
+from .manager import CompanyQuerySet, DepartmentQuerySet, EmployeeQuerySet
+
+
+
+class TrackedModel(models.Model):
+    """
+    Remembers the values loaded from the database so signal receivers can
+    tell what a save changed without reading the row again. Saves run in a
+    transaction so receivers keeping derived data in sync commit with them.
+    """
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        loaded_values = dict(zip(field_names, values))
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = loaded_values
+        return instance
+    
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+        
+        update_fields = kwargs.get('update_fields')
+        self._loaded_values = {
+            **getattr(self, '_loaded_values', {}),
+            **{
+                field.attname: getattr(self, field.attname)
+                for field in self._meta.concrete_fields
+                if field.attname in self.__dict__
+                and (update_fields is None or field.name in update_fields or field.attname in update_fields)
+            },
+        }
+    
+    def changed_value(self, field_name, update_fields=None):
+        """
+        Return the (old, new) values of `field_name` if the last save wrote
+        a different value than the one loaded, otherwise None.
+        """
+        attname = self._meta.get_field(field_name).attname
+        if update_fields is not None and not {field_name, attname} & set(update_fields):
+            return None
+        loaded_values = getattr(self, '_loaded_values', {})
+        if attname not in loaded_values:
+            return None
+        old, new = loaded_values[attname], getattr(self, attname)
+        return (old, new) if old != new else None
+
+
+
+class TableVersion(models.Model):
+    """
+    Modification counter per table, bumped on every write, so clients can
+    revalidate cached responses with a single primary key lookup.
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    modified_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = 'Table Version'
+        verbose_name_plural = 'Table Versions'
+    
+    def __str__(self):
+        return f'{self.name} v{self.version}'
+
+
+
+class Tombstone(models.Model):
+    """
+    Records the id of a deleted row so incremental sync clients can drop it
+    from their copy.
+    """
+    model = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+        indexes = [
+            models.Index(fields=['model', 'deleted_at', 'id'], name='tombstone_model_deleted_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.model} {self.object_id}'
+
+
+
+class StatusTransition(models.Model):
+    """
+    Append-only log of employee status changes. from_status is empty for
+    the status an employee was created with. The company and department
+    are the employee's at the time of the change.
+    """
+    employee_id = models.PositiveBigIntegerField()
+    company_id = models.PositiveBigIntegerField()
+    department_id = models.PositiveBigIntegerField()
+    from_status = models.CharField(max_length=255, blank=True, null=True)
+    to_status = models.CharField(max_length=255)
+    changed_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = 'Status Transition'
+        verbose_name_plural = 'Status Transitions'
+        indexes = [
+            # Walking each employee's history in order, optionally per company or department.
+            models.Index(fields=['employee_id', 'changed_at', 'id'], name='transition_employee_idx'),
+            models.Index(fields=['company_id', 'employee_id', 'changed_at'], name='transition_company_idx'),
+            models.Index(fields=['department_id', 'employee_id', 'changed_at'], name='transition_department_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.employee_id}: {self.from_status} -> {self.to_status}'
+
+
+
+class StatusCount(models.Model):
+    """
+    Number of employees per company, department and status, kept up to
+    date by delta so funnel numbers never scan the employee table.
+    """
+    company_id = models.PositiveBigIntegerField()
+    department_id = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=255)
+    count = models.BigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Status Count'
+        verbose_name_plural = 'Status Counts'
+        constraints = [
+            models.UniqueConstraint(fields=['company_id', 'department_id', 'status'], name='status_count_key'),
+        ]
+    
+    def __str__(self):
+        return f'{self.company_id}/{self.department_id} {self.status}: {self.count}'
+
+
+
+class WeeklyHireCount(models.Model):
+    """Number of employees per company and department hired in the week starting on `week`."""
+    company_id = models.PositiveBigIntegerField()
+    department_id = models.PositiveBigIntegerField()
+    week = models.DateField()
+    count = models.BigIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Weekly Hire Count'
+        verbose_name_plural = 'Weekly Hire Counts'
+        constraints = [
+            models.UniqueConstraint(fields=['company_id', 'department_id', 'week'], name='weekly_hire_count_key'),
+        ]
+        indexes = [
+            models.Index(fields=['week'], name='weekly_hire_week_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.company_id}/{self.department_id} {self.week}: {self.count}'
+
+
+
+class OutboxEvent(models.Model):
+    """
+    An employee or department change waiting to be delivered to one
+    webhook endpoint. Events are written in the transaction that made the
+    change, so one exists exactly when its change committed.
+    """
+    endpoint = models.URLField(max_length=500)
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        indexes = [
+            models.Index(fields=['delivered_at', 'next_attempt_at', 'id'], name='outbox_pending_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.topic} -> {self.endpoint}'
 
 
 
 class Company(models.Model):
     name = models.CharField(max_length=255)
+    department_count = models.PositiveIntegerField(default=0, editable=False)
+    employee_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
+    objects = CompanyQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Company'
@@ -21,9 +216,13 @@ class Company(models.Model):
     
     
 
-class Department(models.Model):
+class Department(TrackedModel):
     name = models.CharField(max_length=255)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='departments')
+    employee_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    objects = DepartmentQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Department'
@@ -43,7 +242,7 @@ EmployeeStatus = [
 ]
 
 
-class Employee(models.Model):
+class Employee(TrackedModel):
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='employees')
     department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='employees')
     status = models.CharField(max_length=255, choices=EmployeeStatus, default='application_received')
@@ -54,10 +253,24 @@ class Employee(models.Model):
     designation = models.CharField(max_length=255)
     hired_date = models.DateField(blank=True, null=True)
     day_employee = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = EmployeeQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Employee'
         verbose_name_plural = 'Employees'
+        indexes = [
+            # Hired list and status filters, walked in primary key order.
+            models.Index(fields=['status', 'id'], name='employee_status_id_idx'),
+            # Filtering by company and department together.
+            models.Index(fields=['company', 'department'], name='employee_company_dept_idx'),
+            models.Index(fields=['hired_date'], name='employee_hired_date_idx'),
+            models.Index(fields=['employee_email'], name='employee_email_idx'),
+            models.Index(fields=['designation'], name='employee_designation_idx'),
+            # Incremental sync, walked in (updated_at, id) order.
+            models.Index(fields=['updated_at', 'id'], name='employee_updated_at_idx'),
+        ]
         
     def __str__(self):
         return self.employee_name
@@ -69,25 +282,115 @@ class Employee(models.Model):
         return 0
     
     
-@receiver(post_save, sender=Employee)
-def update_employee_fields(sender, instance, created, **kwargs):
-    updated_fields = []
-
-    if instance.status == 'hired' and instance.hired_date is None:
-        instance.hired_date = date.today()
-        updated_fields.append('hired_date')
-
-    if instance.hired_date:
-        calculated_days = instance.calculate_day_employee()
-        if instance.day_employee != calculated_days:
-            instance.day_employee = calculated_days
-            updated_fields.append('day_employee')
-
-    if updated_fields:
-        instance.save(update_fields=updated_fields)
-        
+    def stamp_tenure(self):
+        """
+        Set hired_date when the employee becomes hired and refresh
+        day_employee. Returns the names of the fields that changed.
+        """
+        stamped_fields = []
         
+        if self.status == 'hired' and self.hired_date is None:
+            self.hired_date = date.today()
+            stamped_fields.append('hired_date')
         
+        calculated_days = self.calculate_day_employee()
+        if self.day_employee != calculated_days:
+            self.day_employee = calculated_days
+            stamped_fields.append('day_employee')
         
+        return stamped_fields
+    
+    
+    def save(self, *args, **kwargs):
+        """
+        Stamp hired_date and day_employee on the row being written, so a
+        hire or status change costs a single UPDATE. Partial saves also
+        write updated_at so incremental sync sees them.
+        """
+        stamped_fields = self.stamp_tenure()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *stamped_fields, 'updated_at'}
         
-        
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class ArchivedEmployee(models.Model):
+    """
+    Employee moved out of the hot table by the archive_employees command
+    or a bulk delete with archive set. Keeps the employee's id and its
+    company and department ids as they were when archived.
+    """
+    id = models.PositiveBigIntegerField(primary_key=True)
+    company_id = models.PositiveBigIntegerField()
+    department_id = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=255, choices=EmployeeStatus)
+    employee_name = models.CharField(max_length=255)
+    employee_email = models.EmailField(max_length=255)
+    phone_number = models.CharField(max_length=17)
+    address = models.TextField()
+    designation = models.CharField(max_length=255)
+    hired_date = models.DateField(blank=True, null=True)
+    day_employee = models.IntegerField(default=0)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = 'Archived Employee'
+        verbose_name_plural = 'Archived Employees'
+        indexes = [
+            models.Index(fields=['status', 'id'], name='archived_status_id_idx'),
+            models.Index(fields=['company_id', 'department_id'], name='archived_company_dept_idx'),
+            models.Index(fields=['archived_at'], name='archived_at_idx'),
+        ]
+    
+    def __str__(self):
+        return self.employee_name
+
+
+
+@receiver(post_save, sender=Department)
+def update_counters_on_department_save(sender, instance, created, update_fields, raw, **kwargs):
+    if raw:
+        return
+    
+    company_deltas = Counter()
+    if created:
+        company_deltas[instance.company_id] += 1
+    elif moved := instance.changed_value('company', update_fields):
+        company_deltas[moved[0]] -= 1
+        company_deltas[moved[1]] += 1
+    Company.objects.apply_deltas('department_count', company_deltas)
+
+
+@receiver(post_delete, sender=Department)
+def update_counters_on_department_delete(sender, instance, **kwargs):
+    Company.objects.apply_deltas('department_count', {instance.company_id: -1})
+
+
+def adjust_employee_counters(company_deltas, department_deltas):
+    """Apply employee count deltas to companies and departments."""
+    Company.objects.apply_deltas('employee_count', company_deltas)
+    Department.objects.apply_deltas('employee_count', department_deltas)
+
+
+@receiver(post_save, sender=Employee)
+def update_counters_on_employee_save(sender, instance, created, update_fields, raw, **kwargs):
+    if raw:
+        return
+    
+    company_deltas, department_deltas = Counter(), Counter()
+    if created:
+        company_deltas[instance.company_id] += 1
+        department_deltas[instance.department_id] += 1
+    else:
+        for field_name, deltas in (('company', company_deltas), ('department', department_deltas)):
+            if moved := instance.changed_value(field_name, update_fields):
+                deltas[moved[0]] -= 1
+                deltas[moved[1]] += 1
+    adjust_employee_counters(company_deltas, department_deltas)
+
+
+@receiver(post_delete, sender=Employee)
+def update_counters_on_employee_delete(sender, instance, **kwargs):
+    adjust_employee_counters({instance.company_id: -1}, {instance.department_id: -1})
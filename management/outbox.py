@@ -0,0 +1,204 @@
+import hashlib
+import hmac
+import json
+import logging
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Department, Employee, OutboxEvent
+
+
+logger = logging.getLogger(__name__)
+
+EMPLOYEE_EVENT_FIELDS = (
+    'id', 'company', 'department', 'status', 'employee_name', 'employee_email', 'phone_number',
+    'designation', 'hired_date', 'day_employee', 'updated_at',
+)
+
+
+def publish(events):
+    """
+    Queue (topic, payload) `events` for every configured endpoint. Call it
+    inside the transaction that made the change; nothing is queued when no
+    endpoint is configured.
+    """
+    endpoints = settings.OUTBOX['ENDPOINTS']
+    events = list(events)
+    if not endpoints or not events:
+        return
+    now = timezone.now()
+    OutboxEvent.objects.bulk_create([
+        OutboxEvent(endpoint=endpoint, topic=topic, payload=payload, created_at=now, next_attempt_at=now)
+        for topic, payload in events
+        for endpoint in endpoints
+    ])
+
+
+def employee_payload(employee):
+    return {name: getattr(employee, employee._meta.get_field(name).attname) for name in EMPLOYEE_EVENT_FIELDS}
+
+
+def employee_events(payloads, created=False, previous_statuses=None):
+    """
+    employee.created or employee.updated for each payload, plus
+    employee.hired for those that moved to hired. `previous_statuses` maps
+    employee ids to the status they had before an update.
+    """
+    previous_statuses = previous_statuses or {}
+    for payload in payloads:
+        previous = previous_statuses.get(payload['id'])
+        if created:
+            yield 'employee.created', payload
+        else:
+            yield 'employee.updated', {**payload, 'previous_status': previous}
+        if payload['status'] == 'hired' and (created or previous not in (None, 'hired')):
+            yield 'employee.hired', payload
+
+
+@receiver(post_save, sender=Employee)
+def publish_employee_save(sender, instance, created, update_fields, raw, **kwargs):
+    if raw or not settings.OUTBOX['ENDPOINTS']:
+        return
+    if created:
+        publish(employee_events([employee_payload(instance)], created=True))
+        return
+
+    changed = [
+        field.name for field in instance._meta.concrete_fields
+        if field.name != 'updated_at' and instance.changed_value(field.name, update_fields)
+    ]
+    if changed:
+        moved = instance.changed_value('status', update_fields)
+        previous = {instance.pk: moved[0] if moved else instance.status}
+        publish(employee_events([employee_payload(instance)], previous_statuses=previous))
+
+
+@receiver(post_delete, sender=Employee)
+def publish_employee_delete(sender, instance, **kwargs):
+    publish([('employee.deleted', {
+        'id': instance.pk, 'company': instance.company_id, 'department': instance.department_id,
+    })])
+
+
+@receiver(post_save, sender=Department)
+def publish_department_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    publish([(
+        'department.created' if created else 'department.updated',
+        {'id': instance.pk, 'name': instance.name, 'company': instance.company_id},
+    )])
+
+
+@receiver(post_delete, sender=Department)
+def publish_department_delete(sender, instance, **kwargs):
+    publish([('department.deleted', {'id': instance.pk, 'company': instance.company_id})])
+
+
+class DeliveryError(Exception):
+    pass
+
+
+class OutboxDelivery:
+    """
+    Delivers due outbox events, at least once. Each pass claims a batch by
+    pushing its next attempt past the request timeout, so concurrent
+    workers skip it, then POSTs the events of each endpoint as one JSON
+    body. A 2xx answer marks them delivered; anything else schedules a
+    retry with exponential backoff. Receivers should drop event ids they
+    have already seen.
+    """
+
+    def __init__(self, options=None):
+        self.options = {**settings.OUTBOX, **(options or {})}
+
+    def backoff(self, attempts):
+        return min(self.options['BACKOFF_SECONDS'] * 2 ** (attempts - 1), self.options['MAX_BACKOFF_SECONDS'])
+
+    def claim(self):
+        now = timezone.now()
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(delivered_at__isnull=True, next_attempt_at__lte=now, attempts__lt=self.options['MAX_ATTEMPTS'])
+                .order_by('delivered_at', 'next_attempt_at', 'id')[:self.options['BATCH_SIZE']]
+            )
+            lease = now + timedelta(seconds=self.options['TIMEOUT'] * 2)
+            OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(next_attempt_at=lease)
+        return events
+
+    def deliver_due(self):
+        """Deliver one claimed batch. Returns (delivered, failed) event counts."""
+        by_endpoint = defaultdict(list)
+        for event in self.claim():
+            by_endpoint[event.endpoint].append(event)
+
+        delivered = failed = 0
+        for endpoint, events in by_endpoint.items():
+            pks = [event.pk for event in events]
+            try:
+                self.post(endpoint, events)
+            except DeliveryError as exc:
+                logger.warning('Could not deliver %s outbox event(s) to %s: %s', len(events), endpoint, exc)
+                self.retry_later(events, str(exc))
+                failed += len(events)
+            else:
+                OutboxEvent.objects.filter(pk__in=pks).update(
+                    delivered_at=timezone.now(), attempts=F('attempts') + 1, last_error='',
+                )
+                delivered += len(events)
+        return delivered, failed
+
+    def retry_later(self, events, error):
+        now = timezone.now()
+        pks_by_attempts = defaultdict(list)
+        for event in events:
+            pks_by_attempts[event.attempts + 1].append(event.pk)
+        for attempts, pks in pks_by_attempts.items():
+            OutboxEvent.objects.filter(pk__in=pks).update(
+                attempts=attempts,
+                next_attempt_at=now + timedelta(seconds=self.backoff(attempts)),
+                last_error=error[:1000],
+            )
+
+    def post(self, endpoint, events):
+        body = json.dumps(
+            {
+                'events': [
+                    {'id': event.pk, 'topic': event.topic, 'created_at': event.created_at, 'payload': event.payload}
+                    for event in events
+                ],
+            },
+            cls=DjangoJSONEncoder,
+        ).encode()
+        headers = {'Content-Type': 'application/json'}
+        if self.options['SECRET']:
+            digest = hmac.new(self.options['SECRET'].encode(), body, hashlib.sha256).hexdigest()
+            headers['X-Outbox-Signature'] = f'sha256={digest}'
+
+        request = urllib.request.Request(endpoint, data=body, headers=headers, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.options['TIMEOUT']) as response:
+                status = response.status
+        except urllib.error.HTTPError as exc:
+            raise DeliveryError(f'HTTP {exc.code}')
+        except (urllib.error.URLError, OSError) as exc:
+            raise DeliveryError(str(exc))
+        if not 200 <= status < 300:
+            raise DeliveryError(f'HTTP {status}')
+
+    def prune(self):
+        """Delete events delivered more than RETENTION_DAYS ago."""
+        cutoff = timezone.now() - timedelta(days=self.options['RETENTION_DAYS'])
+        deleted, _ = OutboxEvent.objects.filter(delivered_at__lt=cutoff).delete()
+        return deleted
@@ -0,0 +1,112 @@
+"""
+Full-text search over employee name, email and designation.
+
+SQLite gets an FTS5 external-content table kept in sync by triggers, MySQL a
+FULLTEXT index that InnoDB maintains itself. Both are created after migrate
+because they cannot be expressed as Django model indexes. Other databases
+fall back to LIKE filters.
+"""
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .models import Employee
+
+
+SEARCH_FIELDS = ['employee_name', 'employee_email', 'designation']
+FTS_TABLE = f'{Employee._meta.db_table}_fts'
+FULLTEXT_INDEX = 'employee_search_idx'
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text or '')[:10]
+
+
+def search_employees(queryset, text):
+    """Filter `queryset` to employees whose searchable fields match every word of `text`."""
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        # Prefix match on every term, e.g. "ann"* AND "eng"*
+        match = ' AND '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        )
+
+    if vendor == 'mysql':
+        match = ' '.join(f'+{term}*' for term in terms)
+        columns = ', '.join(SEARCH_FIELDS)
+        return queryset.alias(
+            search_score=RawSQL(f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)', [match], output_field=FloatField())
+        ).filter(search_score__gt=0)
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(*[Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS], _connector=Q.OR)
+    return queryset.filter(condition)
+
+
+def create_sqlite_search_index(connection):
+    table = Employee._meta.db_table
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        exists = cursor.fetchone() is not None
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5({columns}, content='{table}', content_rowid='id')"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        cursor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF {columns} ON {table} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        if not exists:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def create_mysql_search_index(connection):
+    table = Employee._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+            [table, FULLTEXT_INDEX],
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(
+                f"ALTER TABLE {table} ADD FULLTEXT INDEX {FULLTEXT_INDEX} ({', '.join(SEARCH_FIELDS)})"
+            )
+
+
+@receiver(post_migrate)
+def create_search_index(sender, app_config, using, **kwargs):
+    if app_config.label != Employee._meta.app_label:
+        return
+
+    connection = connections[using]
+    if Employee._meta.db_table not in connection.introspection.table_names():
+        return
+    if connection.vendor == 'sqlite':
+        create_sqlite_search_index(connection)
+    elif connection.vendor == 'mysql':
+        create_mysql_search_index(connection)
@@ -2,7 +2,12 @@ from rest_framework import serializers
 from .models import *
 from authentication.models import User, UserRole
 import re
+from django.conf import settings
 from django.core.validators import validate_email
+from django.utils import timezone
+from .filters import EmployeeFilterSerializer
+from .lookups import department_companies
+from .sync import decode_cursor
 
 
 
@@ -13,32 +18,20 @@ class UserSerializer(serializers.ModelSerializer):
 
         
 class DepartmentSerializer(serializers.ModelSerializer):
-    number_of_employee = serializers.SerializerMethodField()
-    
-    def get_number_of_employee(self, obj):
-        return obj.employees.count()
+    number_of_employee = serializers.IntegerField(source='employee_count', read_only=True)
     
     class Meta:
         model = Department
-        fields = '__all__'
+        exclude = ['employee_count']
 
 
 class CompanySerializer(serializers.ModelSerializer):
-    number_of_department = serializers.SerializerMethodField()
-    number_of_employee = serializers.SerializerMethodField()
-
-
-    
-    def get_number_of_department(self, obj):
-        return obj.departments.count()
-    
-    
-    def get_number_of_employee(self, obj):
-        return obj.employees.count()
+    number_of_department = serializers.IntegerField(source='department_count', read_only=True)
+    number_of_employee = serializers.IntegerField(source='employee_count', read_only=True)
     
     class Meta:
         model = Company
-        fields = '__all__'
+        exclude = ['department_count', 'employee_count']
         
         
         
@@ -49,22 +42,173 @@ class EmployeeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = '__all__'
+    
+    @classmethod
+    def rows(cls, queryset):
+        return queryset.for_serializer()
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for list endpoints. Builds the same output as the
+    matching model serializer from `.values()` rows, without instantiating
+    models or running per-field serializer machinery. Views list their
+    queryset through `rows()`.
+    """
+    value_fields = ()
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Resolve the active timezone once per response rather than per value.
+        self.datetime_field = serializers.DateTimeField(
+            default_timezone=timezone.get_current_timezone() if settings.USE_TZ else None
+        )
+        self.date_field = serializers.DateField()
+    
+    @classmethod
+    def rows(cls, queryset):
+        return queryset.values(*cls.value_fields)
+    
+    def datetime(self, value):
+        return None if value is None else self.datetime_field.to_representation(value)
+    
+    def date(self, value):
+        return None if value is None else self.date_field.to_representation(value)
+    
+    def company(self, row, prefix=''):
+        """CompanySerializer output."""
+        return {
+            'id': row[prefix + 'id'],
+            'number_of_department': row[prefix + 'department_count'],
+            'number_of_employee': row[prefix + 'employee_count'],
+            'name': row[prefix + 'name'],
+            'updated_at': self.datetime(row[prefix + 'updated_at']),
+        }
+    
+    def department(self, row, prefix=''):
+        """DepartmentSerializer output."""
+        return {
+            'id': row[prefix + 'id'],
+            'number_of_employee': row[prefix + 'employee_count'],
+            'name': row[prefix + 'name'],
+            'updated_at': self.datetime(row[prefix + 'updated_at']),
+            'company': row[prefix + 'company'],
+        }
+
+
+COMPANY_VALUE_FIELDS = ('id', 'department_count', 'employee_count', 'name', 'updated_at')
+DEPARTMENT_VALUE_FIELDS = ('id', 'employee_count', 'name', 'updated_at', 'company')
+
+
+class CompanyListSerializer(ValuesSerializer):
+    value_fields = COMPANY_VALUE_FIELDS
+    
+    def to_representation(self, row):
+        return self.company(row)
+
+
+class DepartmentListSerializer(ValuesSerializer):
+    value_fields = DEPARTMENT_VALUE_FIELDS
+    
+    def to_representation(self, row):
+        return self.department(row)
+
+
+class EmployeeListSerializer(ValuesSerializer):
+    value_fields = (
+        'id', 'status', 'employee_name', 'employee_email', 'phone_number', 'address',
+        'designation', 'hired_date', 'day_employee', 'updated_at',
+        *(f'company__{field}' for field in COMPANY_VALUE_FIELDS),
+        *(f'department__{field}' for field in DEPARTMENT_VALUE_FIELDS),
+    )
+    
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'company': self.company(row, 'company__'),
+            'department': self.department(row, 'department__'),
+            'status': row['status'],
+            'employee_name': row['employee_name'],
+            'employee_email': row['employee_email'],
+            'phone_number': row['phone_number'],
+            'address': row['address'],
+            'designation': row['designation'],
+            'hired_date': self.date(row['hired_date']),
+            'day_employee': row['day_employee'],
+            'updated_at': self.datetime(row['updated_at']),
+        }
+
+
+class EmployeeFieldsetSerializer(EmployeeListSerializer):
+    """
+    EmployeeListSerializer output limited to the `fieldset` in the context,
+    a (fields, expand) pair. Company and department are rendered as ids
+    unless they are expanded.
+    """
+    
+    @classmethod
+    def fieldset_value_fields(cls, fields, expand):
+        """The .values() columns needed to render `fields`, joining only the expanded relations."""
+        columns = []
+        for name in fields:
+            if name == 'company' and name in expand:
+                columns += [f'company__{field}' for field in COMPANY_VALUE_FIELDS]
+            elif name == 'department' and name in expand:
+                columns += [f'department__{field}' for field in DEPARTMENT_VALUE_FIELDS]
+            else:
+                columns.append(name)
+        return columns
+    
+    def to_representation(self, row):
+        fields, expand = self.context['fieldset']
+        data = {}
+        for name in fields:
+            if name in expand:
+                data[name] = getattr(self, name)(row, f'{name}__')
+            elif name == 'hired_date':
+                data[name] = self.date(row[name])
+            elif name == 'updated_at':
+                data[name] = self.datetime(row[name])
+            else:
+                data[name] = row[name]
+        return data
+
         
 class EmployeeUpdateCreateSerializer(serializers.ModelSerializer):
+    """
+    Company and department are plain ids checked against the cached
+    department -> company map, loaded once per validation, so validating a
+    write costs one query for the table versions. A department moved by a
+    transaction whose version bump has not run yet is still checked against
+    its old company.
+    """
+    company = serializers.IntegerField(source='company_id')
+    department = serializers.IntegerField(source='department_id')
     
     def validate(self, attrs):
         """
         Validate that the department belongs to the specified company.
-        Handles both create and update scenarios.
+        Handles both create and update scenarios: on a partial update the
+        field that is not sent is taken from the employee.
         """
-        company = attrs.get('company')
-        department = attrs.get('department')
+        if 'company_id' not in attrs and 'department_id' not in attrs:
+            return attrs
+        does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages['does_not_exist']
+        loaded = department_companies.load()
+        
+        if 'company_id' in attrs and not department_companies.company_exists(attrs['company_id'], loaded):
+            raise serializers.ValidationError({'company': does_not_exist.format(pk_value=attrs['company_id'])})
         
-        if company and department:
-            if department.company != company:
-                raise serializers.ValidationError({
-                    'department': 'The department must belong to the specified company.'
-                })
+        department_id = attrs.get('department_id', getattr(self.instance, 'department_id', None))
+        company_id = attrs.get('company_id', getattr(self.instance, 'company_id', None))
+        owner_id = department_companies.company_of(department_id, company_id, loaded)
+        if owner_id is None and 'department_id' in attrs:
+            raise serializers.ValidationError({'department': does_not_exist.format(pk_value=department_id)})
+        
+        if owner_id != company_id:
+            raise serializers.ValidationError({
+                'department': 'The department must belong to the specified company.'
+            })
         
         return attrs
     
@@ -81,4 +225,80 @@ class EmployeeUpdateCreateSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Employee
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class EmployeeImportSerializer(serializers.ModelSerializer):
+    """
+    Validates one imported row without querying the database. Company and
+    department ids are checked against the department -> company map the
+    importer loads once per file.
+    """
+    company = serializers.IntegerField(source='company_id')
+    department = serializers.IntegerField(source='department_id')
+    
+    def validate(self, attrs):
+        department_companies = self.context['department_companies']
+        company_id = department_companies.get(attrs['department_id'])
+        
+        if company_id is None:
+            raise serializers.ValidationError({'department': 'Department does not exist.'})
+        if company_id != attrs['company_id']:
+            raise serializers.ValidationError({
+                'department': 'The department must belong to the specified company.'
+            })
+        
+        return attrs
+    
+    class Meta:
+        model = Employee
+        exclude = ['id', 'day_employee']
+
+
+class EmployeeSelectionSerializer(serializers.Serializer):
+    """Either explicit employee ids or a filter selecting them, for bulk operations."""
+    max_rows = 10000
+    
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=max_rows)
+    filter = EmployeeFilterSerializer(required=False)
+    
+    def validate_filter(self, value):
+        if not any(value.get(name) not in (None, '') for name in value):
+            raise serializers.ValidationError('Provide at least one filter criterion.')
+        return value
+    
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Provide either ids or filter.')
+        return attrs
+
+
+class EmployeeBulkStatusSerializer(EmployeeSelectionSerializer):
+    """Target status plus either explicit employee ids or a filter selecting them."""
+    status = serializers.ChoiceField(choices=EmployeeStatus)
+
+
+class EmployeeBulkDeleteSerializer(EmployeeSelectionSerializer):
+    """
+    Employees to delete, and whether to keep them in the archive. Hired
+    employees matched by a filter are kept unless include_hired is set.
+    """
+    archive = serializers.BooleanField(required=False, default=False)
+    include_hired = serializers.BooleanField(required=False, default=False)
+
+
+class ArchivedEmployeeSerializer(serializers.ModelSerializer):
+    company = serializers.IntegerField(source='company_id')
+    department = serializers.IntegerField(source='department_id')
+    
+    class Meta:
+        model = ArchivedEmployee
+        exclude = ['company_id', 'department_id']
+
+
+class EmployeeSyncSerializer(serializers.Serializer):
+    """Query parameters of the incremental employee sync endpoint."""
+    cursor = serializers.CharField(required=False)
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=1000, default=500)
+    
+    def validate_cursor(self, value):
+        return decode_cursor(value)
@@ -0,0 +1,97 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Employee, Tombstone
+
+
+def encode_cursor(changed, deleted):
+    """Pack the (timestamp, id) positions reached in both streams into a token."""
+    position = {
+        'changed': [changed[0].isoformat(), changed[1]],
+        'deleted': [deleted[0].isoformat(), deleted[1]],
+    }
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(token):
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token.encode()))
+        cursor = tuple(
+            (datetime.fromisoformat(position[stream][0]), int(position[stream][1]))
+            for stream in ('changed', 'deleted')
+        )
+    except (ValueError, TypeError, KeyError, IndexError):
+        raise serializers.ValidationError('Invalid cursor.')
+    if any(timezone.is_naive(moment) for moment, _ in cursor):
+        raise serializers.ValidationError('Invalid cursor.')
+    return cursor
+
+
+def after(queryset, field, position):
+    """Rows strictly after `position` in (field, id) order."""
+    moment, pk = position
+    return queryset.filter(Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': pk})).order_by(field, 'id')
+
+
+def employee_changes(cursor=None, limit=500):
+    """
+    Return the employees created or updated and the ids of those deleted
+    since `cursor`, at most `limit` of each, plus the cursor to resume from.
+    Without a cursor every current employee is returned.
+
+    Rows written in the last SYNC_SETTLE_SECONDS are held back until the
+    next call, so a transaction that stamped its rows earlier but commits
+    later is not skipped. Clients apply the changed rows before the deletions.
+    """
+    now = timezone.now()
+    until = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    if cursor is None:
+        changed_from, deleted_from = None, (until, 0)
+    else:
+        changed_from, deleted_from = cursor
+        if deleted_from[0] < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            raise serializers.ValidationError('Cursor has expired, sync again without one.')
+
+    employees = Employee.objects.for_serializer().filter(updated_at__lte=until)
+    if changed_from is None:
+        employees = employees.order_by('updated_at', 'id')
+    else:
+        employees = after(employees, 'updated_at', changed_from)
+    employees = list(employees[:limit + 1])
+    tombstones = list(
+        after(Tombstone.objects.filter(model=Employee._meta.label_lower), 'deleted_at', deleted_from)
+        .filter(deleted_at__lte=until)
+        .values_list('deleted_at', 'id', 'object_id')[:limit + 1]
+    )
+    has_more = len(employees) > limit or len(tombstones) > limit
+    employees, tombstones = employees[:limit], tombstones[:limit]
+
+    # An empty stream has nothing left up to `until`, so it can skip ahead.
+    if employees:
+        changed_from = (employees[-1].updated_at, employees[-1].pk)
+    else:
+        changed_from = max(changed_from or (until, 0), (until, 0))
+    if tombstones:
+        deleted_from = tombstones[-1][:2]
+    else:
+        deleted_from = max(deleted_from, (until, 0))
+
+    return {
+        'employees': employees,
+        'deleted': [object_id for _, _, object_id in tombstones],
+        'cursor': encode_cursor(changed_from, deleted_from),
+        'has_more': has_more,
+    }
+
+
+@receiver(post_delete, sender=Employee)
+def record_employee_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
@@ -1,3 +1,1704 @@
-from django.test import TestCase
+import csv
+import hashlib
+import hmac
+import json
+import threading
+import time
+from copy import deepcopy
+from datetime import date, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from authentication.models import User
+from authentication.serializers import CustomObtainPairSerializer
+from core.benchmark import compare
+from core.db import ReplicaRouter, ReplicaRoutingMiddleware, read_replica, sticky_key
+from core.metrics import request_metrics
+from core.renderers import FastJSONRenderer
+from .funnel import week_of
+from .history import status_history
+from .archive import bulk_delete
+from .exporters import StreamingExportMixin
+from .lookups import lookup_cache
+from .outbox import OutboxDelivery
+from .models import (
+    ArchivedEmployee, Company, Department, Employee, EmployeeStatus, OutboxEvent, StatusCount, StatusTransition, TableVersion,
+    Tombstone, WeeklyHireCount,
+)
+from .serializers import CompanySerializer, DepartmentSerializer, EmployeeSerializer
+from .transitions import bulk_transition
+from .versions import bump_versions
+
+
+def full_table_scans(sql, params=()):
+    """Tables the database plans to read in full for `sql` (SQLite and MySQL)."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            details = [row[-1] for row in cursor.fetchall()]
+            return [
+                detail.split()[1] for detail in details
+                if detail.startswith('SCAN ') and ' USING ' not in detail
+            ]
+
+        cursor.execute(f'EXPLAIN FORMAT=JSON {sql}', params)
+        scans = []
+
+        def walk(node):
+            if isinstance(node, dict):
+                if node.get('access_type') == 'ALL':
+                    scans.append(node.get('table_name'))
+                for value in node.values():
+                    walk(value)
+            elif isinstance(node, list):
+                for value in node:
+                    walk(value)
+
+        walk(json.loads(cursor.fetchone()[0]))
+        return scans
+
+
+# Status history stays queued until a test flushes it: a background writer
+# cannot see the data of a test's open transaction. Replica routing is off,
+# so query counts do not depend on DB_REPLICAS; ReplicaRoutingTests and
+# ReplicaReadTests cover it.
+@override_settings(STATUS_HISTORY={**settings.STATUS_HISTORY, 'BACKGROUND': False}, DATABASE_REPLICAS=[])
+class ManagementAPITestCase(APITestCase):
+    """Base test case with an authenticated manager and a small dataset."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='manager@example.com', name='Manager', role='manager', password='test@1234'
+        )
+        self.client.force_authenticate(self.user)
+
+    def create_employee(self, department, **kwargs):
+        data = {
+            'company': department.company,
+            'department': department,
+            'employee_name': 'Employee',
+            'employee_email': 'employee@example.com',
+            'phone_number': '+123456789',
+            'address': 'Address',
+            'designation': 'Engineer',
+        }
+        data.update(kwargs)
+        return Employee.objects.create(**data)
+
+    def create_employees(self, count, **kwargs):
+        for index in range(count):
+            company = Company.objects.create(name=f'Company {index}')
+            department = Department.objects.create(name=f'Department {index}', company=company)
+            self.create_employee(department, **kwargs)
+
+    def assertIndexedQueries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+
+        table = Employee._meta.db_table
+        checked = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and table in query['sql'] and 'COUNT(' not in query['sql']
+        ]
+        self.assertTrue(checked)
+        for sql in checked:
+            self.assertNotIn(table, full_table_scans(sql), sql)
+
+
+class EmployeeQueryCountTests(ManagementAPITestCase):
+
+    def count_queries(self, url, page_size):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'page_size': page_size})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']['results']), page_size)
+        return len(queries)
+
+    def test_employee_list_queries_do_not_grow_with_page_size(self):
+        self.create_employees(10)
+        url = reverse('employee-list')
+        self.assertEqual(self.count_queries(url, 2), self.count_queries(url, 10))
+
+    def test_hired_list_queries_do_not_grow_with_page_size(self):
+        self.create_employees(10, status='hired')
+        url = reverse('employee-hired-list')
+        self.assertEqual(self.count_queries(url, 2), self.count_queries(url, 10))
+
+    def test_nested_counts_match_related_rows(self):
+        company = Company.objects.create(name='Acme')
+        first = Department.objects.create(name='Sales', company=company)
+        second = Department.objects.create(name='Support', company=company)
+        employee = self.create_employee(first)
+        self.create_employee(first)
+        self.create_employee(second)
+
+        response = self.client.get(reverse('employee-detail', args=[employee.pk]))
+
+        data = response.data['data']
+        self.assertEqual(data['company']['number_of_department'], 2)
+        self.assertEqual(data['company']['number_of_employee'], 3)
+        self.assertEqual(data['department']['number_of_employee'], 2)
+
+
+class CounterColumnTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.acme = Company.objects.create(name='Acme')
+        self.globex = Company.objects.create(name='Globex')
+        self.sales = Department.objects.create(name='Sales', company=self.acme)
+        self.research = Department.objects.create(name='Research', company=self.globex)
+
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        for field, value in expected.items():
+            self.assertEqual(getattr(obj, field), value, field)
+
+    def test_counters_follow_create_and_delete(self):
+        employee = self.create_employee(self.sales)
+        self.assertCounts(self.acme, department_count=1, employee_count=1)
+        self.assertCounts(self.sales, employee_count=1)
+
+        employee.delete()
+        self.assertCounts(self.acme, employee_count=0)
+        self.assertCounts(self.sales, employee_count=0)
+
+    def test_counters_follow_reassignment_through_update_view(self):
+        employee = self.create_employee(self.sales)
+
+        response = self.client.patch(
+            reverse('employee-update', args=[employee.pk]),
+            {'company': self.globex.pk, 'department': self.research.pk, 'status': 'hired'},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCounts(self.acme, employee_count=0)
+        self.assertCounts(self.sales, employee_count=0)
+        self.assertCounts(self.globex, employee_count=1)
+        self.assertCounts(self.research, employee_count=1)
+
+    def test_department_delete_updates_company_counters(self):
+        self.create_employee(self.sales)
+        self.sales.delete()
+        self.assertCounts(self.acme, department_count=0, employee_count=0)
+
+    def test_reconcile_command_fixes_drift(self):
+        self.create_employee(self.sales)
+        Company.objects.filter(pk=self.acme.pk).update(employee_count=7, department_count=0)
+
+        call_command('reconcile_counters', stdout=StringIO())
+
+        self.assertCounts(self.acme, department_count=1, employee_count=1)
+
+
+class EmployeeTenureTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.department = Department.objects.create(name='Sales', company=company)
+
+    def test_hiring_stamps_hired_date_in_a_single_update(self):
+        employee = self.create_employee(self.department)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse('employee-status-update', args=[employee.pk]), {'status': 'hired'}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        employee_updates = [
+            query for query in queries
+            if query['sql'].startswith('UPDATE "management_employee"')
+        ]
+        self.assertEqual(len(employee_updates), 1)
+        employee.refresh_from_db()
+        self.assertEqual(employee.hired_date, date.today())
+        self.assertEqual(employee.day_employee, 0)
+
+    def test_recompute_tenure_command(self):
+        hired = self.create_employee(self.department, status='hired')
+        candidate = self.create_employee(self.department)
+        Employee.objects.filter(pk=hired.pk).update(hired_date=date.today() - timedelta(days=30))
+        Employee.objects.filter(pk=candidate.pk).update(day_employee=5)
+        hired.refresh_from_db()
+        updated_at = hired.updated_at
+
+        call_command('recompute_tenure', stdout=StringIO())
+
+        hired.refresh_from_db()
+        candidate.refresh_from_db()
+        self.assertEqual(hired.day_employee, 30)
+        self.assertEqual(candidate.day_employee, 0)
+        self.assertEqual(hired.updated_at, updated_at)
+
+
+class CursorPaginationTests(ManagementAPITestCase):
+
+    def test_cursor_mode_walks_every_row_without_count(self):
+        self.create_employees(25)
+        url = reverse('employee-list')
+        seen = []
+
+        params = {'pagination': 'cursor', 'page_size': 20}
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            self.assertNotIn('count', response.data['data'])
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+            seen.extend(row['id'] for row in response.data['data']['results'])
+            url, params = response.data['data']['next'], None
+
+        self.assertEqual(seen, list(Employee.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_cursor_mode_allows_larger_pages_and_optional_count(self):
+        self.create_employees(15)
+
+        response = self.client.get(
+            reverse('employee-list'), {'pagination': 'cursor', 'page_size': 15, 'include_count': 'true'}
+        )
+
+        self.assertEqual(len(response.data['data']['results']), 15)
+        self.assertEqual(response.data['data']['count'], 15)
+
+
+class EmployeeImportTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.acme = Company.objects.create(name='Acme')
+        self.globex = Company.objects.create(name='Globex')
+        self.sales = Department.objects.create(name='Sales', company=self.acme)
+
+    def upload(self, name, content):
+        return self.client.post(
+            reverse('employee-import'),
+            {'file': SimpleUploadedFile(name, content.encode())},
+            format='multipart',
+        )
+
+    def test_csv_import_reports_bad_rows_and_keeps_the_rest(self):
+        content = (
+            'company,department,employee_name,employee_email,phone_number,address,designation,status\n'
+            f'{self.acme.pk},{self.sales.pk},Ann,ann@example.com,+123456789,Street,Engineer,hired\n'
+            f'{self.globex.pk},{self.sales.pk},Bob,bob@example.com,+123456789,Street,Engineer,\n'
+            f'{self.acme.pk},{self.sales.pk},Cid,cid@example.com,not-a-phone,Street,Engineer,\n'
+            f'{self.acme.pk},{self.sales.pk},Dee,dee@example.com,+123456789,Street,Engineer,\n'
+        )
+
+        response = self.upload('employees.csv', content)
+
+        data = response.data['data']
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(data['failed'], 2)
+        self.assertEqual([error['line'] for error in data['errors']], [3, 4])
+        self.assertIn('department', data['errors'][0]['errors'])
+        self.assertIn('phone_number', data['errors'][1]['errors'])
+        self.assertEqual(Employee.objects.get(employee_name='Ann').hired_date, date.today())
+        self.acme.refresh_from_db()
+        self.assertEqual(self.acme.employee_count, 2)
+
+    def test_ndjson_import_reports_invalid_json(self):
+        row = {
+            'company': self.acme.pk, 'department': self.sales.pk, 'employee_name': 'Ann',
+            'employee_email': 'ann@example.com', 'phone_number': '+123456789',
+            'address': 'Street', 'designation': 'Engineer',
+        }
+        content = json.dumps(row) + '\n{broken\n\n' + json.dumps(row) + '\n'
+
+        response = self.upload('employees.ndjson', content)
+
+        data = response.data['data']
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(data['errors'][0]['line'], 2)
+
+    def test_rows_get_their_keys_where_bulk_create_does_not_return_them(self):
+        content = (
+            'company,department,employee_name,employee_email,phone_number,address,designation,status\n'
+            f'{self.acme.pk},{self.sales.pk},Ann,ann@example.com,+123456789,Street,Engineer,hired\n'
+            f'{self.acme.pk},{self.sales.pk},Bob,bob@example.com,+123456789,Street,Engineer,\n'
+        )
+        outbox = {**settings.OUTBOX, 'ENDPOINTS': ['http://127.0.0.1:9/']}
+
+        status_history.flush()
+        StatusTransition.objects.all().delete()
+
+        # As on MySQL.
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', False), \
+                override_settings(OUTBOX=outbox), self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.upload('employees.csv', content).data['data']['created'], 2)
+        status_history.flush()
+
+        ann, bob = Employee.objects.order_by('pk')
+        self.assertEqual(
+            list(OutboxEvent.objects.order_by('id').values_list('topic', 'payload__id')),
+            [('employee.created', ann.pk), ('employee.hired', ann.pk), ('employee.created', bob.pk)],
+        )
+        self.assertEqual(
+            sorted(StatusTransition.objects.values_list('employee_id', 'to_status')),
+            [(ann.pk, 'hired'), (bob.pk, 'application_received')],
+        )
+
+    def test_import_requires_a_file(self):
+        response = self.client.post(reverse('employee-import'), {}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=company)
+        self.hired = self.create_employee(self.sales, employee_name='Ann', status='hired')
+        self.candidate = self.create_employee(self.sales, employee_name='Bob')
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_employee_csv_export(self):
+        content = self.read(self.client.get(reverse('employee-export')))
+
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual([row['employee_name'] for row in rows], ['Ann', 'Bob'])
+        self.assertEqual(rows[0]['department_name'], 'Sales')
+        self.assertEqual(rows[0]['hired_date'], date.today().isoformat())
+
+    def test_hired_ndjson_export_uses_the_list_filter(self):
+        content = self.read(self.client.get(reverse('employee-hired-export'), {'file_format': 'ndjson'}))
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.hired.pk])
+        self.assertEqual(rows[0]['company_name'], 'Acme')
+
+    def test_company_export_includes_counters(self):
+        content = self.read(self.client.get(reverse('company-export')))
+
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(rows[0]['employee_count'], '2')
+
+    def test_rows_are_read_in_keyset_pages(self):
+        self.create_employee(self.sales, employee_name='Cy')
+
+        with mock.patch.object(StreamingExportMixin, 'chunk_size', 2), CaptureQueriesContext(connection) as queries:
+            content = self.read(self.client.get(reverse('employee-export')))
+
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual([row['employee_name'] for row in rows], ['Ann', 'Bob', 'Cy'])
+        pages = [query['sql'] for query in queries if 'LIMIT 2' in query['sql']]
+        self.assertEqual(len(pages), 2)
+        self.assertIn(f'> {self.candidate.pk}', pages[1])
+
+    def test_unknown_export_format(self):
+        response = self.client.get(reverse('employee-export'), {'file_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+
+class DashboardTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            company = Company.objects.create(name='Acme')
+            self.sales = Department.objects.create(name='Sales', company=company)
+            self.employee = self.create_employee(self.sales, status='hired')
+            self.create_employee(self.sales)
+
+    def get_dashboard(self, expected_queries):
+        # Plus one for the table version stamps behind the ETag.
+        with self.assertNumQueries(expected_queries + 1):
+            response = self.client.get(reverse('dashboard'))
+        return response.data['data']
+
+    def test_counts_in_one_query_then_from_cache(self):
+        data = self.get_dashboard(1)
+        self.assertEqual(data['total_companies'], 1)
+        self.assertEqual(data['total_departments'], 1)
+        self.assertEqual(data['total_employees'], 2)
+        self.assertEqual(data['employees_by_status']['hired'], 1)
+        self.assertEqual(data['employees_by_status']['application_received'], 1)
+        self.assertEqual(data['employees_by_status']['not_accepted'], 0)
+
+        self.assertEqual(self.get_dashboard(0), data)
+
+    def test_writes_invalidate_the_cache(self):
+        self.get_dashboard(1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('employee-status-update', args=[self.employee.pk]), {'status': 'not_accepted'})
+        data = self.get_dashboard(1)
+        self.assertEqual(data['employees_by_status']['not_accepted'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employee.delete()
+        self.assertEqual(self.get_dashboard(1)['total_employees'], 1)
+
+    def test_writes_of_other_processes_are_seen_under_their_etag(self):
+        response = self.client.get(reverse('dashboard'))
+
+        # Nothing in this process is told about the write but its version stamp.
+        with self.captureOnCommitCallbacks(execute=True):
+            Employee.objects.filter(pk=self.employee.pk).update(status='not_accepted')
+            bump_versions(Employee)
+
+        fresh = self.client.get(reverse('dashboard'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.data['data']['employees_by_status']['not_accepted'], 1)
+
+
+@skipUnless(connection.vendor in ('sqlite', 'mysql'), 'Query plans are only checked on SQLite and MySQL')
+class EmployeeQueryPlanTests(ManagementAPITestCase):
+    """
+    Every employee query an endpoint runs must be served by an index. COUNT(*)
+    for page-number pagination reads the whole table by definition and is
+    left out; keyset pages are checked instead.
+    """
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=company)
+        self.employee = self.create_employee(self.sales, status='hired')
+        self.create_employee(self.sales)
+
+    def test_employee_list_keyset_page(self):
+        first = self.client.get(reverse('employee-list'), {'pagination': 'cursor', 'page_size': 1})
+        self.assertIndexedQueries(first.data['data']['next'])
+
+    def test_hired_list(self):
+        self.assertIndexedQueries(reverse('employee-hired-list'))
+
+    def test_hired_export(self):
+        self.assertIndexedQueries(reverse('employee-hired-export'))
+
+    def test_employee_detail(self):
+        self.assertIndexedQueries(reverse('employee-detail', args=[self.employee.pk]))
+
+    @override_settings(SYNC_SETTLE_SECONDS=0)
+    def test_employee_sync_page(self):
+        first = self.client.get(reverse('employee-sync'), {'page_size': 1})
+        self.assertIndexedQueries(reverse('employee-sync'), {'cursor': first.data['data']['cursor']})
+
+    def test_company_department_filter(self):
+        queryset = Employee.objects.filter(company=self.sales.company, department=self.sales).order_by('id')
+        self.assertNotIn(Employee._meta.db_table, full_table_scans(*queryset.query.sql_with_params()))
+
+    def test_hired_date_range_and_email_lookups(self):
+        for queryset in (
+            Employee.objects.filter(hired_date__range=(date.today() - timedelta(days=30), date.today())),
+            Employee.objects.filter(employee_email='employee@example.com'),
+        ):
+            self.assertNotIn(Employee._meta.db_table, full_table_scans(*queryset.query.sql_with_params()))
+
+
+class EmployeeFilterTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.acme = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=self.acme)
+        self.support = Department.objects.create(name='Support', company=self.acme)
+        self.ann = self.create_employee(
+            self.sales, employee_name='Ann Archer', employee_email='ann@acme.com',
+            designation='Engineer', status='hired',
+        )
+        self.bob = self.create_employee(
+            self.support, employee_name='Bob Baker', employee_email='bob@acme.com', designation='Accountant',
+        )
+        Employee.objects.filter(pk=self.ann.pk).update(hired_date=date(2024, 3, 1))
+
+    def ids(self, **params):
+        response = self.client.get(reverse('employee-list'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row['id'] for row in response.data['data']['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.ids(status='hired'), [self.ann.pk])
+        self.assertEqual(self.ids(company=self.acme.pk, department=self.support.pk), [self.bob.pk])
+        self.assertEqual(self.ids(designation='Accountant'), [self.bob.pk])
+        self.assertEqual(self.ids(hired_after='2024-01-01', hired_before='2024-12-31'), [self.ann.pk])
+        self.assertEqual(self.ids(hired_after='2025-01-01'), [])
+
+    def test_invalid_filter_is_rejected(self):
+        response = self.client.get(reverse('employee-list'), {'hired_after': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_matches_prefixes_across_fields(self):
+        self.assertEqual(self.ids(search='arch'), [self.ann.pk])
+        self.assertEqual(self.ids(search='bob@acme.com'), [self.bob.pk])
+        self.assertEqual(self.ids(search='acme'), [self.ann.pk, self.bob.pk])
+        self.assertEqual(self.ids(search='ann accountant'), [])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        self.client.patch(reverse('employee-update', args=[self.bob.pk]), {'designation': 'Architect'})
+        self.assertEqual(self.ids(search='architect'), [self.bob.pk])
+        self.assertEqual(self.ids(search='accountant'), [])
+
+        self.bob.delete()
+        self.assertEqual(self.ids(search='architect'), [])
+
+    @skipUnless(connection.vendor in ('sqlite', 'mysql'), 'Query plans are only checked on SQLite and MySQL')
+    def test_filtered_queries_use_indexes(self):
+        for params in (
+            {'status': 'hired'},
+            {'company': self.acme.pk, 'department': self.sales.pk},
+            {'designation': 'Engineer'},
+            {'hired_after': '2024-01-01'},
+            {'search': 'ann'},
+        ):
+            self.assertIndexedQueries(reverse('employee-list'), params)
+
+
+class PerformanceInstrumentationTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        request_metrics.reset()
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('employee-list'))
+
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'view;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+
+    def test_metrics_endpoint_is_admin_only_and_aggregates_per_route(self):
+        self.client.get(reverse('employee-detail', args=[1]))
+        self.client.get(reverse('employee-detail', args=[2]))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        admin = User.objects.create_user(email='admin@example.com', name='Admin', role='admin', password='x')
+        self.client.force_authenticate(admin)
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn(
+            'http_request_duration_seconds_count{route="api/v1/management/employees/<int:pk>/",method="GET"} 2',
+            body,
+        )
+
+
+class BulkStatusTransitionTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=company)
+        self.candidates = [
+            self.create_employee(self.sales, status='interview_scheduled') for _ in range(3)
+        ]
+        self.hired = self.create_employee(self.sales, status='hired')
+        Employee.objects.filter(pk=self.hired.pk).update(hired_date=date(2024, 1, 1), day_employee=10)
+
+    def post(self, data):
+        return self.client.post(reverse('employee-status-bulk-update'), data, format='json')
+
+    def test_transition_by_ids_reports_per_id_outcomes(self):
+        ids = [self.candidates[0].pk, self.hired.pk, 999999]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post({'status': 'hired', 'ids': ids})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(
+            [result['outcome'] for result in data['results']], ['updated', 'unchanged', 'not_found']
+        )
+        self.assertEqual((data['updated'], data['unchanged'], data['not_found']), (1, 1, 1))
+        updates = [query for query in queries if query['sql'].startswith('UPDATE "management_employee"')]
+        self.assertEqual(len(updates), 1)
+
+        hired = Employee.objects.get(pk=self.candidates[0].pk)
+        self.assertEqual((hired.status, hired.hired_date, hired.day_employee), ('hired', date.today(), 0))
+        self.hired.refresh_from_db()
+        self.assertEqual(self.hired.hired_date, date(2024, 1, 1))
+
+    def test_transition_by_filter(self):
+        response = self.post({'status': 'hired', 'filter': {'status': 'interview_scheduled'}})
+
+        self.assertEqual(response.data['data']['updated'], 3)
+        self.assertEqual(Employee.objects.filter(status='hired').count(), 4)
+
+    def test_ids_or_filter_is_required(self):
+        self.assertEqual(self.post({'status': 'hired'}).status_code, 400)
+        self.assertEqual(self.post({'status': 'unknown', 'ids': [1]}).status_code, 400)
+
+    def test_empty_filter_is_rejected(self):
+        for selection in ({}, {'search': ''}):
+            response = self.post({'status': 'not_accepted', 'filter': selection})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('filter', response.data['errors'])
+        self.assertEqual(Employee.objects.filter(status='not_accepted').count(), 0)
+
+
+class ConditionalGetTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            company = Company.objects.create(name='Acme')
+            self.sales = Department.objects.create(name='Sales', company=company)
+            self.employee = self.create_employee(self.sales)
+
+    def test_matching_etag_returns_not_modified_after_one_query(self):
+        url = reverse('employee-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        url = reverse('department-detail', args=[self.sales.pk])
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_employee(self.sales)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('employee-status-bulk-update'), {'status': 'hired', 'ids': [self.employee.pk]}, format='json'
+            )
+        self.assertNotEqual(self.client.get(url)['ETag'], etag)
+
+    def test_versions_are_bumped_once_per_transaction_after_commit(self):
+        table = TableVersion._meta.db_table
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                self.create_employee(self.sales)
+            self.assertFalse([query for query in queries if table in query['sql']])
+
+        updates = [query for query in queries if query['sql'].startswith(f'UPDATE "{table}"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_etag_depends_on_query_string(self):
+        url = reverse('company-list')
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url, {'page': 1})['ETag'])
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class EmployeeSyncTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=company)
+        self.employees = [self.create_employee(self.sales) for _ in range(3)]
+
+    def sync(self, **params):
+        response = self.client.get(reverse('employee-sync'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def sync_all(self, cursor=None):
+        ids, deleted = [], []
+        while True:
+            params = {'page_size': 2}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.sync(**params)
+            ids += [employee['id'] for employee in data['results']]
+            deleted += data['deleted']
+            cursor = data['cursor']
+            if not data['has_more']:
+                return ids, deleted, cursor
+
+    def test_returns_only_changes_since_cursor(self):
+        ids, deleted, cursor = self.sync_all()
+        self.assertEqual(ids, [employee.pk for employee in self.employees])
+        self.assertEqual(deleted, [])
+        self.assertEqual(self.sync_all(cursor)[:2], ([], []))
+
+        updated, removed, _ = self.employees
+        updated.designation = 'Manager'
+        updated.save(update_fields=['designation'])
+        removed_id = removed.pk
+        removed.delete()
+        added = self.create_employee(self.sales)
+        self.client.post(
+            reverse('employee-status-bulk-update'), {'status': 'hired', 'ids': [self.employees[2].pk]}, format='json'
+        )
+
+        ids, deleted, _ = self.sync_all(cursor)
+        self.assertEqual(sorted(ids), sorted([updated.pk, added.pk, self.employees[2].pk]))
+        self.assertEqual(deleted, [removed_id])
+
+    @override_settings(SYNC_SETTLE_SECONDS=60)
+    def test_recent_writes_wait_for_the_settle_delay(self):
+        self.assertEqual(self.sync()['results'], [])
+
+    def test_bad_and_expired_cursors_are_rejected(self):
+        response = self.client.get(reverse('employee-sync'), {'cursor': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+        cursor = self.sync()['cursor']
+        with override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=0):
+            self.assertEqual(self.client.get(reverse('employee-sync'), {'cursor': cursor}).status_code, 400)
+
+    def test_prune_tombstones(self):
+        recent = self.employees[1].pk
+        self.employees[0].delete()
+        Tombstone.objects.update(deleted_at=Tombstone.objects.get().deleted_at - timedelta(days=100))
+        self.employees[1].delete()
+
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [recent])
+
+
+class FastListRenderingTests(ManagementAPITestCase):
+    """The values serializers and FastJSONRenderer must not change a single byte of the list responses."""
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acmé   Corp')
+        self.sales = Department.objects.create(name='Sales', company=company)
+        self.create_employee(self.sales, status='hired', employee_name='Zoë')
+        self.create_employee(self.sales)
+
+    def test_list_pages_match_the_model_serializers(self):
+        cases = [
+            ('company-list-all', CompanySerializer, Company.objects.all()),
+            ('department-list-all', DepartmentSerializer, Department.objects.all()),
+        ]
+        for name, serializer_class, queryset in cases:
+            expected = JSONRenderer().render({
+                'success': True,
+                'message': self.client.get(reverse(name)).data['message'],
+                'data': serializer_class(queryset, many=True).data,
+                'errors': None,
+            })
+            self.assertEqual(self.client.get(reverse(name)).content, expected)
+
+        response = self.client.get(reverse('employee-list'))
+        expected = EmployeeSerializer(Employee.objects.for_serializer().order_by('id'), many=True).data
+        self.assertEqual(
+            JSONRenderer().render(response.data['data']['results']),
+            JSONRenderer().render(expected),
+        )
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_renderer_matches_json_renderer(self):
+        data = {
+            'text': 'naïve     "quoted"',
+            'when': timezone.now(),
+            'day': date(2024, 1, 2),
+            'amount': Decimal('1.50'),
+            'ratio': 0.25,
+            'ids': {1, 2},
+            'nested': [{'none': None, 'flag': True}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_falls_back_for_output_orjson_writes_differently(self):
+        for data in ({1: 'int key'}, {'big': 2 ** 70}):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render({'a': 1}, 'application/json; indent=2'),
+            JSONRenderer().render({'a': 1}, 'application/json; indent=2'),
+        )
+
+    def test_renderer_falls_back_for_floats_orjson_writes_differently(self):
+        for value in (2.5e-05, -1e-07, Decimal('0.00001'), float('nan'), float('inf')):
+            data = {'results': [{'score': value}]}
+            with mock.patch.object(JSONRenderer, 'render', return_value=b'fallback') as fallback:
+                FastJSONRenderer().render(data)
+            fallback.assert_called_once()
+        data = {'small': 2.5e-05}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_keeps_orjson_for_text_and_ordinary_floats(self):
+        data = {'designation': 'Re-hire, e-mail 1e-05', 'zero': 0.0, 'share': 0.25, 'big': 1e+20}
+        with mock.patch.object(JSONRenderer, 'render') as fallback:
+            rendered = FastJSONRenderer().render(data)
+        fallback.assert_not_called()
+        self.assertEqual(rendered, json.dumps(data, separators=(',', ':')).encode())
+
+
+class LookupModeTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        lookup_cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.acme = Company.objects.create(name='Acme')
+            self.globex = Company.objects.create(name='Globex')
+            self.sales = Department.objects.create(name='Sales', company=self.acme)
+            self.support = Department.objects.create(name='Support', company=self.globex)
+
+    def lookup(self, name, **params):
+        response = self.client.get(reverse(name), {'mode': 'lookup', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_returns_ids_and_names_from_the_cache(self):
+        self.assertEqual(self.lookup('company-list-all')['results'], [
+            {'id': self.acme.pk, 'name': 'Acme'}, {'id': self.globex.pk, 'name': 'Globex'},
+        ])
+
+        # One query for the version stamps, none for the rows.
+        with self.assertNumQueries(1):
+            self.lookup('company-list-all')
+
+    def test_writes_invalidate_the_cache(self):
+        self.lookup('department-list-all')
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.create(name='Marketing', company=self.acme)
+            self.support.delete()
+
+        names = [row['name'] for row in self.lookup('department-list-all')['results']]
+        self.assertEqual(names, ['Marketing', 'Sales'])
+
+    def test_filters_and_limit(self):
+        data = self.lookup('department-list-all', company=self.globex.pk)
+        self.assertEqual(data['results'], [{'id': self.support.pk, 'name': 'Support', 'company_id': self.globex.pk}])
+
+        data = self.lookup('department-list-all', search='s', limit=1)
+        self.assertEqual((data['count'], len(data['results'])), (2, 1))
+
+        response = self.client.get(reverse('department-list-all'), {'mode': 'lookup', 'limit': 0})
+        self.assertEqual(response.status_code, 400)
+
+
+class AsyncReadViewTests(ManagementAPITestCase):
+    """The async endpoints answer exactly like their sync counterparts."""
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=company)
+        self.employee = self.create_employee(self.sales, status='hired')
+        for _ in range(11):
+            self.create_employee(self.sales)
+        self.token = CustomObtainPairSerializer.get_token(self.user).access_token
+
+    def test_payloads_match_the_sync_views(self):
+        cases = [
+            ('company-list', 'async-company-list', [], {}),
+            ('company-detail', 'async-company-detail', [self.sales.company_id], {}),
+            ('department-list', 'async-department-list', [], {}),
+            ('department-detail', 'async-department-detail', [self.sales.pk], {}),
+            ('employee-list', 'async-employee-list', [], {'page': 2, 'status': 'application_received'}),
+            ('employee-list', 'async-employee-list', [], {'pagination': 'cursor', 'page_size': 5}),
+            ('employee-hired-list', 'async-employee-hired-list', [], {}),
+            ('employee-detail', 'async-employee-detail', [self.employee.pk], {}),
+            ('employee-list', 'async-employee-list', [], {'fields': 'employee_name,department', 'expand': 'department'}),
+            ('employee-detail', 'async-employee-detail', [self.employee.pk], {'fields': 'status'}),
+            ('dashboard', 'async-dashboard', [], {}),
+        ]
+        for sync_name, async_name, args, params in cases:
+            expected = self.client.get(reverse(sync_name, args=args), params)
+            response = self.client.get(reverse(async_name, args=args), params)
+            self.assertEqual(response.status_code, expected.status_code, async_name)
+            self.assertEqual(
+                response.content.replace(b'/async', b''), expected.content, async_name
+            )
+
+    def test_errors_match_the_sync_views(self):
+        for sync_url, async_url in (
+            (reverse('employee-detail', args=[999]), reverse('async-employee-detail', args=[999])),
+            (reverse('employee-list') + '?page=99', reverse('async-employee-list') + '?page=99'),
+            (reverse('employee-list') + '?status=unknown', reverse('async-employee-list') + '?status=unknown'),
+        ):
+            expected = self.client.get(sync_url)
+            response = self.client.get(async_url)
+            self.assertEqual((response.status_code, response.content), (expected.status_code, expected.content))
+
+    def test_permissions(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(reverse('async-dashboard'))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+
+        employee = User.objects.create_user(
+            email='employee@example.com', name='Employee', role='employee', password='test@1234'
+        )
+        self.client.force_authenticate(employee)
+        self.assertEqual(self.client.get(reverse('async-employee-list')).status_code, 403)
+
+    async def test_served_by_the_async_handler_with_jwt(self):
+        headers = {'Authorization': f'Bearer {self.token}'}
+        response = await self.async_client.get(reverse('async-employee-list'), headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['data']['count'], 12)
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+        response = await self.async_client.get(
+            reverse('async-employee-list'), headers={**headers, 'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.async_client.get(reverse('async-employee-list'), headers={'Authorization': 'Bearer nope'})
+        self.assertEqual(response.status_code, 401)
+
+
+class BenchmarkSuiteTests(ManagementAPITestCase):
+
+    def test_seed_data_keeps_counters_in_step(self):
+        call_command(
+            'seed_data', companies=3, departments=7, employees=250, users=4, batch_size=100, stdout=StringIO()
+        )
+
+        self.assertEqual(Company.objects.count(), 3)
+        self.assertEqual(Department.objects.count(), 7)
+        self.assertEqual(set(Employee.objects.values_list('status', flat=True)), {value for value, _ in EmployeeStatus})
+        self.assertFalse(Employee.objects.filter(status='hired', hired_date=None).exists())
+        out = StringIO()
+        call_command('reconcile_counters', dry_run=True, stdout=out)
+        call_command('rebuild_funnel', dry_run=True, stdout=out)
+        self.assertIn('All counters are correct.', out.getvalue())
+        self.assertIn('The funnel summary is correct.', out.getvalue())
+
+    def test_benchmark_covers_every_route_and_flags_regressions(self):
+        call_command('seed_data', companies=2, departments=2, employees=20, users=1, stdout=StringIO())
+        path = self.enterContext(TemporaryDirectory())
+        results = f'{path}/results.json'
+
+        call_command('benchmark_api', repeat=1, warmup=0, json_path=results, stdout=StringIO())
+
+        with open(results) as fp:
+            report = json.load(fp)
+        self.assertEqual(report['dataset']['employees'], 20)
+        self.assertTrue(all(row['status'] < 400 for row in report['endpoints']), report['endpoints'])
+        self.assertEqual(Employee.objects.count(), 20)
+
+        baseline = deepcopy(report['endpoints'])
+        current = deepcopy(baseline)
+        current[0]['queries'] += 1
+        current[1]['latency']['p95_ms'] = baseline[1]['latency']['p95_ms'] * 2 + 5
+        current[2]['latency']['p95_ms'] = baseline[2]['latency']['p95_ms'] + 0.5
+        regressions = compare(current, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith(f"{current[0]['name']}: "))
+        self.assertTrue(regressions[1].startswith(f"{current[1]['name']}: "))
+
+
+class HealthCheckTests(TransactionTestCase):
+    databases = '__all__'
+
+    def test_health_reports_every_database(self):
+        response = self.client.get(reverse('health'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['data']), set(connections))
+
+
+@override_settings(
+    DATABASE_REPLICAS=['replica_1', 'replica_2'], DATABASE_REPLICA_STICKY_SECONDS=10,
+    CACHES={**settings.CACHES, 'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Routing decisions, made without touching the replicas."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def route(self, request):
+        """The alias an Employee read would use while `request` is served."""
+        def get_response(request):
+            return HttpResponse(ReplicaRouter().db_for_read(Employee))
+
+        return ReplicaRoutingMiddleware(get_response)(request).content.decode()
+
+    def bearer(self, user_id):
+        token = AccessToken()
+        token['user_id'] = user_id
+        return {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def test_safe_requests_read_from_a_replica(self):
+        self.assertIn(self.route(self.factory.get('/', **self.bearer(1))), ['replica_1', 'replica_2'])
+        self.assertIsNone(read_replica.get())
+        self.assertEqual(ReplicaRouter().db_for_write(Employee), 'default')
+
+    def test_user_reads_its_own_writes(self):
+        self.assertEqual(self.route(self.factory.post('/', **self.bearer(1))), 'default')
+
+        # Under a fresh token too, and on any worker sharing the cache.
+        self.assertEqual(self.route(self.factory.get('/', **self.bearer(1))), 'default')
+        self.assertNotEqual(self.route(self.factory.get('/', **self.bearer(2))), 'default')
+        self.assertNotEqual(
+            self.route(self.factory.get('/', HTTP_AUTHORIZATION='Bearer forged', REMOTE_ADDR='10.0.0.1')), 'default'
+        )
+
+    def test_pins_expire(self):
+        self.route(self.factory.post('/', **self.bearer(1)))
+        caches['shared'].delete(sticky_key(self.factory.get('/', **self.bearer(1))))
+        self.assertNotEqual(self.route(self.factory.get('/', **self.bearer(1))), 'default')
+
+    def test_database_cache_reads_stay_on_the_primary(self):
+        token = read_replica.set('replica_1')
+        try:
+            self.assertEqual(ReplicaRouter().db_for_read(DatabaseCache('shared_cache', {}).cache_model_class), 'default')
+        finally:
+            read_replica.reset(token)
+
+    def test_streamed_content_reads_from_the_same_replica(self):
+        def get_response(request):
+            return StreamingHttpResponse(ReplicaRouter().db_for_read(Employee) or 'default' for _ in range(2))
+
+        response = ReplicaRoutingMiddleware(get_response)(self.factory.get('/'))
+        self.assertIsNone(read_replica.get())
+        first, second = list(response.streaming_content)
+        self.assertIn(first.decode(), ['replica_1', 'replica_2'])
+        self.assertEqual(first, second)
+        self.assertIsNone(read_replica.get())
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_from_the_primary(self):
+        self.assertEqual(self.route(self.factory.get('/')), 'default')
+
+
+@skipUnless(settings.DATABASE_REPLICAS, 'Set DB_REPLICAS to run against replica aliases.')
+@override_settings(STATUS_HISTORY={**settings.STATUS_HISTORY, 'BACKGROUND': False})
+class ReplicaReadTests(TransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        caches['shared'].clear()
+        self.user = User.objects.create_user(
+            email='manager@example.com', name='Manager', role='manager', password='test@1234'
+        )
+        self.headers = {'Authorization': f'Bearer {CustomObtainPairSerializer.get_token(self.user).access_token}'}
+        company = Company.objects.create(name='Acme')
+        self.department = Department.objects.create(name='Sales', company=company)
+
+    def queries_by_alias(self, method, url, data=None):
+        contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in connections}
+        for context in contexts.values():
+            context.__enter__()
+        try:
+            response = getattr(self.client, method)(url, data, content_type='application/json', headers=self.headers)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        finally:
+            for context in contexts.values():
+                context.__exit__(None, None, None)
+        self.assertLess(response.status_code, 400, response.content)
+        # Read-your-writes pins are looked up in the shared cache table on the primary.
+        cache_table = settings.CACHES['shared']['LOCATION']
+        counts = {
+            alias: len([query for query in context if cache_table not in query['sql']])
+            for alias, context in contexts.items()
+        }
+        return {alias: count for alias, count in counts.items() if count}
+
+    def test_streamed_exports_read_from_the_replica(self):
+        Employee.objects.create(
+            company=self.department.company, department=self.department, employee_name='Ann',
+            employee_email='ann@example.com', phone_number='+123456789', address='Street', designation='Engineer',
+        )
+        table = Employee._meta.db_table
+        contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in connections}
+        for context in contexts.values():
+            context.__enter__()
+        try:
+            response = self.client.get(reverse('employee-export'), headers=self.headers)
+            self.assertIn(b'Ann', b''.join(response.streaming_content))
+        finally:
+            for context in contexts.values():
+                context.__exit__(None, None, None)
+        reads = {alias for alias, context in contexts.items() for query in context if table in query['sql']}
+        self.assertTrue(reads)
+        self.assertNotIn('default', reads)
+
+    def test_reads_go_to_replicas_until_the_client_writes(self):
+        queries = self.queries_by_alias('get', reverse('employee-list'))
+        self.assertTrue(queries)
+        self.assertNotIn('default', queries)
+
+        queries = self.queries_by_alias('post', reverse('employee-create'), {
+            'company': self.department.company_id, 'department': self.department.pk,
+            'employee_name': 'Ann', 'employee_email': 'ann@example.com', 'phone_number': '+123456789',
+            'address': 'Street', 'designation': 'Engineer',
+        })
+        self.assertEqual(set(queries), {'default'})
+
+        queries = self.queries_by_alias('get', reverse('employee-list'))
+        self.assertEqual(set(queries), {'default'})
+
+
+class EmployeeWriteValidationTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.acme = Company.objects.create(name='Acme')
+        self.globex = Company.objects.create(name='Globex')
+        self.sales = Department.objects.create(name='Sales', company=self.acme)
+        self.support = Department.objects.create(name='Support', company=self.acme)
+        self.research = Department.objects.create(name='Research', company=self.globex)
+        self.employee = self.create_employee(self.sales)
+
+    def create(self, company, department):
+        return self.client.post(reverse('employee-create'), {
+            'company': company, 'department': department, 'employee_name': 'Ann',
+            'employee_email': 'ann@example.com', 'phone_number': '+123456789',
+            'address': 'Street', 'designation': 'Engineer',
+        }, format='json')
+
+    def update(self, **data):
+        return self.client.patch(reverse('employee-update', args=[self.employee.pk]), data, format='json')
+
+    def test_validation_does_not_query_companies_or_departments(self):
+        self.create(self.acme.pk, self.sales.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.create(self.acme.pk, self.support.pk)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['department'], self.support.pk)
+        selects = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertFalse([sql for sql in selects if 'management_department' in sql or 'management_company' in sql])
+        self.assertEqual(len([sql for sql in selects if 'management_tableversion' in sql]), 1)
+
+    def test_rejects_unknown_ids_and_mismatched_departments(self):
+        response = self.create(999, self.sales.pk)
+        self.assertIn('company', response.data['errors'])
+        response = self.create(self.acme.pk, 999)
+        self.assertIn('department', response.data['errors'])
+        response = self.create(self.acme.pk, self.research.pk)
+        self.assertEqual(
+            response.data['errors']['department'], ['The department must belong to the specified company.']
+        )
+
+    def test_partial_updates_check_the_field_not_sent(self):
+        self.assertEqual(self.update(department=self.research.pk).status_code, 400)
+        self.assertEqual(self.update(company=self.globex.pk).status_code, 400)
+        self.assertEqual(self.update(department=self.support.pk).status_code, 200)
+        self.assertEqual(self.update(company=self.globex.pk, department=self.research.pk).status_code, 200)
+
+    def test_new_and_moved_departments_are_seen(self):
+        self.create(self.acme.pk, self.sales.pk)
+        marketing = Department.objects.create(name='Marketing', company=self.globex)
+        self.assertEqual(self.create(self.globex.pk, marketing.pk).status_code, 201)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            marketing.company = self.acme
+            marketing.save()
+        self.assertEqual(self.create(self.globex.pk, marketing.pk).status_code, 400)
+        self.assertEqual(self.create(self.acme.pk, marketing.pk).status_code, 201)
+
+    def test_changes_made_by_other_processes_are_seen(self):
+        self.create(self.acme.pk, self.sales.pk)
+
+        # Written without signals, as another process's changes look to this one.
+        Department.objects.bulk_create([Department(name='Marketing', company=self.globex)])
+        marketing = Department.objects.get(name='Marketing')
+        self.assertEqual(self.create(self.globex.pk, marketing.pk).status_code, 201)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.filter(pk=marketing.pk).update(company=self.acme)
+            bump_versions(Department)
+        self.assertEqual(self.create(self.globex.pk, marketing.pk).status_code, 400)
+        self.assertEqual(self.create(self.acme.pk, marketing.pk).status_code, 201)
+
+
+class StatusHistoryTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Left over from earlier tests.
+        status_history.flush()
+        StatusTransition.objects.all().delete()
+        self.acme = Company.objects.create(name='Acme')
+        self.globex = Company.objects.create(name='Globex')
+        self.sales = Department.objects.create(name='Sales', company=self.acme)
+        self.research = Department.objects.create(name='Research', company=self.globex)
+
+    def test_status_changes_are_queued_and_written_in_batches(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            employee = self.create_employee(self.sales)
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            self.client.post(reverse('employee-status-update', args=[employee.pk]), {'status': 'interview_scheduled'})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('employee-update', args=[employee.pk]), {'status': 'hired'}, format='json')
+            bulk_transition('not_accepted', ids=[employee.pk])
+
+        table = StatusTransition._meta.db_table
+        self.assertFalse([query for query in queries.captured_queries if table in query['sql']])
+        self.assertFalse(StatusTransition.objects.exists())
+
+        status_history.flush()
+
+        self.assertEqual(
+            list(
+                StatusTransition.objects.order_by('id')
+                .values_list('employee_id', 'company_id', 'from_status', 'to_status')
+            ),
+            [
+                (employee.pk, self.acme.pk, None, 'application_received'),
+                (employee.pk, self.acme.pk, 'application_received', 'interview_scheduled'),
+                (employee.pk, self.acme.pk, 'interview_scheduled', 'hired'),
+                (employee.pk, self.acme.pk, 'hired', 'not_accepted'),
+            ],
+        )
+
+    def test_stage_durations_per_company_and_department(self):
+        start = timezone.now() - timedelta(days=30)
+
+        def history(employee_id, department, *steps):
+            statuses = [None, *(status for status, _ in steps)]
+            StatusTransition.objects.bulk_create(
+                StatusTransition(
+                    employee_id=employee_id, company_id=department.company_id, department_id=department.pk,
+                    from_status=from_status, to_status=to_status, changed_at=start + timedelta(hours=hours),
+                )
+                for from_status, (to_status, hours) in zip(statuses, steps)
+            )
+
+        history(1, self.sales, ('application_received', 0), ('interview_scheduled', 24), ('hired', 72))
+        history(2, self.sales, ('application_received', 0), ('interview_scheduled', 48), ('not_accepted', 50))
+        history(3, self.research, ('application_received', 0), ('hired', 10))
+        history(4, self.research, ('application_received', 5))
+
+        response = self.client.get(reverse('employee-status-durations'))
+
+        self.assertEqual(response.status_code, 200)
+        acme, globex = response.data['data']['groups']
+        self.assertEqual((acme['id'], acme['name']), (self.acme.pk, 'Acme'))
+        self.assertEqual(
+            acme['stages']['application_received'], {'count': 2, 'p50_hours': 24.0, 'p90_hours': 48.0, 'p95_hours': 48.0}
+        )
+        self.assertEqual(acme['stages']['interview_scheduled']['p50_hours'], 2.0)
+        self.assertEqual(acme['time_to_hire'], {'count': 1, 'p50_hours': 72.0, 'p90_hours': 72.0, 'p95_hours': 72.0})
+        self.assertEqual(list(globex['stages']), ['application_received'])
+        self.assertEqual(globex['time_to_hire']['p50_hours'], 10.0)
+
+        response = self.client.get(
+            reverse('employee-status-durations'), {'group_by': 'department', 'department': self.research.pk}
+        )
+        self.assertEqual([group['name'] for group in response.data['data']['groups']], ['Research'])
+
+        etag = self.client.get(reverse('employee-status-durations'))['ETag']
+        response = self.client.get(reverse('employee-status-durations'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_stages_that_began_in_another_group_are_measured_from_their_start(self):
+        start = timezone.now() - timedelta(days=30)
+        StatusTransition.objects.bulk_create(
+            StatusTransition(
+                employee_id=1, company_id=department.company_id, department_id=department.pk,
+                from_status=from_status, to_status=to_status, changed_at=start + timedelta(hours=hours),
+            )
+            for department, from_status, to_status, hours in [
+                (self.sales, None, 'application_received', 0),
+                (self.research, 'application_received', 'interview_scheduled', 30),
+                (self.research, 'interview_scheduled', 'hired', 36),
+            ]
+        )
+
+        response = self.client.get(
+            reverse('employee-status-durations'), {'group_by': 'department', 'department': self.research.pk}
+        )
+
+        [research] = response.data['data']['groups']
+        self.assertEqual(research['id'], self.research.pk)
+        self.assertEqual(research['stages']['application_received']['p50_hours'], 30.0)
+        self.assertEqual(research['stages']['interview_scheduled']['p50_hours'], 6.0)
+        self.assertEqual(research['time_to_hire']['p50_hours'], 36.0)
+
+
+class FunnelTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.acme = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=self.acme)
+        self.research = Department.objects.create(name='Research', company=self.acme)
+
+    def status_counts(self):
+        return {
+            (department_id, status): count
+            for department_id, status, count in StatusCount.objects.filter(count__gt=0)
+            .values_list('department_id', 'status', 'count')
+        }
+
+    def hire_counts(self):
+        return dict(WeeklyHireCount.objects.filter(count__gt=0).values_list('week', 'count'))
+
+    def test_employee_writes_adjust_the_summary_by_delta(self):
+        employee = self.create_employee(self.sales)
+        self.create_employee(self.sales)
+        self.assertEqual(self.status_counts(), {(self.sales.pk, 'application_received'): 2})
+
+        employee.status = 'hired'
+        employee.hired_date = date(2025, 3, 5)
+        employee.department = self.research
+        employee.save()
+        self.assertEqual(
+            self.status_counts(),
+            {(self.sales.pk, 'application_received'): 1, (self.research.pk, 'hired'): 1},
+        )
+        self.assertEqual(self.hire_counts(), {date(2025, 3, 3): 1})
+
+        employee.delete()
+        self.assertEqual(self.status_counts(), {(self.sales.pk, 'application_received'): 1})
+        self.assertEqual(self.hire_counts(), {})
+
+    def test_bulk_transition_and_import_adjust_the_summary(self):
+        candidates = [self.create_employee(self.sales, status='interview_scheduled') for _ in range(2)]
+        bulk_transition('hired', ids=[employee.pk for employee in candidates])
+
+        self.assertEqual(self.status_counts(), {(self.sales.pk, 'hired'): 2})
+        self.assertEqual(self.hire_counts(), {week_of(date.today()): 2})
+
+        header = 'company,department,employee_name,employee_email,phone_number,address,designation'
+        row = f'{self.acme.pk},{self.research.pk},New,new@example.com,+123456789,Address,Engineer'
+        self.client.post(
+            reverse('employee-import'),
+            {'file': SimpleUploadedFile('employees.csv', f'{header}\n{row}\n'.encode())},
+            format='multipart',
+        )
+        self.assertEqual(self.status_counts()[(self.research.pk, 'application_received')], 1)
+
+    def test_rebuild_reports_and_fixes_drift(self):
+        self.create_employee(self.sales, status='hired')
+        Employee.objects.update(hired_date=date(2025, 3, 5))
+        StatusCount.objects.update(count=5)
+
+        out = StringIO()
+        call_command('rebuild_funnel', dry_run=True, stdout=out)
+        self.assertIn(f'StatusCount {self.acme.pk}/{self.sales.pk}/hired: count is 5, expected 1', out.getvalue())
+        self.assertIn('3 funnel count(s) drifted, nothing fixed', out.getvalue())
+        self.assertEqual(self.status_counts(), {(self.sales.pk, 'hired'): 5})
+
+        call_command('rebuild_funnel', stdout=StringIO())
+        self.assertEqual(self.status_counts(), {(self.sales.pk, 'hired'): 1})
+        self.assertEqual(self.hire_counts(), {date(2025, 3, 3): 1})
+
+    def test_funnel_reads_only_the_summary_tables(self):
+        this_week = week_of(date.today())
+        self.create_employee(self.sales, status='hired', hired_date=this_week)
+        self.create_employee(self.sales, status='hired', hired_date=this_week - timedelta(weeks=1))
+        self.create_employee(self.research)
+        globex = Company.objects.create(name='Globex')
+        self.create_employee(Department.objects.create(name='Support', company=globex), status='not_accepted')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard-funnel'), {'weeks': 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if Employee._meta.db_table + '"' in query['sql']])
+        data = response.data['data']
+        self.assertEqual(data['by_status'], {
+            'application_received': 1, 'interview_scheduled': 0, 'hired': 2, 'not_accepted': 1,
+        })
+        acme = next(company for company in data['companies'] if company['id'] == self.acme.pk)
+        self.assertEqual(acme['name'], 'Acme')
+        self.assertEqual(
+            {department['name']: department['by_status']['hired'] for department in acme['departments']},
+            {'Sales': 2, 'Research': 0},
+        )
+        self.assertEqual(
+            data['hires_per_week'],
+            [
+                {'week': this_week - timedelta(weeks=2), 'count': 0},
+                {'week': this_week - timedelta(weeks=1), 'count': 1},
+                {'week': this_week, 'count': 1},
+            ],
+        )
+
+        response = self.client.get(reverse('dashboard-funnel'), {'company': globex.pk})
+        self.assertEqual([company['name'] for company in response.data['data']['companies']], ['Globex'])
+        self.assertEqual(self.client.get(reverse('dashboard-funnel'), {'weeks': 0}).status_code, 400)
+
+
+class EmployeeFieldsetTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        company = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=company)
+        self.employee = self.create_employee(self.sales, status='hired', hired_date=date(2025, 1, 2))
+        self.sales.refresh_from_db()
+        self.sales.company.refresh_from_db()
+
+    def get(self, name, params, args=()):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name, args=args), params)
+        self.assertEqual(response.status_code, 200)
+        employee_queries = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "management_employee"' in query['sql']
+            and 'COUNT(' not in query['sql']
+        ]
+        self.assertEqual(len(employee_queries), 1)
+        return response.data['data'], employee_queries[0]
+
+    def test_fields_narrow_the_payload_and_the_query(self):
+        data, sql = self.get('employee-list', {'fields': 'employee_name,status,department'})
+
+        self.assertEqual(data['results'], [{
+            'id': self.employee.pk, 'department': self.sales.pk, 'status': 'hired', 'employee_name': 'Employee',
+        }])
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('"address"', sql)
+
+    def test_expand_nests_only_the_requested_relations(self):
+        data, sql = self.get('employee-hired-list', {'fields': 'hired_date', 'expand': 'department'})
+
+        result = data['results'][0]
+        self.assertEqual(list(result), ['id', 'department', 'hired_date'])
+        self.assertEqual(result['hired_date'], '2025-01-02')
+        self.assertEqual(result['department'], DepartmentSerializer(self.sales).data)
+        self.assertIn('"management_department"', sql)
+        self.assertNotIn('"management_company"', sql)
+
+        data, sql = self.get('employee-detail', {'expand': 'company'}, args=[self.employee.pk])
+        self.assertEqual(data['company'], CompanySerializer(self.sales.company).data)
+        self.assertEqual(data['department'], self.sales.pk)
+        self.assertEqual(data['address'], 'Address')
+        self.assertNotIn('"management_department"', sql)
+
+    def test_without_parameters_the_full_representation_is_kept(self):
+        data, _ = self.get('employee-detail', {}, args=[self.employee.pk])
+        self.assertEqual(data, EmployeeSerializer(Employee.objects.get(pk=self.employee.pk)).data)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(reverse('employee-list'), {'fields': 'status,salary'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('employee-list'), {'expand': 'status'})
+        self.assertEqual(response.status_code, 400)
+
+
+class StubWebhookServer(ThreadingHTTPServer):
+    """Local HTTP server recording the webhook batches it receives and answering with `status`."""
+
+    def __init__(self):
+        self.status = 200
+        self.requests = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(handler):
+                body = handler.rfile.read(int(handler.headers['Content-Length']))
+                self.requests.append((dict(handler.headers), json.loads(body), body))
+                handler.send_response(self.status)
+                handler.end_headers()
+
+            def log_message(handler, *args):
+                pass
+
+        super().__init__(('127.0.0.1', 0), Handler)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/hooks'
+
+
+class OutboxTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.server = StubWebhookServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.enterContext(override_settings(OUTBOX={
+            **settings.OUTBOX, 'ENDPOINTS': [self.server.url], 'SECRET': 'secret', 'BACKOFF_SECONDS': 60,
+        }))
+        company = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=company)
+
+    def topics(self):
+        return list(OutboxEvent.objects.order_by('id').values_list('topic', flat=True))
+
+    def test_changes_write_events_in_their_transaction(self):
+        employee = self.create_employee(self.sales)
+        self.client.patch(reverse('employee-update', args=[employee.pk]), {'status': 'hired'}, format='json')
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.create_employee(self.sales)
+            raise RuntimeError
+        bulk_transition('not_accepted', ids=[employee.pk])
+        employee.refresh_from_db()
+        employee.delete()
+
+        self.assertEqual(self.topics(), [
+            'department.created', 'employee.created', 'employee.updated', 'employee.hired',
+            'employee.updated', 'employee.deleted',
+        ])
+        updated = OutboxEvent.objects.filter(topic='employee.updated').order_by('id').last()
+        self.assertEqual(updated.payload['previous_status'], 'hired')
+        self.assertEqual(updated.payload['status'], 'not_accepted')
+        self.assertEqual(updated.endpoint, self.server.url)
+
+        with override_settings(OUTBOX={**settings.OUTBOX, 'ENDPOINTS': []}):
+            self.create_employee(self.sales)
+        self.assertEqual(OutboxEvent.objects.count(), 6)
+
+    def test_events_are_delivered_in_signed_batches(self):
+        for _ in range(3):
+            self.create_employee(self.sales)
+
+        out = StringIO()
+        with self.settings(OUTBOX={**settings.OUTBOX, 'BATCH_SIZE': 2}):
+            call_command('deliver_outbox', once=True, stdout=out)
+
+        self.assertIn('Delivered 4 event(s), 0 failed', out.getvalue())
+        self.assertEqual([len(body['events']) for _, body, _ in self.server.requests], [2, 2])
+        headers, body, raw = self.server.requests[0]
+        self.assertEqual(body['events'][0]['topic'], 'department.created')
+        self.assertEqual(body['events'][1]['payload']['employee_name'], 'Employee')
+        expected = hmac.new(b'secret', raw, hashlib.sha256).hexdigest()
+        self.assertEqual(headers['X-Outbox-Signature'], f'sha256={expected}')
+        self.assertFalse(OutboxEvent.objects.filter(delivered_at=None).exists())
+
+        call_command('deliver_outbox', once=True, stdout=StringIO())
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_failed_deliveries_back_off_and_are_retried(self):
+        self.server.status = 503
+        delivery = OutboxDelivery({'MAX_ATTEMPTS': 2})
+
+        self.assertEqual(delivery.deliver_due(), (0, 1))
+        event = OutboxEvent.objects.get()
+        self.assertEqual((event.attempts, event.last_error), (1, 'HTTP 503'))
+        self.assertGreater(event.next_attempt_at, timezone.now() + timedelta(seconds=50))
+        self.assertEqual(delivery.deliver_due(), (0, 0))
+
+        OutboxEvent.objects.update(next_attempt_at=timezone.now())
+        self.server.status = 204
+        self.assertEqual(delivery.deliver_due(), (1, 0))
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, 2)
+        self.assertIsNotNone(event.delivered_at)
+
+        # Given up on after MAX_ATTEMPTS.
+        self.server.status = 500
+        Department.objects.create(name='Support', company=self.sales.company)
+        for _ in range(3):
+            OutboxEvent.objects.update(next_attempt_at=timezone.now())
+            delivery.deliver_due()
+        self.assertEqual(OutboxEvent.objects.get(delivered_at=None).attempts, 2)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_unreachable_endpoints_are_retried(self):
+        self.server.server_close()
+        self.server.shutdown()
+
+        self.assertEqual(OutboxDelivery().deliver_due(), (0, 1))
+        self.assertTrue(OutboxEvent.objects.get().last_error)
+
+
+class BulkDeleteTests(ManagementAPITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.acme = Company.objects.create(name='Acme')
+        self.sales = Department.objects.create(name='Sales', company=self.acme)
+        self.rejected = [self.create_employee(self.sales, status='not_accepted') for _ in range(3)]
+        self.hired = self.create_employee(self.sales, status='hired')
+
+    def post(self, data):
+        return self.client.post(reverse('employee-bulk-delete'), data, format='json')
+
+    def assertBookkeepingInStep(self):
+        out = StringIO()
+        call_command('reconcile_counters', dry_run=True, stdout=out)
+        call_command('rebuild_funnel', dry_run=True, stdout=out)
+        self.assertIn('All counters are correct.', out.getvalue())
+        self.assertIn('The funnel summary is correct.', out.getvalue())
+
+    def test_delete_by_ids_in_a_fixed_number_of_queries(self):
+        ids = [employee.pk for employee in self.rejected[:2]]
+        with CaptureQueriesContext(connection) as few:
+            response = self.post({'ids': [ids[0], 999999]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['outcome'] for result in response.data['data']['results']], ['deleted', 'not_found']
+        )
+
+        # One query per distinct counter delta, not per row.
+        with CaptureQueriesContext(connection) as more:
+            self.post({'ids': [ids[1], self.rejected[2].pk]})
+        self.assertEqual(len(few), len(more))
+        bulk_delete(ids=[self.hired.pk])
+
+        self.assertFalse(Employee.objects.exists())
+        self.assertFalse(ArchivedEmployee.objects.exists())
+        self.assertEqual(
+            set(Tombstone.objects.values_list('object_id', flat=True)),
+            {employee.pk for employee in [*self.rejected, self.hired]},
+        )
+        self.assertBookkeepingInStep()
+
+    def test_delete_by_filter_into_the_archive(self):
+        response = self.post({'filter': {'status': 'not_accepted'}, 'archive': True})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['archived'], 3)
+        self.assertEqual(list(Employee.objects.values_list('pk', flat=True)), [self.hired.pk])
+        self.assertBookkeepingInStep()
+
+        response = self.client.get(reverse('employee-archived-list'), {'status': 'not_accepted'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row['id'] for row in response.data['data']['results']], [employee.pk for employee in self.rejected]
+        )
+        detail = self.client.get(reverse('employee-archived-detail', args=[self.rejected[0].pk])).data['data']
+        self.assertEqual(
+            (detail['company'], detail['department'], detail['status']), (self.acme.pk, self.sales.pk, 'not_accepted')
+        )
+        self.assertEqual(self.client.post(reverse('employee-archived-list'), {}).status_code, 405)
+
+    def test_oversized_selections_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            bulk_delete(queryset=Employee.objects.all(), max_rows=2)
+        self.assertEqual(self.post({}).status_code, 400)
+        self.assertEqual(self.post({'filter': {}}).status_code, 400)
+        self.assertEqual(Employee.objects.count(), 4)
+
+    def test_filters_skip_hired_employees_unless_asked(self):
+        response = self.post({'filter': {'department': self.sales.pk}})
+        self.assertEqual(response.data['data']['deleted'], 3)
+        self.assertEqual(list(Employee.objects.values_list('pk', flat=True)), [self.hired.pk])
+
+        response = self.post({'filter': {'department': self.sales.pk}, 'include_hired': True})
+        self.assertEqual(response.data['data']['deleted'], 1)
+        self.assertFalse(Employee.objects.exists())
+        self.assertBookkeepingInStep()
+
+    def test_archive_command_moves_stale_applicants_in_batches(self):
+        fresh = self.create_employee(self.sales)
+        Employee.objects.exclude(pk=fresh.pk).update(updated_at=timezone.now() - timedelta(days=200))
+
+        out = StringIO()
+        call_command('archive_employees', dry_run=True, stdout=out)
+        self.assertIn('3 employee(s) would be archived.', out.getvalue())
+        self.assertEqual(ArchivedEmployee.objects.count(), 0)
+
+        out = StringIO()
+        call_command('archive_employees', batch_size=2, stdout=out)
+        self.assertIn('2 archived\n3 archived\nArchived 3 employee(s).', out.getvalue())
+        self.assertEqual(set(Employee.objects.values_list('pk', flat=True)), {self.hired.pk, fresh.pk})
+        self.assertEqual(ArchivedEmployee.objects.count(), 3)
+        self.assertBookkeepingInStep()
@@ -0,0 +1,85 @@
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import serializers
+
+from .funnel import FunnelDeltas
+from .history import status_history
+from .models import Employee
+from .outbox import EMPLOYEE_EVENT_FIELDS, employee_events, publish
+from .versions import bump_versions
+
+
+def bulk_transition(new_status, ids=None, queryset=None, max_rows=10000, chunk_size=1000):
+    """
+    Move the employees with the given `ids`, or those in `queryset`, to
+    `new_status` in one transaction, with one UPDATE per `chunk_size` rows.
+    Moving to hired stamps hired_date in SQL where it is still empty.
+
+    Returns one {'id', 'outcome'} per employee, where outcome is 'updated',
+    'unchanged' (already in that status) or 'not_found'.
+    """
+    with transaction.atomic():
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+            queryset = Employee.objects.filter(pk__in=ids)
+
+        rows = {
+            pk: (status, company_id, department_id, hired_date)
+            for pk, status, company_id, department_id, hired_date in queryset.select_for_update().order_by('pk')
+            .values_list('pk', 'status', 'company_id', 'department_id', 'hired_date')[:max_rows + 1]
+        }
+        current = {pk: row[0] for pk, row in rows.items()}
+        if len(current) > max_rows:
+            raise serializers.ValidationError(
+                {'filter': f'The filter matches more than {max_rows} employees, narrow it down.'}
+            )
+
+        changed = [pk for pk, status in current.items() if status != new_status]
+        updates = {'status': new_status, 'updated_at': timezone.now()}
+        if new_status == 'hired':
+            # Both expressions read the pre-update row.
+            updates['day_employee'] = Case(
+                When(hired_date__isnull=True, then=Value(0)),
+                default=F('day_employee'),
+                output_field=IntegerField(),
+            )
+            updates['hired_date'] = Coalesce(F('hired_date'), Value(date.today()))
+
+        for start in range(0, len(changed), chunk_size):
+            Employee.objects.filter(pk__in=changed[start:start + chunk_size]).update(**updates)
+
+        if changed:
+            funnel = FunnelDeltas()
+            for pk in changed:
+                status, company_id, department_id, hired_date = rows[pk]
+                funnel.remove(company_id, department_id, status, hired_date)
+                if new_status == 'hired' and hired_date is None:
+                    hired_date = date.today()
+                funnel.add(company_id, department_id, new_status, hired_date)
+            funnel.apply()
+            if settings.OUTBOX['ENDPOINTS']:
+                publish(employee_events(
+                    (
+                        row
+                        for start in range(0, len(changed), chunk_size)
+                        for row in Employee.objects.filter(pk__in=changed[start:start + chunk_size])
+                        .order_by('pk').values(*EMPLOYEE_EVENT_FIELDS)
+                    ),
+                    previous_statuses=current,
+                ))
+            status_history.record_many(
+                [(pk, rows[pk][1], rows[pk][2], rows[pk][0], new_status) for pk in changed], updates['updated_at']
+            )
+            bump_versions(Employee)
+
+    def outcome(pk):
+        if pk not in current:
+            return 'not_found'
+        return 'updated' if current[pk] != new_status else 'unchanged'
+
+    return [{'id': pk, 'outcome': outcome(pk)} for pk in (ids if ids is not None else current)]
@@ -1,26 +1,48 @@
 from django.urls import path
 from .views import *
+from .async_views import *
 
 urlpatterns = [
     path('companies/', CompanyListView.as_view(), name='company-list'),
     path('companies/all/', CompanyListAllView.as_view(), name='company-list-all'),
     path('companies/<int:pk>/', CompanyDetailView.as_view(), name='company-detail'),
+    path('companies/export/', CompanyExportView.as_view(), name='company-export'),
     
     path('departments/', DepartmentListView.as_view(), name='department-list'),
     path('departments/all/', DepartmentListAllView.as_view(), name='department-list-all'),
     path('departments/<int:pk>/', DepartmentDetailView.as_view(), name='department-detail'),
+    path('departments/export/', DepartmentExportView.as_view(), name='department-export'),
     
     path('employees/', EmployeeListView.as_view(), name='employee-list'),
     path('employees/hired/', EmployeeHiredListView.as_view(), name='employee-hired-list'),
     path('employees/<int:pk>/', EmployeeDetailView.as_view(), name='employee-detail'),
+    path('employees/export/', EmployeeExportView.as_view(), name='employee-export'),
+    path('employees/hired/export/', EmployeeHiredExportView.as_view(), name='employee-hired-export'),
+    path('employees/sync/', EmployeeSyncView.as_view(), name='employee-sync'),
     
     path('employees/create/', EmployeeCreateView.as_view(), name='employee-create'),
+    path('employees/import/', EmployeeImportView.as_view(), name='employee-import'),
     path('employees/update/<int:pk>/', EmployeeUpdateView.as_view(), name='employee-update'),
     
     path('employees/delete/<int:pk>/', EmployeeDeleteView.as_view(), name='employee-delete'),
+    path('employees/delete/bulk/', EmployeeBulkDeleteView.as_view(), name='employee-bulk-delete'),
+    path('employees/archived/', ArchivedEmployeeListView.as_view(), name='employee-archived-list'),
+    path('employees/archived/<int:pk>/', ArchivedEmployeeDetailView.as_view(), name='employee-archived-detail'),
     path('employees/status/<int:pk>/', UpdateEmployeeStatusView.as_view(), name='employee-status-update'),
+    path('employees/status/bulk/', EmployeeBulkStatusView.as_view(), name='employee-status-bulk-update'),
+    path('employees/status/durations/', EmployeeStageDurationsView.as_view(), name='employee-status-durations'),
     
     path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('dashboard/funnel/', FunnelView.as_view(), name='dashboard-funnel'),
+    
+    path('async/companies/', AsyncCompanyListView.as_view(), name='async-company-list'),
+    path('async/companies/<int:pk>/', AsyncCompanyDetailView.as_view(), name='async-company-detail'),
+    path('async/departments/', AsyncDepartmentListView.as_view(), name='async-department-list'),
+    path('async/departments/<int:pk>/', AsyncDepartmentDetailView.as_view(), name='async-department-detail'),
+    path('async/employees/', AsyncEmployeeListView.as_view(), name='async-employee-list'),
+    path('async/employees/hired/', AsyncEmployeeHiredListView.as_view(), name='async-employee-hired-list'),
+    path('async/employees/<int:pk>/', AsyncEmployeeDetailView.as_view(), name='async-employee-detail'),
+    path('async/dashboard/', AsyncDashboardView.as_view(), name='async-dashboard'),
     path('user-accounts/', UserAccountListView.as_view(), name='user-account-list'),
     
 ]
@@ -0,0 +1,143 @@
+import hashlib
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Company, Department, Employee, TableVersion
+
+
+def bump_versions(*models):
+    """
+    Increment the version stamp of each model's table once the current
+    transaction commits, right away outside of one. Stamps are bumped with
+    one UPDATE per commit however many writes the transaction made, and
+    after its locks are released, so concurrent writers do not queue on
+    the stamp rows and readers never see a new stamp before the new rows.
+    """
+    pending = getattr(connection, 'pending_table_versions', None)
+    if pending is None:
+        pending = connection.pending_table_versions = set()
+    pending.update(model._meta.label_lower for model in models)
+    # Every call registers a callback: the ones of a rolled back savepoint
+    # are dropped. The first to run writes all pending stamps.
+    transaction.on_commit(lambda: write_versions(pending))
+
+
+def write_versions(pending):
+    names = list(pending)
+    pending.clear()
+    if not names:
+        return
+    now = timezone.now()
+    updated = TableVersion.objects.filter(name__in=names).update(version=F('version') + 1, modified_at=now)
+    if updated < len(names):
+        existing = set(TableVersion.objects.filter(name__in=names).values_list('name', flat=True))
+        TableVersion.objects.bulk_create(
+            [TableVersion(name=name, version=1, modified_at=now) for name in names if name not in existing],
+            ignore_conflicts=True,
+        )
+
+
+def table_versions(*models):
+    """Map each model's label to its (version, modified_at) stamp, if it has one."""
+    names = [model._meta.label_lower for model in models]
+    return {
+        name: (version, modified_at)
+        for name, version, modified_at in TableVersion.objects.filter(name__in=names)
+        .values_list('name', 'version', 'modified_at')
+    }
+
+
+async def atable_versions(*models):
+    names = [model._meta.label_lower for model in models]
+    return {
+        name: (version, modified_at)
+        async for name, version, modified_at in TableVersion.objects.filter(name__in=names)
+        .values_list('name', 'version', 'modified_at')
+    }
+
+
+def versions_key(versions, *models):
+    """The version numbers in table_versions() output `versions` as one string, for cache keys."""
+    return '.'.join(str(versions.get(model._meta.label_lower, (0,))[0]) for model in models)
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Company)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Employee)
+def bump_version_on_write(sender, **kwargs):
+    bump_versions(sender)
+
+
+class VersionStampMixin:
+    """
+    Answers conditional GET requests (If-None-Match / If-Modified-Since)
+    with 304 after one lookup of the version stamps of `version_models`,
+    before any query or serialization for the response itself, and stamps
+    full responses with ETag and Last-Modified headers.
+
+    Company, department and employee payloads embed each other's counts,
+    so views depend on all three tables by default. The stamps read are
+    kept on `self.table_versions` for the rest of the request.
+    """
+    version_models = (Company, Department, Employee)
+
+    def check_not_modified(self, request):
+        """Return a 304 response if the client's copy is current, otherwise None."""
+        self.table_versions = table_versions(*self.version_models)
+        return self.not_modified_response(request)
+
+    async def acheck_not_modified(self, request):
+        self.table_versions = await atable_versions(*self.version_models)
+        return self.not_modified_response(request)
+
+    def not_modified_response(self, request):
+        names = [model._meta.label_lower for model in self.version_models]
+        versions = self.table_versions
+        fingerprint = ';'.join(
+            [request.get_full_path()] + [f'{name}:{versions.get(name, (0,))[0]}' for name in names]
+        )
+        self.etag = '"%s"' % hashlib.sha1(fingerprint.encode()).hexdigest()
+        modified = [modified_at for _, modified_at in versions.values()]
+        self.last_modified = int(max(modified).timestamp()) if modified else None
+        return get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+
+    def versions_key(self):
+        """The stamps read for this request as one string, for cache keys."""
+        return versions_key(self.table_versions, *self.version_models)
+
+    def stamp_response(self, response):
+        if response.status_code == 200:
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified)
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class ConditionalGetMixin(VersionStampMixin):
+    """VersionStampMixin around the get() of a generic view."""
+
+    def get(self, request, *args, **kwargs):
+        not_modified = self.check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        return self.stamp_response(super().get(request, *args, **kwargs))
+
+
+class AsyncConditionalGetMixin(VersionStampMixin):
+    """VersionStampMixin around the get() of an async generic view."""
+
+    async def get(self, request, *args, **kwargs):
+        not_modified = await self.acheck_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        return self.stamp_response(await super().get(request, *args, **kwargs))
@@ -8,18 +8,36 @@ from project.permission import IsManagerOrAdmin, IsAdmin
 from .serializers import *
 from django.db import transaction
 from core.utils import CustomResponse
-from core.swagger_docs import employee_create_schema, employee_update_schema
-from core.paginate import GlobalPagination
+from core.swagger_docs import (
+    employee_create_schema, employee_update_schema, employee_import_schema, employee_bulk_status_schema,
+    employee_bulk_delete_schema,
+)
+from core.paginate import GlobalPagination, PaginationModeMixin
+from rest_framework.parsers import MultiPartParser
+from rest_framework.exceptions import ValidationError
+from .importers import EmployeeImporter
+from .exporters import StreamingExportMixin
+from .fieldsets import EmployeeFieldsetMixin
+from .dashboard import get_dashboard
+from .archive import bulk_delete
+from .filters import ArchivedEmployeeFilterBackend, EmployeeFilterBackend, FunnelFilterSerializer, StageDurationFilterSerializer, filter_employees
+from .funnel import get_funnel
+from .history import get_stage_durations
+from .transitions import bulk_transition
+from .sync import employee_changes
+from .versions import ConditionalGetMixin, VersionStampMixin
+from .lookups import LookupModeMixin
+from collections import Counter
 import logging
 
 
 logger = logging.getLogger(__name__)
 
-class CompanyListView(ListAPIView):
+class CompanyListView(ConditionalGetMixin, PaginationModeMixin, ListAPIView):
     """View for listing companies - accessible by Manager or Admin"""
     
-    queryset = Company.objects.all()
-    serializer_class = CompanySerializer
+    queryset = CompanyListSerializer.rows(Company.objects.order_by('id'))
+    serializer_class = CompanyListSerializer
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
     pagination_class = GlobalPagination
     
@@ -31,9 +49,9 @@ class CompanyListView(ListAPIView):
             message="Companies retrieved successfully"
         )
         
-class CompanyListAllView(ListAPIView):
-    queryset = Company.objects.all()
-    serializer_class = CompanySerializer
+class CompanyListAllView(ConditionalGetMixin, LookupModeMixin, ListAPIView):
+    queryset = CompanyListSerializer.rows(Company.objects.all())
+    serializer_class = CompanyListSerializer
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
     
     def list(self, request, *args, **kwargs):
@@ -46,7 +64,7 @@ class CompanyListAllView(ListAPIView):
 
     
     
-class CompanyDetailView(RetrieveAPIView):
+class CompanyDetailView(ConditionalGetMixin, RetrieveAPIView):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
@@ -62,10 +80,10 @@ class CompanyDetailView(RetrieveAPIView):
     
         
         
-class DepartmentListView(ListAPIView):
+class DepartmentListView(ConditionalGetMixin, PaginationModeMixin, ListAPIView):
     """View for listing departments - accessible by Manager or Admin"""
-    queryset = Department.objects.all()
-    serializer_class = DepartmentSerializer
+    queryset = DepartmentListSerializer.rows(Department.objects.order_by('id'))
+    serializer_class = DepartmentListSerializer
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
     pagination_class = GlobalPagination
     
@@ -78,9 +96,11 @@ class DepartmentListView(ListAPIView):
         )
         
 
-class DepartmentListAllView(ListAPIView):
-    queryset = Department.objects.all()
-    serializer_class = DepartmentSerializer
+class DepartmentListAllView(ConditionalGetMixin, LookupModeMixin, ListAPIView):
+    queryset = DepartmentListSerializer.rows(Department.objects.all())
+    serializer_class = DepartmentListSerializer
+    lookup_extra_fields = ('company_id',)
+    lookup_company_field = 'company_id'
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
     
     def list(self, request, *args, **kwargs):
@@ -91,7 +111,7 @@ class DepartmentListAllView(ListAPIView):
             message="Departments retrieved successfully"
         )
 
-class DepartmentDetailView(RetrieveAPIView):
+class DepartmentDetailView(ConditionalGetMixin, RetrieveAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
@@ -104,12 +124,13 @@ class DepartmentDetailView(RetrieveAPIView):
             message="Department retrieved successfully"
         )
         
-class EmployeeListView(ListAPIView):
+class EmployeeListView(ConditionalGetMixin, EmployeeFieldsetMixin, PaginationModeMixin, ListAPIView):
     """View for listing employees - accessible by Manager or Admin"""
-    queryset = Employee.objects.all()
+    queryset = Employee.objects.order_by('id')
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
-    serializer_class = EmployeeSerializer
+    serializer_class = EmployeeListSerializer
     pagination_class = GlobalPagination
+    filter_backends = [EmployeeFilterBackend]
     
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
@@ -120,7 +141,7 @@ class EmployeeListView(ListAPIView):
         )
         
 
-class EmployeeDetailView(RetrieveAPIView):
+class EmployeeDetailView(ConditionalGetMixin, EmployeeFieldsetMixin, RetrieveAPIView):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
@@ -158,6 +179,36 @@ class EmployeeCreateView(APIView):
         
         
 
+class EmployeeImportView(APIView):
+    """View for bulk importing employees from CSV/NDJSON - accessible by Manager or Admin"""
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    parser_classes = [MultiPartParser]
+    
+    @employee_import_schema
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return CustomResponse.error(
+                errors={'file': 'A CSV or NDJSON file is required'},
+                message="File field is required"
+            )
+        
+        file_format = request.query_params.get('file_format') or EmployeeImporter.guess_format(upload)
+        if file_format not in EmployeeImporter.formats:
+            return CustomResponse.error(
+                errors={'file_format': f'Supported formats are {", ".join(EmployeeImporter.formats)}'},
+                message="Unsupported file format"
+            )
+        
+        result = EmployeeImporter().run(upload, file_format)
+        logger.info("Employee import: %s created, %s failed", result['created'], result['failed'])
+        return CustomResponse.success(
+            data=result,
+            message="Employees imported successfully" if not result['failed'] else "Employees imported with errors"
+        )
+        
+        
+
 class EmployeeUpdateView(APIView):
     """View for updating employees - accessible by Manager or Admin"""
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
@@ -202,29 +253,69 @@ class EmployeeDeleteView(APIView):
             return CustomResponse.not_found(message="Employee not found")
         
         
-class DashboardView(APIView):
+class DashboardView(VersionStampMixin, APIView):
     """View for dashboard - accessible by Manager or Admin"""
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
     
     def get(self, request):
+        not_modified = self.check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
         try:
-            companies = Company.objects.all().count()
-            departments = Department.objects.all().count()
-            employees = Employee.objects.all().count()
-            return CustomResponse.success(
-                data={
-                    "total_companies": companies,
-                    "total_departments": departments,
-                    "total_employees": employees
-                },
+            return self.stamp_response(CustomResponse.success(
+                data=get_dashboard(self.versions_key()),
                 message="Dashboard retrieved successfully"
-            )
+            ))
         except Exception as e:
             return CustomResponse.error(
                 errors={'error': str(e)},
                 message="Failed to retrieve dashboard"
             )
         
+class FunnelView(VersionStampMixin, APIView):
+    """View for employees per status and hires per week - accessible by Manager or Admin"""
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    version_models = (Company, Department, Employee, StatusCount, WeeklyHireCount)
+    
+    def get(self, request):
+        serializer = FunnelFilterSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return CustomResponse.error(
+                errors=serializer.errors,
+                message="Invalid funnel parameters"
+            )
+        
+        not_modified = self.check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        
+        return self.stamp_response(CustomResponse.success(
+            data=get_funnel(**serializer.validated_data),
+            message="Funnel retrieved successfully"
+        ))
+        
+class EmployeeStageDurationsView(VersionStampMixin, APIView):
+    """View for time-in-stage and time-to-hire percentiles - accessible by Manager or Admin"""
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    version_models = (StatusTransition, Company, Department)
+    
+    def get(self, request):
+        serializer = StageDurationFilterSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return CustomResponse.error(
+                errors=serializer.errors,
+                message="Invalid stage duration parameters"
+            )
+        
+        not_modified = self.check_not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        
+        return self.stamp_response(CustomResponse.success(
+            data=get_stage_durations(self.versions_key(), **serializer.validated_data),
+            message="Stage durations retrieved successfully"
+        ))
+        
 class UpdateEmployeeStatusView(APIView):
     """View for updating employee status - accessible by Manager or Admin"""
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
@@ -255,11 +346,162 @@ class UpdateEmployeeStatusView(APIView):
         
         
         
-class EmployeeHiredListView(ListAPIView):
-    queryset = Employee.objects.filter(status='hired')
-    serializer_class = EmployeeSerializer
+class EmployeeBulkStatusView(APIView):
+    """View for updating the status of many employees at once - accessible by Manager or Admin"""
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    serializer_class = EmployeeBulkStatusSerializer
+    
+    @employee_bulk_status_schema
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return CustomResponse.error(
+                errors=serializer.errors,
+                message="Failed to update employee statuses"
+            )
+        
+        data = serializer.validated_data
+        try:
+            if 'ids' in data:
+                results = bulk_transition(data['status'], ids=data['ids'])
+            else:
+                queryset = filter_employees(Employee.objects.all(), data['filter'])
+                results = bulk_transition(data['status'], queryset=queryset)
+        except ValidationError as e:
+            return CustomResponse.error(
+                errors=e.detail,
+                message="Failed to update employee statuses"
+            )
+        
+        summary = Counter(result['outcome'] for result in results)
+        return CustomResponse.success(
+            data={
+                'updated': summary['updated'],
+                'unchanged': summary['unchanged'],
+                'not_found': summary['not_found'],
+                'results': results,
+            },
+            message="Employee statuses updated successfully"
+        )
+
+
+
+class EmployeeBulkDeleteView(APIView):
+    """View for deleting or archiving many employees at once - accessible by Manager or Admin"""
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    serializer_class = EmployeeBulkDeleteSerializer
+    
+    @employee_bulk_delete_schema
+    def post(self, request):
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return CustomResponse.error(
+                errors=serializer.errors,
+                message="Failed to delete employees"
+            )
+        
+        data = serializer.validated_data
+        try:
+            if 'ids' in data:
+                results = bulk_delete(ids=data['ids'], archive=data['archive'])
+            else:
+                queryset = filter_employees(Employee.objects.all(), data['filter'])
+                if not data['include_hired']:
+                    queryset = queryset.exclude(status='hired')
+                results = bulk_delete(queryset=queryset, archive=data['archive'])
+        except ValidationError as e:
+            return CustomResponse.error(
+                errors=e.detail,
+                message="Failed to delete employees"
+            )
+        
+        summary = Counter(result['outcome'] for result in results)
+        return CustomResponse.success(
+            data={
+                'deleted': summary['deleted'],
+                'archived': summary['archived'],
+                'not_found': summary['not_found'],
+                'results': results,
+            },
+            message="Employees deleted successfully"
+        )
+
+
+class ArchivedEmployeeListView(ConditionalGetMixin, PaginationModeMixin, ListAPIView):
+    """View for listing archived employees, read only - accessible by Manager or Admin"""
+    queryset = ArchivedEmployee.objects.order_by('id')
+    serializer_class = ArchivedEmployeeSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    pagination_class = GlobalPagination
+    filter_backends = [ArchivedEmployeeFilterBackend]
+    version_models = (ArchivedEmployee,)
+    
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Archived employees retrieved successfully"
+        )
+
+
+class ArchivedEmployeeDetailView(ConditionalGetMixin, RetrieveAPIView):
+    queryset = ArchivedEmployee.objects.all()
+    serializer_class = ArchivedEmployeeSerializer
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    version_models = (ArchivedEmployee,)
+    
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+
+        return CustomResponse.success(
+            data=response.data,
+            message="Archived employee retrieved successfully"
+        )
+
+
+
+class EmployeeSyncView(APIView):
+    """View for fetching employee changes since a cursor - accessible by Manager or Admin"""
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    serializer_class = EmployeeSyncSerializer
+    
+    def get(self, request):
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return CustomResponse.error(
+                errors=serializer.errors,
+                message="Failed to sync employees"
+            )
+        
+        try:
+            changes = employee_changes(
+                serializer.validated_data.get('cursor'), serializer.validated_data['page_size']
+            )
+        except ValidationError as e:
+            return CustomResponse.error(
+                errors={'cursor': e.detail},
+                message="Failed to sync employees"
+            )
+        
+        return CustomResponse.success(
+            data={
+                'results': EmployeeSerializer(changes['employees'], many=True).data,
+                'deleted': changes['deleted'],
+                'cursor': changes['cursor'],
+                'has_more': changes['has_more'],
+            },
+            message="Employee changes retrieved successfully"
+        )
+        
+        
+        
+class EmployeeHiredListView(ConditionalGetMixin, EmployeeFieldsetMixin, PaginationModeMixin, ListAPIView):
+    queryset = Employee.objects.filter(status='hired').order_by('id')
+    serializer_class = EmployeeListSerializer
     permission_classes = [IsAuthenticated, IsManagerOrAdmin]
     pagination_class = GlobalPagination
+    filter_backends = [EmployeeFilterBackend]
     
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
@@ -270,8 +512,8 @@ class EmployeeHiredListView(ListAPIView):
         )
         
         
-class UserAccountListView(ListAPIView):
-    queryset = User.objects.all()
+class UserAccountListView(PaginationModeMixin, ListAPIView):
+    queryset = User.objects.order_by('id')
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
     pagination_class = GlobalPagination
@@ -282,3 +524,34 @@ class UserAccountListView(ListAPIView):
             data=response.data,
             message="User accounts retrieved successfully"
         )
+        
+        
+EMPLOYEE_EXPORT_FIELDS = [
+    'id', 'company', 'company__name', 'department', 'department__name', 'status',
+    'employee_name', 'employee_email', 'phone_number', 'address', 'designation',
+    'hired_date', 'day_employee',
+]
+
+
+class CompanyExportView(StreamingExportMixin, CompanyListView):
+    """View for exporting companies as CSV/NDJSON - accessible by Manager or Admin"""
+    export_fields = ['id', 'name', 'department_count', 'employee_count']
+    export_filename = 'companies'
+
+
+class DepartmentExportView(StreamingExportMixin, DepartmentListView):
+    """View for exporting departments as CSV/NDJSON - accessible by Manager or Admin"""
+    export_fields = ['id', 'name', 'company', 'company__name', 'employee_count']
+    export_filename = 'departments'
+
+
+class EmployeeExportView(StreamingExportMixin, EmployeeListView):
+    """View for exporting employees as CSV/NDJSON - accessible by Manager or Admin"""
+    export_fields = EMPLOYEE_EXPORT_FIELDS
+    export_filename = 'employees'
+
+
+class EmployeeHiredExportView(StreamingExportMixin, EmployeeHiredListView):
+    """View for exporting hired employees as CSV/NDJSON - accessible by Manager or Admin"""
+    export_fields = EMPLOYEE_EXPORT_FIELDS
+    export_filename = 'hired-employees'
@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -36,7 +36,11 @@ CORS_ALLOWED_ORIGINS = ["http://localhost:3000", "http://localhost:8000"]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.backends.CachedJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 }
 
@@ -59,6 +63,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
+    'core.db.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -92,11 +98,62 @@ WSGI_APPLICATION = 'project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# Read from the environment, defaulting to the local SQLite file.
+# Connections stay open for DB_CONN_MAX_AGE seconds and are checked before
+# being reused. Under ASGI set DB_CONN_MAX_AGE=0, since Django cannot reuse
+# connections across async requests.
+DB_ENGINE = config('DB_ENGINE', default='django.db.backends.sqlite3')
+
+
+def database(name, host=''):
+    return {
+        'ENGINE': DB_ENGINE,
+        'NAME': name,
+        'USER': config('DB_USER', default=''),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': host,
+        'PORT': config('DB_PORT', default=''),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+    }
+
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': database(config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')), config('DB_HOST', default='')),
+}
+
+# Read replicas, see core.db: comma separated hosts, or database files with
+# SQLite. Each becomes a replica_<n> alias that mirrors the primary in tests.
+for index, replica in enumerate(config('DB_REPLICAS', default='', cast=Csv()), start=1):
+    DATABASES[f'replica_{index}'] = {
+        **(database(replica) if DB_ENGINE.endswith('sqlite3') else database(DATABASES['default']['NAME'], replica)),
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_ROUTERS = ['core.db.ReplicaRouter']
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+# Seconds a client reads from the primary after a write, covering replica lag.
+# Pins are kept in the shared cache below.
+DATABASE_REPLICA_STICKY_SECONDS = config('DATABASE_REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+# 'default' is per process and only holds what any process can recompute.
+# 'shared' is seen by every process, for state one process writes and the
+# others must honour: read-your-writes pins and user revision stamps. It
+# defaults to a database table (run createcachetable); point it at Redis or
+# Memcached to take it off the database.
+SHARED_CACHE_BACKEND = config('SHARED_CACHE_BACKEND', default='django.core.cache.backends.db.DatabaseCache')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': SHARED_CACHE_BACKEND,
+        'LOCATION': config('SHARED_CACHE_LOCATION', default='shared_cache'),
+        **(
+            {'OPTIONS': {'MAX_ENTRIES': config('SHARED_CACHE_MAX_ENTRIES', default=100000, cast=int)}}
+            if SHARED_CACHE_BACKEND.endswith('DatabaseCache') else {}
+        ),
+    },
 }
 
 
@@ -125,6 +182,65 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=30),
 }
 
+# In-process cache of authenticated users, see authentication.backends.
+AUTH_USER_CACHE = {
+    'MAXSIZE': config('AUTH_USER_CACHE_MAXSIZE', default=10000, cast=int),
+    'TTL': config('AUTH_USER_CACHE_TTL', default=300, cast=int),
+}
+
+# Seconds the dashboard counts of one set of table versions stay cached.
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=60, cast=int)
+
+# Incremental employee sync, see management.sync. Rows younger than the
+# settle delay wait for the next poll; cursors older than the tombstone
+# retention must resync from scratch.
+SYNC_SETTLE_SECONDS = config('SYNC_SETTLE_SECONDS', default=5, cast=int)
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=90, cast=int)
+
+# ?mode=lookup dropdown lists, see management.lookups. MAXSIZE counts
+# cached lists (one per model and filter), LOOKUP_MAX_ROWS caps a response.
+LOOKUP_CACHE = {
+    'MAXSIZE': config('LOOKUP_CACHE_MAXSIZE', default=256, cast=int),
+}
+LOOKUP_MAX_ROWS = config('LOOKUP_MAX_ROWS', default=1000, cast=int)
+
+# Employee status history, see management.history. Transitions are queued
+# in process and written by a background thread in batches of up to
+# BATCH_SIZE, at most FLUSH_INTERVAL seconds after they commit. With
+# BACKGROUND off they stay queued until status_history.flush().
+STATUS_HISTORY = {
+    'BATCH_SIZE': config('STATUS_HISTORY_BATCH_SIZE', default=500, cast=int),
+    'FLUSH_INTERVAL': config('STATUS_HISTORY_FLUSH_INTERVAL', default=1.0, cast=float),
+    'BACKGROUND': config('STATUS_HISTORY_BACKGROUND', default=True, cast=bool),
+    'CACHE_TIMEOUT': config('STATUS_HISTORY_CACHE_TIMEOUT', default=300, cast=int),
+}
+
+# Transactional outbox, see management.outbox. Employee and department
+# changes are queued for every URL in ENDPOINTS in the transaction that
+# made them, and the deliver_outbox command POSTs them in batches of up to
+# BATCH_SIZE, signed with SECRET when it is set. Failed batches are retried
+# after BACKOFF_SECONDS, doubling up to MAX_BACKOFF_SECONDS, and given up
+# after MAX_ATTEMPTS. Delivered events are kept for RETENTION_DAYS.
+OUTBOX = {
+    'ENDPOINTS': config('OUTBOX_ENDPOINTS', default='', cast=Csv()),
+    'SECRET': config('OUTBOX_SECRET', default=''),
+    'BATCH_SIZE': config('OUTBOX_BATCH_SIZE', default=100, cast=int),
+    'TIMEOUT': config('OUTBOX_TIMEOUT', default=10, cast=float),
+    'MAX_ATTEMPTS': config('OUTBOX_MAX_ATTEMPTS', default=12, cast=int),
+    'BACKOFF_SECONDS': config('OUTBOX_BACKOFF_SECONDS', default=5, cast=float),
+    'MAX_BACKOFF_SECONDS': config('OUTBOX_MAX_BACKOFF_SECONDS', default=3600, cast=float),
+    'RETENTION_DAYS': config('OUTBOX_RETENTION_DAYS', default=7, cast=int),
+}
+
+# Applicant archival, see management.archive. archive_employees moves
+# employees in STATUSES untouched for AFTER_DAYS out of the employee table,
+# BATCH_SIZE rows per transaction.
+EMPLOYEE_ARCHIVE = {
+    'STATUSES': config('EMPLOYEE_ARCHIVE_STATUSES', default='not_accepted,application_received', cast=Csv()),
+    'AFTER_DAYS': config('EMPLOYEE_ARCHIVE_AFTER_DAYS', default=180, cast=int),
+    'BATCH_SIZE': config('EMPLOYEE_ARCHIVE_BATCH_SIZE', default=1000, cast=int),
+}
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
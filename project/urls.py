@@ -21,6 +21,7 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
 from authentication.views import CustomObtainPairView, CustomTokenRefreshView
+from core.views import HealthView, MetricsView
 
 schema_view = get_schema_view(
    openapi.Info(
@@ -40,4 +41,7 @@ urlpatterns = [
     path('api/v1/auth/token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
     
     path('api/v1/management/', include('management.urls')),
+    
+    path('api/v1/metrics/', MetricsView.as_view(), name='metrics'),
+    path('api/v1/health/', HealthView.as_view(), name='health'),
 ]